@@ -0,0 +1,292 @@
+import os
+import gzip
+import json
+import hashlib
+import pandas as pd
+from datetime import datetime, timezone
+
+
+ARCHIVE_INDEX_FILENAME = 'index.jsonl'
+ARCHIVE_INDEX_COLUMNS_LIST = ['endpoint', 'season', 'fetched_at', 'sha256', 'size_bytes']
+
+
+def archive_payload(
+        payload_bytes: bytes,
+        endpoint: str,
+        archive_directory: str,
+        season: str = None,
+        fetched_at: str = None
+    ) -> str:
+
+    '''
+    Stores a raw API response in the archive under the SHA-256 hash of its content, and records the fetch in the index.
+    Identical responses are only stored once, so repeated fetches of an unchanged endpoint only add an index line.
+
+    Args:
+        payload_bytes - The raw content of the API response.
+        endpoint - The path of the endpoint relative to the API root, e.g. 'event/5/live/'.
+        archive_directory - The full filepath to the folder containing the archive.
+        season - The Premier League season the response belongs to, in the format 'YYYY-YY', if known.
+        fetched_at - The UTC time of the fetch in the format 'YYYY-MM-DDTHH:MM:SSZ', defaulting to now.
+
+    Returns:
+        payload_hash - The SHA-256 hash of the response content.
+    '''
+
+    payload_hash = hashlib.sha256(payload_bytes).hexdigest()
+    object_filepath = os.path.join(archive_directory, 'objects', payload_hash[:2], f'{payload_hash}.json.gz')
+    object_exists = os.path.exists(object_filepath)
+
+    if not object_exists:
+
+        # Writing to a temporary file first means an interrupted run never leaves a partial object behind
+        os.makedirs(os.path.dirname(object_filepath), exist_ok= True)
+        temporary_filepath = f'{object_filepath}.{os.getpid()}.tmp'
+
+        with open(temporary_filepath, 'wb') as temporary_file:
+            temporary_file.write(gzip.compress(payload_bytes, compresslevel= 6))
+
+        os.replace(temporary_filepath, object_filepath)
+
+    else:
+        pass
+
+    index_entry = {
+        'endpoint' : endpoint,
+        'season' : season,
+        'fetched_at' : fetched_at or datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'sha256' : payload_hash,
+        'size_bytes' : len(payload_bytes)
+    }
+
+    # Each entry is appended in a single write, so scripts running at the same time do not interleave their lines
+    with open(os.path.join(archive_directory, ARCHIVE_INDEX_FILENAME), 'a') as temporary_file:
+        temporary_file.write(json.dumps(index_entry) + '\n')
+
+    return payload_hash
+
+
+def load_archive_index(archive_directory: str) -> pd.DataFrame:
+
+    '''
+    Reads in the archive index, which has one row per archived fetch.
+
+    Args:
+        archive_directory - The full filepath to the folder containing the archive.
+
+    Returns:
+        archive_index_df - Dataframe containing the endpoint, season, fetch time, hash and size of every archived fetch,
+        which is empty if nothing has been archived yet.
+    '''
+
+    archive_index_filepath = os.path.join(archive_directory, ARCHIVE_INDEX_FILENAME)
+    archive_index_exists = os.path.exists(archive_index_filepath)
+
+    if not archive_index_exists:
+        return pd.DataFrame(columns= ARCHIVE_INDEX_COLUMNS_LIST)
+
+    else:
+        pass
+
+    with open(archive_index_filepath) as temporary_file:
+        index_entries_list = [json.loads(line) for line in temporary_file if line.strip()]
+
+    return pd.DataFrame(index_entries_list, columns= ARCHIVE_INDEX_COLUMNS_LIST)
+
+
+def find_archived_entry(
+        endpoint: str,
+        archive_directory: str,
+        season: str = None,
+        fetched_before: str = None,
+        archive_index_df: pd.DataFrame = None
+    ) -> dict:
+
+    '''
+    Finds the index entry of the most recently fetched response of an endpoint.
+
+    Args:
+        endpoint - The path of the endpoint relative to the API root, e.g. 'event/5/live/'.
+        archive_directory - The full filepath to the folder containing the archive.
+        season - Restricts the lookup to responses from a Premier League season, in the format 'YYYY-YY'.
+        fetched_before - Restricts the lookup to responses fetched at or before a UTC time, in the format
+        'YYYY-MM-DDTHH:MM:SSZ'.
+        archive_index_df - The archive index, if already loaded, to save reading it in again for each lookup.
+
+    Returns:
+        archive_entry - Dictionary containing the endpoint, season, fetch time, hash and size of the response.
+
+    Raises:
+        ValueError - Raised if the archive holds no matching response for the endpoint.
+    '''
+
+    if archive_index_df is None:
+        archive_index_df = load_archive_index(archive_directory)
+
+    else:
+        pass
+
+    matching_entries_mask = archive_index_df['endpoint'] == endpoint
+
+    if season is not None:
+        matching_entries_mask &= archive_index_df['season'] == season
+
+    else:
+        pass
+
+    # Fetch times share a fixed width format, so they compare and sort correctly as strings
+    if fetched_before is not None:
+        matching_entries_mask &= archive_index_df['fetched_at'] <= fetched_before
+
+    else:
+        pass
+
+    matching_entries_df = archive_index_df[matching_entries_mask]
+
+    if matching_entries_df.empty:
+        raise ValueError(
+            f"ValueError - No archived response for endpoint '{endpoint}' (season: {season}, fetched before: {fetched_before})"
+        )
+
+    else:
+        pass
+
+    archive_entry = matching_entries_df.sort_values('fetched_at', kind= 'stable').iloc[-1].to_dict()
+
+    return archive_entry
+
+
+def read_archived_payload(
+        endpoint: str,
+        archive_directory: str,
+        season: str = None,
+        archive_index_df: pd.DataFrame = None,
+        fetched_before: str = None
+    ) -> dict | list:
+
+    '''
+    Reads the most recently fetched response of an endpoint back out of the archive, without any network calls.
+
+    Args:
+        endpoint - The path of the endpoint relative to the API root, e.g. 'event/5/live/'.
+        archive_directory - The full filepath to the folder containing the archive.
+        season - Restricts the lookup to responses from a Premier League season, in the format 'YYYY-YY'.
+        archive_index_df - The archive index, if already loaded, to save reading it in again for each payload.
+        fetched_before - Restricts the lookup to responses fetched at or before a UTC time, in the format
+        'YYYY-MM-DDTHH:MM:SSZ'.
+
+    Returns:
+        payload - The archived response, converted from JSON.
+
+    Raises:
+        ValueError - Raised if the archive holds no matching response for the endpoint.
+    '''
+
+    archive_entry = find_archived_entry(
+        endpoint= endpoint,
+        archive_directory= archive_directory,
+        season= season,
+        fetched_before= fetched_before,
+        archive_index_df= archive_index_df
+    )
+
+    payload = read_archived_object(payload_hash= archive_entry['sha256'], archive_directory= archive_directory)
+
+    return payload
+
+
+def read_archived_object(
+        payload_hash: str,
+        archive_directory: str
+    ) -> dict | list:
+
+    '''
+    Reads an archived response back out of the archive by the SHA-256 hash of its content, without reading the index.
+
+    Args:
+        payload_hash - The SHA-256 hash of the response content, as recorded in the archive index.
+        archive_directory - The full filepath to the folder containing the archive.
+
+    Returns:
+        payload - The archived response, converted from JSON.
+    '''
+
+    object_filepath = os.path.join(archive_directory, 'objects', payload_hash[:2], f'{payload_hash}.json.gz')
+
+    with gzip.open(object_filepath, 'rb') as temporary_file:
+        payload = json.loads(temporary_file.read())
+
+    return payload
+
+
+def match_replay_payloads(
+        gameweek_list: list,
+        archive_directory: str,
+        season: str,
+        archive_index_df: pd.DataFrame = None
+    ) -> dict:
+
+    '''
+    Pairs the most recent live response of each gameweek with the general information response fetched closest to, but
+    not after, it. Players who later left the league, or moved club, are then replayed with the details they had at the
+    time. Every gameweek is checked before anything is returned, so a replay never starts on an incomplete archive.
+
+    Args:
+        gameweek_list - List of the gameweek numbers to replay.
+        archive_directory - The full filepath to the folder containing the archive.
+        season - The Premier League season to replay, in the format 'YYYY-YY'.
+        archive_index_df - The archive index, if already loaded.
+
+    Returns:
+        replay_entries_dict - Dictionary keyed by gameweek number, each containing the 'live' and 'general' archive
+        entries to replay.
+
+    Raises:
+        ValueError - Raised if any gameweek has no live response, or no general information response from before it.
+    '''
+
+    if archive_index_df is None:
+        archive_index_df = load_archive_index(archive_directory)
+
+    else:
+        pass
+
+    replay_entries_dict = {}
+    unmatched_gameweeks_list = []
+
+    for gameweek_number in gameweek_list:
+
+        try:
+
+            live_entry = find_archived_entry(
+                endpoint= f'event/{gameweek_number}/live/',
+                archive_directory= archive_directory,
+                season= season,
+                archive_index_df= archive_index_df
+            )
+
+            general_entry = find_archived_entry(
+                endpoint= 'bootstrap-static/',
+                archive_directory= archive_directory,
+                season= season,
+                fetched_before= live_entry['fetched_at'],
+                archive_index_df= archive_index_df
+            )
+
+        except ValueError:
+
+            unmatched_gameweeks_list.append(gameweek_number)
+            continue
+
+        replay_entries_dict[gameweek_number] = {'live' : live_entry, 'general' : general_entry}
+
+    if unmatched_gameweeks_list:
+        raise ValueError(
+            f'ValueError - The archive is missing a live response, or a general information response fetched before it, '
+            f'for gameweek(s) {unmatched_gameweeks_list}'
+        )
+
+    else:
+        pass
+
+    return replay_entries_dict
@@ -0,0 +1,210 @@
+import requests
+import numpy as np
+import pandas as pd
+import functions.archive_functions as archive
+from functions.fpl_functions import APIError
+
+
+def retrieve_fixtures_data(
+        season: str = None,
+        archive_directory: str = None,
+        replay: bool = False
+    ) -> list:
+
+    '''
+    Retrieves every fixture in the current FPL season from the API.
+
+    Args:
+        season - The Premier League season the fixtures belong to, in the format 'YYYY-YY'.
+        archive_directory - The full filepath to the folder containing the payload archive. If given, the raw response
+        is archived, or in replay mode is read from the archive instead of the API.
+        replay - Whether to read the most recently archived response rather than calling the API.
+
+    Returns:
+        fixtures_list - List of dictionaries, one per fixture, as returned by the fixtures endpoint.
+
+    Raises:
+        APIError - Raised if the response code of the API call is unsuccessful.
+    '''
+
+    if replay:
+
+        print('Reading fixtures from the payload archive...')
+        return archive.read_archived_payload(endpoint= 'fixtures/', archive_directory= archive_directory, season= season)
+
+    else:
+        pass
+
+    print('Making API call to fixtures endpoint...')
+    FIXTURES_URL = 'https://fantasy.premierleague.com/api/fixtures/'
+
+    # Make API request and raise exception if error response received
+    try:
+
+        fixtures_response = requests.get(FIXTURES_URL)
+        fixtures_response.raise_for_status()
+
+    except requests.exceptions.HTTPError:
+
+        response_code = fixtures_response.status_code
+        raise APIError(f'Response Code: {response_code}')
+
+    print('API call successful, converting to list...')
+    fixtures_list = fixtures_response.json()
+
+    if archive_directory is not None:
+
+        archive.archive_payload(
+            payload_bytes= fixtures_response.content,
+            endpoint= 'fixtures/',
+            archive_directory= archive_directory,
+            season= season
+        )
+
+    else:
+        pass
+
+    return fixtures_list
+
+
+def build_fixture_matrices(
+        fixtures_list: list,
+        general_fpl_info_dict: dict,
+        number_of_gameweeks: int = 38
+    ) -> dict:
+
+    '''
+    Builds dense teams x gameweeks matrices describing each team's fixtures. Blank gameweeks are left at zero and
+    double gameweeks accumulate both fixtures in the same cell, so 'fixture_count' tells the two apart.
+
+    Args:
+        fixtures_list - List of fixture dictionaries returned by the fixtures endpoint.
+        general_fpl_info_dict - Dictionary containing general information about the current FPL season.
+        number_of_gameweeks - The number of gameweeks in the season.
+
+    Returns:
+        fixture_matrices - Dictionary containing the 'team_ids' and 'team_names' arrays (one entry per matrix row), along
+        with the 'fixture_count', 'difficulty', 'attack' and 'defence' matrices of shape (teams, gameweeks).
+    '''
+
+    teams_list = general_fpl_info_dict['teams']
+    team_ids = np.array([team['id'] for team in teams_list])
+    team_names = np.array([team['name'] for team in teams_list], dtype= object)
+
+    attack_home = np.array([team['strength_attack_home'] for team in teams_list], dtype= 'float64')
+    attack_away = np.array([team['strength_attack_away'] for team in teams_list], dtype= 'float64')
+    defence_home = np.array([team['strength_defence_home'] for team in teams_list], dtype= 'float64')
+    defence_away = np.array([team['strength_defence_away'] for team in teams_list], dtype= 'float64')
+
+    # Fixtures that have been postponed without a new date have no gameweek, so cannot be placed in the matrix
+    scheduled_fixtures_list = [fixture for fixture in fixtures_list if fixture['event'] is not None]
+
+    gameweek_index = np.array([fixture['event'] for fixture in scheduled_fixtures_list], dtype= 'int64') - 1
+    home_team_ids = np.array([fixture['team_h'] for fixture in scheduled_fixtures_list], dtype= 'int64')
+    away_team_ids = np.array([fixture['team_a'] for fixture in scheduled_fixtures_list], dtype= 'int64')
+    home_difficulty = np.array([fixture['team_h_difficulty'] for fixture in scheduled_fixtures_list], dtype= 'float64')
+    away_difficulty = np.array([fixture['team_a_difficulty'] for fixture in scheduled_fixtures_list], dtype= 'float64')
+
+    # Convert team ids into matrix row positions
+    team_id_sorter = np.argsort(team_ids)
+    home_index = team_id_sorter[np.searchsorted(team_ids, home_team_ids, sorter= team_id_sorter)]
+    away_index = team_id_sorter[np.searchsorted(team_ids, away_team_ids, sorter= team_id_sorter)]
+
+    # Each fixture contributes one entry for the home side followed by one entry for the away side
+    team_index = np.concatenate([home_index, away_index])
+    cell_index = team_index * number_of_gameweeks + np.concatenate([gameweek_index, gameweek_index])
+
+    difficulty = np.concatenate([home_difficulty, away_difficulty])
+    attack = np.concatenate([
+        attack_home[home_index] / defence_away[away_index],
+        attack_away[away_index] / defence_home[home_index]
+    ])
+    defence = np.concatenate([
+        defence_home[home_index] / attack_away[away_index],
+        defence_away[away_index] / attack_home[home_index]
+    ])
+
+    matrix_shape = (len(team_ids), number_of_gameweeks)
+    matrix_size = matrix_shape[0] * matrix_shape[1]
+
+    fixture_matrices = {
+        'team_ids' : team_ids,
+        'team_names' : team_names,
+        'fixture_count' : np.bincount(cell_index, minlength= matrix_size).reshape(matrix_shape),
+        'difficulty' : np.bincount(cell_index, weights= difficulty, minlength= matrix_size).reshape(matrix_shape),
+        'attack' : np.bincount(cell_index, weights= attack, minlength= matrix_size).reshape(matrix_shape),
+        'defence' : np.bincount(cell_index, weights= defence, minlength= matrix_size).reshape(matrix_shape)
+    }
+
+    return fixture_matrices
+
+
+def project_team_strength(
+        fixture_matrices: dict,
+        start_gameweek: int,
+        horizon: int
+    ) -> pd.DataFrame:
+
+    '''
+    Projects each team's attacking and defensive strength over a window of upcoming gameweeks.
+
+    Args:
+        fixture_matrices - Dictionary of fixture matrices produced by build_fixture_matrices.
+        start_gameweek - The first gameweek included in the projection.
+        horizon - The number of gameweeks included in the projection.
+
+    Returns:
+        team_projection_df - Dataframe containing the number of fixtures, average fixture difficulty and summed attacking
+        and defensive strength ratios of each team over the window.
+    '''
+
+    window = slice(start_gameweek - 1, start_gameweek - 1 + horizon)
+
+    fixture_count = fixture_matrices['fixture_count'][:, window].sum(axis= 1)
+    difficulty = fixture_matrices['difficulty'][:, window].sum(axis= 1)
+
+    # Teams with no fixtures in the window have no meaningful average difficulty
+    with np.errstate(divide= 'ignore', invalid= 'ignore'):
+        average_difficulty = np.where(fixture_count > 0, difficulty / fixture_count, np.nan)
+
+    team_projection_df = pd.DataFrame(
+        {
+            'team_name' : fixture_matrices['team_names'],
+            'fixtures' : fixture_count,
+            'average_difficulty' : average_difficulty.round(2),
+            'projected_attack' : fixture_matrices['attack'][:, window].sum(axis= 1).round(3),
+            'projected_defence' : fixture_matrices['defence'][:, window].sum(axis= 1).round(3)
+        }
+    )
+
+    return team_projection_df
+
+
+def fixture_difficulty_dataframe(
+        fixture_matrices: dict,
+        start_gameweek: int,
+        horizon: int
+    ) -> pd.DataFrame:
+
+    '''
+    Converts the fixture difficulty matrix into a dataframe with one column per gameweek in the window. Blank gameweeks
+    have a difficulty of zero, and double gameweeks show the combined difficulty of both fixtures.
+
+    Args:
+        fixture_matrices - Dictionary of fixture matrices produced by build_fixture_matrices.
+        start_gameweek - The first gameweek included in the dataframe.
+        horizon - The number of gameweeks included in the dataframe.
+
+    Returns:
+        fixture_difficulty_df - Dataframe of fixture difficulty, with a row per team and a column per gameweek.
+    '''
+
+    window = slice(start_gameweek - 1, start_gameweek - 1 + horizon)
+    difficulty_matrix = fixture_matrices['difficulty'][:, window].astype('int64')
+
+    gameweek_columns = [f'gameweek_{gameweek}' for gameweek in range(start_gameweek, start_gameweek + difficulty_matrix.shape[1])]
+
+    fixture_difficulty_df = pd.DataFrame(difficulty_matrix, columns= gameweek_columns)
+    fixture_difficulty_df.insert(0, 'team_name', fixture_matrices['team_names'])
+
+    return fixture_difficulty_df
@@ -1,24 +1,40 @@
 import os
 import requests
+import numpy as np
 import pandas as pd
 from datetime import datetime
+import functions.archive_functions as archive
 
 class APIError(Exception):
 
-    '''Exception class to raise in case of errors with API calls'''
+    '''Exception class to raise in case of errors with API calls, holding the response code if one was received'''
 
-    def __init__(self, status):
+    def __init__(self, status, status_code= None):
         self.status = status
+        self.status_code = status_code
 
     def __str__(self):
         return f'APIError - {self.status}'
 
 
-def retrieve_general_data() -> dict:
+def retrieve_general_data(
+        archive_directory: str = None,
+        replay: bool = False,
+        season: str = None,
+        fetched_before: str = None
+    ) -> dict:
 
     '''
     Retrieves general information about the current FPL season from the API, and converts it into a dictionary.
-    
+
+    Args:
+        archive_directory - The full filepath to the folder containing the payload archive. If given, the raw response
+        is archived, or in replay mode is read from the archive instead of the API.
+        replay - Whether to read the most recently archived response rather than calling the API.
+        season - In replay mode, the season to read the most recent response of, in the format 'YYYY-YY'.
+        fetched_before - In replay mode, only responses fetched at or before this UTC time are read, in the format
+        'YYYY-MM-DDTHH:MM:SSZ'.
+
     Returns:
         general_fpl_info_dict - Dictionary containing general information about the current FPL season.
 
@@ -26,6 +42,19 @@ def retrieve_general_data() -> dict:
         APIError - Raised if the response code of the API call is unsuccessful.
     '''
 
+    if replay:
+
+        print('Reading general information from the payload archive...')
+        return archive.read_archived_payload(
+            endpoint= 'bootstrap-static/',
+            archive_directory= archive_directory,
+            season= season,
+            fetched_before= fetched_before
+        )
+
+    else:
+        pass
+
     print('Making API call to general information endpoint...')
     GENERAL_FPL_INFO_URL = 'https://fantasy.premierleague.com/api/bootstrap-static/'
 
@@ -43,10 +72,81 @@ def retrieve_general_data() -> dict:
     # Convert response into dictionary
     print('API call successful, converting to dictionary...')
     general_fpl_info_dict = general_fpl_info_response.json()
-        
+
+    if archive_directory is not None:
+
+        archive.archive_payload(
+            payload_bytes= general_fpl_info_response.content,
+            endpoint= 'bootstrap-static/',
+            archive_directory= archive_directory,
+            season= determine_current_season(general_fpl_info_dict) if general_fpl_info_dict.get('events') else None
+        )
+
+    else:
+        pass
+
     return general_fpl_info_dict
 
 
+def retrieve_gameweek_data(
+        gameweek_number: int,
+        season: str,
+        archive_directory: str = None,
+        replay: bool = False
+    ) -> dict:
+
+    '''
+    Retrieves the live data of every player in a gameweek from the API, and converts it into a dictionary.
+
+    Args:
+        gameweek_number - The gameweek to retrieve.
+        season - The Premier League season the gameweek belongs to, in the format 'YYYY-YY'.
+        archive_directory - The full filepath to the folder containing the payload archive. If given, the raw response
+        is archived, or in replay mode is read from the archive instead of the API.
+        replay - Whether to read the most recently archived response rather than calling the API.
+
+    Returns:
+        gameweek_dict - Dictionary containing the stats of every player in the gameweek.
+
+    Raises:
+        APIError - Raised if the response code of the API call is unsuccessful.
+    '''
+
+    GAMEWEEK_ENDPOINT = f'event/{gameweek_number}/live/'
+
+    if replay:
+        return archive.read_archived_payload(endpoint= GAMEWEEK_ENDPOINT, archive_directory= archive_directory, season= season)
+
+    else:
+        pass
+
+    try:
+
+        gameweek_data_response = requests.get(f'https://fantasy.premierleague.com/api/{GAMEWEEK_ENDPOINT}')
+        gameweek_data_response.raise_for_status()
+
+    except requests.exceptions.HTTPError:
+
+        response_code = gameweek_data_response.status_code
+        raise APIError(f'Response Code: {response_code}')
+
+    gameweek_dict = gameweek_data_response.json()
+
+    if archive_directory is not None:
+
+        archive.archive_payload(
+            payload_bytes= gameweek_data_response.content,
+            endpoint= GAMEWEEK_ENDPOINT,
+            archive_directory= archive_directory,
+            season= season
+        )
+
+    else:
+        pass
+
+    return gameweek_dict
+
+
 def determine_current_season(general_fpl_info_dict: dict) -> str:
 
     '''
@@ -259,6 +359,37 @@ def map_integer_columns_to_string(
     return dataframe
 
 
+def build_gameweek_df(
+        gameweek_dict: dict,
+        player_details_df: pd.DataFrame
+    ) -> pd.DataFrame:
+
+    '''
+    Converts the response of the gameweek endpoint into a dataframe, and merges it with the details of each player.
+
+    Args:
+        gameweek_dict - Dictionary containing the performance data of every player for a given gameweek.
+        player_details_df - Dataframe containing general information about each player.
+
+    Returns:
+        full_gameweek_df - Dataframe containing one row per player, with their stats followed by their 'id' and details.
+    '''
+
+    # Every player's stats are built into the dataframe at once, rather than one single-row dataframe per player
+    elements_list = gameweek_dict['elements']
+
+    full_gameweek_df = pd.DataFrame.from_records([element['stats'] for element in elements_list])
+    full_gameweek_df['id'] = [element['id'] for element in elements_list]
+
+    full_gameweek_df = full_gameweek_df.merge(
+        right= player_details_df,
+        how= 'inner',
+        on= 'id'
+    )
+
+    return full_gameweek_df
+
+
 def attacking_score_calculation(
         dataframe: pd.DataFrame,
         config_dict: dict
@@ -276,43 +407,164 @@ def attacking_score_calculation(
     '''
 
     # Calculation a player's 'expected points' based on their attacking output.
-    dataframe['minutes_score'] = (dataframe['minutes'] / 90) * 2
-    dataframe['xgoals_score'] = dataframe.apply(lambda row: goal_value_multiplier(row, config_dict), axis= 1)
-    dataframe['xassist_score'] = dataframe['expected_assists'] * 3
-
-    dataframe = dataframe.astype(
-        {
-            'minutes_score' : 'float64', 
-            'xgoals_score' : 'float64', 
-            'xassist_score' : 'float64'
-        }
-    )
-
-    dataframe['attacking_score'] = dataframe['minutes_score'] + dataframe['xgoals_score'] + dataframe['xassist_score']
-    dataframe['attacking_score'] = dataframe['attacking_score'].round(2)
-    dataframe = dataframe.drop(['minutes_score', 'xgoals_score', 'xassist_score'], axis= 1)
+    dataframe['attacking_score'] = calculate_attacking_score(dataframe, config_dict)
 
     return dataframe
 
 
-def goal_value_multiplier(
-        row: pd.Series,
+def calculate_attacking_score(
+        dataframe: pd.DataFrame,
         config_dict: dict
-    ) -> int:
+    ) -> pd.Series:
 
     '''
-    Converts a player's xG into an 'expected points' value, based on the points a player in their position would score per goal
-    in FPL.
+    Calculates each player's 'expected points' based on their minutes, xG and xA. Goals are valued according to the points
+    a player in their position would score per goal in FPL.
 
     Args:
-        row - The player's performance data for a given gameweek.
+        dataframe - Dataframe (or dictionary of series) containing the 'minutes', 'expected_goals', 'expected_assists' and
+        'position' of each player.
         config_dict - Dictionary containing configuration info for processing of the FPL API returns.
+
+    Returns:
+        attacking_score - Series containing each player's attacking score, rounded to two decimal places.
     '''
 
-    player_position = row['position']
-    goal_value = config_dict['goal_values'][player_position]
-    return row['expected_goals'] * goal_value
-    
+    minutes_score = ((dataframe['minutes'] / 90) * 2).astype('float64')
+    xgoals_score = (dataframe['expected_goals'] * dataframe['position'].map(config_dict['goal_values'])).astype('float64')
+    xassist_score = (dataframe['expected_assists'] * 3).astype('float64')
+
+    attacking_score = (minutes_score + xgoals_score + xassist_score).round(2)
+
+    return attacking_score
+
+
+def compile_transform_plan(config_dict: dict) -> dict:
+
+    '''
+    Compiles the column configuration into a plan for converting a merged gameweek dataframe into its final form. The
+    plan only selects the columns that survive into the output, so dropped columns are never copied.
+
+    Args:
+        config_dict - Dictionary containing configuration info for processing of the FPL API returns.
+
+    Returns:
+        transform_plan - Dictionary containing the 'projected_columns' to select, the 'column_dtypes' to convert them to,
+        the 'output_columns' in their final order, the 'excluded_positions' to filter out and the 'goal_values' used
+        for scoring.
+    '''
+
+    output_columns = config_dict['column_reordering_list']
+    calculated_columns = ['attacking_score']
+
+    # Columns needed for scoring are kept even if they are not part of the output
+    scoring_columns = ['minutes', 'expected_goals', 'expected_assists', 'position']
+
+    projected_columns = [column for column in output_columns if column not in calculated_columns]
+    projected_columns += [column for column in scoring_columns if column not in projected_columns]
+
+    column_dtypes = {
+        column : dtype for column, dtype in config_dict['column_dtypes_mapper'].items()
+        if column in projected_columns
+    }
+
+    transform_plan = {
+        'projected_columns' : projected_columns,
+        'column_dtypes' : column_dtypes,
+        'output_columns' : output_columns,
+        'excluded_positions' : ['MNG'],
+        'goal_values' : config_dict['goal_values']
+    }
+
+    return transform_plan
+
+
+def apply_transform_plan(
+        dataframe: pd.DataFrame,
+        transform_plan: dict
+    ) -> pd.DataFrame:
+
+    '''
+    Converts a merged gameweek dataframe into its final form. Each projected column is filtered and converted in a single
+    step, and the output dataframe is built once from those columns, so no intermediate copies of the whole dataframe are
+    made.
+
+    Args:
+        dataframe - The merged dataframe containing player data for a given gameweek.
+        transform_plan - Dictionary produced by compile_transform_plan.
+
+    Returns:
+        dataframe - Dataframe containing the output columns in their final order, with managers removed.
+    '''
+
+    row_positions = np.flatnonzero(~dataframe['position'].isin(transform_plan['excluded_positions']).to_numpy())
+    column_values_dict = {}
+
+    for column in transform_plan['projected_columns']:
+
+        column_values = dataframe[column].to_numpy()[row_positions]
+        column_dtype = transform_plan['column_dtypes'].get(column)
+
+        if column_dtype is not None and column_values.dtype != column_dtype:
+            column_values = column_values.astype(column_dtype)
+
+        else:
+            pass
+
+        column_values_dict[column] = column_values
+
+    dataframe = pd.DataFrame(
+        {column : column_values_dict[column] for column in transform_plan['output_columns'] if column in column_values_dict},
+        copy= False
+    )
+
+    # The score is inserted straight into its final position, so the columns never need reordering
+    dataframe.insert(
+        loc= transform_plan['output_columns'].index('attacking_score'),
+        column= 'attacking_score',
+        value= calculate_attacking_score(
+            {column : pd.Series(column_values_dict[column]) for column in ['minutes', 'expected_goals', 'expected_assists', 'position']},
+            transform_plan
+        )
+    )
+
+    return dataframe
+
+
+def load_gameweek_files(
+        gameweek_files_directory: str,
+        gameweek_list: list
+    ) -> pd.DataFrame:
+
+    '''
+    Reads in the data files for the specified gameweeks and combines them into a single dataframe.
+
+    Args:
+        gameweek_files_directory - The full filepath to the folder containing the gameweek files for the season.
+        gameweek_list - List of the gameweek numbers to read in.
+
+    Returns:
+        gameweeks_df - Dataframe containing the rows of every requested gameweek file, with an added 'gameweek' column.
+    '''
+
+    gameweek_dataframe_list = []
+
+    for gameweek_number in gameweek_list:
+
+        csv_filepath = os.path.join(
+            gameweek_files_directory,
+            f'Gameweek_{gameweek_number}.csv'
+        )
+
+        gameweek_df = pd.read_csv(csv_filepath)
+        gameweek_df['gameweek'] = gameweek_number
+
+        gameweek_dataframe_list.append(gameweek_df)
+
+    gameweeks_df = pd.concat(gameweek_dataframe_list, ignore_index= True)
+
+    return gameweeks_df
+
 
 if __name__ == '__main__':
 
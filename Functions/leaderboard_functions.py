@@ -0,0 +1,361 @@
+import os
+import json
+import heapq
+import pandas as pd
+import functions.fpl_functions as fpl
+
+
+def load_leaderboards(leaderboards_filepath: str) -> dict:
+
+    '''
+    Reads in the leaderboards file for a season, or creates an empty set of leaderboards if the file does not exist yet.
+
+    Args:
+        leaderboards_filepath - The full filepath to the leaderboards json file.
+
+    Returns:
+        leaderboards_dict - Dictionary containing the gameweek and season leaderboards.
+    '''
+
+    leaderboards_file_exists = os.path.exists(leaderboards_filepath)
+
+    if not leaderboards_file_exists:
+        return empty_leaderboards()
+
+    else:
+        pass
+
+    with open(leaderboards_filepath) as temporary_file:
+        leaderboards_dict = json.load(temporary_file)
+
+    return leaderboards_dict
+
+
+def empty_leaderboards() -> dict:
+
+    '''
+    Creates an empty set of leaderboards, for a season with no gameweeks processed yet.
+
+    Returns:
+        leaderboards_dict - Dictionary containing empty gameweek and season leaderboards.
+    '''
+
+    leaderboards_dict = {
+        'gameweeks' : {},
+        'season' : {}
+    }
+
+    return leaderboards_dict
+
+
+def save_leaderboards(
+        leaderboards_dict: dict,
+        leaderboards_filepath: str
+    ):
+
+    '''
+    Writes the leaderboards to a json file. The file is written to a temporary file first and then moved into place, so
+    an interrupted run never leaves partial leaderboards behind.
+
+    Args:
+        leaderboards_dict - Dictionary containing the gameweek and season leaderboards.
+        leaderboards_filepath - The full filepath to the leaderboards json file.
+    '''
+
+    with open(f'{leaderboards_filepath}.tmp', 'w') as temporary_file:
+        json.dump(leaderboards_dict, temporary_file)
+
+    os.replace(f'{leaderboards_filepath}.tmp', leaderboards_filepath)
+
+
+def build_leaderboard(
+        records: list,
+        size: int
+    ) -> dict:
+
+    '''
+    Finds the top players overall, by position and by team in a single pass, using a bounded min-heap for each group so
+    that only 'size' players are ever held per group.
+
+    Args:
+        records - List of (id, full_name, team_name, position, value) tuples, one per player.
+        size - The number of players to keep in each leaderboard.
+
+    Returns:
+        leaderboard_dict - Dictionary containing the 'overall' leaderboard, and dictionaries of leaderboards keyed by
+        'position' and 'team'. Each leaderboard is a list of player entries, sorted from highest to lowest value.
+    '''
+
+    overall_heap = []
+    position_heaps = {}
+    team_heaps = {}
+
+    for player_id, full_name, team_name, position, value in records:
+
+        # Missing values cannot be ranked
+        if pd.isna(value):
+            continue
+
+        else:
+            pass
+
+        # Ties are broken in favour of the lower player id
+        heap_item = (float(value), -int(player_id), full_name, team_name, position)
+
+        for heap in (
+            overall_heap,
+            position_heaps.setdefault(position, []),
+            team_heaps.setdefault(team_name, [])
+        ):
+
+            if len(heap) < size:
+                heapq.heappush(heap, heap_item)
+
+            elif heap_item > heap[0]:
+                heapq.heapreplace(heap, heap_item)
+
+            else:
+                pass
+
+    leaderboard_dict = {
+        'overall' : heap_to_entries(overall_heap),
+        'position' : {position : heap_to_entries(heap) for position, heap in position_heaps.items()},
+        'team' : {team_name : heap_to_entries(heap) for team_name, heap in team_heaps.items()}
+    }
+
+    return leaderboard_dict
+
+
+def heap_to_entries(heap: list) -> list:
+
+    '''
+    Converts a leaderboard heap into a list of player entries, sorted from highest to lowest value.
+
+    Args:
+        heap - List of (value, -id, full_name, team_name, position) tuples held as a min-heap.
+
+    Returns:
+        entries_list - List of player entry dictionaries.
+    '''
+
+    entries_list = [
+        {
+            'id' : -negative_player_id,
+            'full_name' : full_name,
+            'team_name' : team_name,
+            'position' : position,
+            'value' : round(float(value), 2)
+        }
+        for value, negative_player_id, full_name, team_name, position in sorted(heap, reverse= True)
+    ]
+
+    return entries_list
+
+
+def update_leaderboards(
+        leaderboards_dict: dict,
+        gameweek_df: pd.DataFrame,
+        gameweek_number: int,
+        season_totals_df: pd.DataFrame,
+        config_dict: dict
+    ) -> dict:
+
+    '''
+    Adds a newly processed gameweek to the leaderboards, building its gameweek leaderboards and rebuilding the season
+    leaderboards from the season totals. When several gameweeks are added at once, update_gameweek_leaderboards can be
+    called for each of them and update_season_leaderboards once at the end instead.
+
+    Args:
+        leaderboards_dict - Dictionary containing the gameweek and season leaderboards.
+        gameweek_df - Dataframe containing player data for the gameweek.
+        gameweek_number - The gameweek the data relates to.
+        season_totals_df - Dataframe indexed by player 'id', containing each player's details and season totals.
+        config_dict - Dictionary containing configuration info for processing of the FPL API returns.
+
+    Returns:
+        leaderboards_dict - The updated leaderboards.
+    '''
+
+    leaderboards_dict = update_gameweek_leaderboards(
+        leaderboards_dict= leaderboards_dict,
+        gameweek_df= gameweek_df,
+        gameweek_number= gameweek_number,
+        config_dict= config_dict
+    )
+
+    leaderboards_dict = update_season_leaderboards(
+        leaderboards_dict= leaderboards_dict,
+        season_totals_df= season_totals_df,
+        config_dict= config_dict
+    )
+
+    return leaderboards_dict
+
+
+def update_gameweek_leaderboards(
+        leaderboards_dict: dict,
+        gameweek_df: pd.DataFrame,
+        gameweek_number: int,
+        config_dict: dict
+    ) -> dict:
+
+    '''
+    Builds the leaderboards of a single gameweek, replacing any it already has.
+
+    Args:
+        leaderboards_dict - Dictionary containing the gameweek and season leaderboards.
+        gameweek_df - Dataframe containing player data for the gameweek.
+        gameweek_number - The gameweek the data relates to.
+        config_dict - Dictionary containing configuration info for processing of the FPL API returns.
+
+    Returns:
+        leaderboards_dict - The leaderboards, with those of the gameweek added.
+    '''
+
+    size = config_dict['leaderboard_size']
+    gameweek_key = str(gameweek_number)
+
+    leaderboards_dict['gameweeks'][gameweek_key] = {}
+
+    for metric in config_dict['leaderboard_metrics']:
+
+        gameweek_records = gameweek_df[['id', 'full_name', 'team_name', 'position', metric]].itertuples(index= False, name= None)
+        leaderboards_dict['gameweeks'][gameweek_key][metric] = build_leaderboard(gameweek_records, size)
+
+    return leaderboards_dict
+
+
+def update_season_leaderboards(
+        leaderboards_dict: dict,
+        season_totals_df: pd.DataFrame,
+        config_dict: dict
+    ) -> dict:
+
+    '''
+    Rebuilds the season leaderboards from the season totals.
+
+    Args:
+        leaderboards_dict - Dictionary containing the gameweek and season leaderboards.
+        season_totals_df - Dataframe indexed by player 'id', containing each player's details and season totals.
+        config_dict - Dictionary containing configuration info for processing of the FPL API returns.
+
+    Returns:
+        leaderboards_dict - The leaderboards, with the season leaderboards replaced.
+    '''
+
+    size = config_dict['leaderboard_size']
+
+    for metric in config_dict['leaderboard_metrics']:
+
+        season_records = season_totals_df[['full_name', 'team_name', 'position', metric]].itertuples(index= True, name= None)
+        leaderboards_dict['season'][metric] = build_leaderboard(season_records, size)
+
+    return leaderboards_dict
+
+
+def rebuild_leaderboards(
+        gameweek_files_directory: str,
+        gameweek_list: list,
+        season_totals_df: pd.DataFrame,
+        config_dict: dict
+    ) -> dict:
+
+    '''
+    Builds the leaderboards from scratch from the gameweek files, for when the saved leaderboards are missing or out of
+    date.
+
+    Args:
+        gameweek_files_directory - The full filepath to the folder containing the gameweek files for the season.
+        gameweek_list - List of the gameweek numbers to include in the leaderboards.
+        season_totals_df - Dataframe indexed by player 'id', containing the season totals of the same gameweeks.
+        config_dict - Dictionary containing configuration info for processing of the FPL API returns.
+
+    Returns:
+        leaderboards_dict - Dictionary containing the gameweek and season leaderboards.
+    '''
+
+    leaderboards_dict = empty_leaderboards()
+
+    if not gameweek_list:
+        return leaderboards_dict
+
+    else:
+        pass
+
+    gameweeks_df = fpl.load_gameweek_files(
+        gameweek_files_directory= gameweek_files_directory,
+        gameweek_list= sorted(gameweek_list)
+    )
+
+    for gameweek_number, gameweek_df in gameweeks_df.groupby('gameweek', sort= True):
+
+        leaderboards_dict = update_gameweek_leaderboards(
+            leaderboards_dict= leaderboards_dict,
+            gameweek_df= gameweek_df,
+            gameweek_number= gameweek_number,
+            config_dict= config_dict
+        )
+
+    # The season totals already cover every gameweek, so the season leaderboards only need building once
+    leaderboards_dict = update_season_leaderboards(
+        leaderboards_dict= leaderboards_dict,
+        season_totals_df= season_totals_df,
+        config_dict= config_dict
+    )
+
+    return leaderboards_dict
+
+
+def query_leaderboard(
+        leaderboards_dict: dict,
+        metric: str,
+        gameweek: int = None,
+        position: str = None,
+        team: str = None,
+        limit: int = None
+    ) -> list:
+
+    '''
+    Retrieves a precomputed leaderboard, without scanning any gameweek data.
+
+    Args:
+        leaderboards_dict - Dictionary containing the gameweek and season leaderboards.
+        metric - The metric the players are ranked by.
+        gameweek - The gameweek to retrieve the leaderboard for. The season-to-date leaderboard is returned if not given.
+        position - Optionally restricts the leaderboard to a single position (e.g. 'MID').
+        team - Optionally restricts the leaderboard to a single team (e.g. 'Liverpool').
+        limit - Optionally restricts the number of players returned.
+
+    Returns:
+        entries_list - List of player entries, sorted from highest to lowest value.
+
+    Raises:
+        ValueError - Raised if no leaderboard exists for the requested metric or gameweek, or if both a position and a
+        team are requested.
+    '''
+
+    if gameweek is None:
+        metric_leaderboards = leaderboards_dict['season'].get(metric)
+
+    else:
+        metric_leaderboards = leaderboards_dict['gameweeks'].get(str(gameweek), {}).get(metric)
+
+    if metric_leaderboards is None:
+        raise ValueError(f'ValueError - No leaderboard available for metric {metric} in gameweek {gameweek}')
+
+    else:
+        pass
+
+    if position and team:
+        raise ValueError('ValueError - Leaderboards can be filtered by position or team, but not both')
+
+    elif position:
+        entries_list = metric_leaderboards['position'].get(position, [])
+
+    elif team:
+        entries_list = metric_leaderboards['team'].get(team, [])
+
+    else:
+        entries_list = metric_leaderboards['overall']
+
+    return entries_list[:limit]
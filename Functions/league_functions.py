@@ -0,0 +1,313 @@
+import os
+import json
+import time
+import threading
+import requests
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from functions.fpl_functions import APIError
+
+
+PICKS_PER_MANAGER = 15
+
+# Each worker thread keeps its own session, so connections are reused without being shared between threads
+THREAD_LOCAL_STORAGE = threading.local()
+
+
+def fetch_json(
+        url: str,
+        max_retries: int = 3
+    ) -> dict:
+
+    '''
+    Makes a request to an FPL API endpoint, retrying with an increasing delay if the request is rate limited, the
+    server errors, or the connection fails or times out.
+
+    Args:
+        url - The URL of the endpoint.
+        max_retries - The number of times to retry the request before giving up.
+
+    Returns:
+        response_dict - The response, converted into a dictionary.
+
+    Raises:
+        APIError - Raised if the response code of the API call is unsuccessful, or the connection fails, after all
+        retries. The response code is held in its status_code.
+    '''
+
+    if not hasattr(THREAD_LOCAL_STORAGE, 'session'):
+        THREAD_LOCAL_STORAGE.session = requests.Session()
+
+    else:
+        pass
+
+    for attempt_number in range(max_retries + 1):
+
+        try:
+            response = THREAD_LOCAL_STORAGE.session.get(url, timeout= 30)
+
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as connection_error:
+
+            if attempt_number < max_retries:
+
+                time.sleep(2 ** attempt_number)
+                continue
+
+            else:
+                raise APIError(f'Request failed: {connection_error} - {url}')
+
+        response_should_be_retried = response.status_code == 429 or response.status_code >= 500
+
+        if response_should_be_retried and attempt_number < max_retries:
+
+            time.sleep(parse_retry_after(response.headers.get('Retry-After'), default_seconds= 2 ** attempt_number))
+            continue
+
+        else:
+            pass
+
+        try:
+            response.raise_for_status()
+
+        except requests.exceptions.HTTPError:
+            raise APIError(f'Response Code: {response.status_code} - {url}', status_code= response.status_code)
+
+        return response.json()
+
+
+def parse_retry_after(
+        retry_after: str,
+        default_seconds: float
+    ) -> float:
+
+    '''
+    Converts a Retry-After header into a number of seconds to wait. The header can be given either as a number of
+    seconds or as an HTTP date.
+
+    Args:
+        retry_after - The value of the Retry-After header, or None if the header was not sent.
+        default_seconds - The number of seconds to wait if the header is missing or cannot be read.
+
+    Returns:
+        retry_after_seconds - The number of seconds to wait, which is never negative.
+    '''
+
+    if retry_after is None:
+        return default_seconds
+
+    else:
+        pass
+
+    try:
+        return max(float(retry_after), 0)
+
+    except ValueError:
+        pass
+
+    try:
+        retry_after_date = parsedate_to_datetime(retry_after)
+
+    except (TypeError, ValueError):
+        return default_seconds
+
+    # Dates without a timezone are treated as UTC, as HTTP dates always are
+    if retry_after_date.tzinfo is None:
+        retry_after_date = retry_after_date.replace(tzinfo= timezone.utc)
+
+    else:
+        pass
+
+    return max((retry_after_date - datetime.now(timezone.utc)).total_seconds(), 0)
+
+
+def retrieve_league_standings(league_id: int) -> pd.DataFrame:
+
+    '''
+    Retrieves every manager in a classic mini-league, working through each page of the standings.
+
+    Args:
+        league_id - The id of the classic mini-league.
+
+    Returns:
+        league_standings_df - Dataframe containing the 'entry', 'entry_name', 'player_name', 'rank' and 'total' of each
+        manager in the league.
+    '''
+
+    standings_list = []
+    page_number = 1
+    has_next_page = True
+
+    while has_next_page:
+
+        standings_dict = fetch_json(
+            f'https://fantasy.premierleague.com/api/leagues-classic/{league_id}/standings/?page_standings={page_number}'
+        )
+
+        standings_list.extend(standings_dict['standings']['results'])
+        has_next_page = standings_dict['standings']['has_next']
+        page_number += 1
+
+    league_standings_df = pd.DataFrame(
+        standings_list,
+        columns= ['entry', 'entry_name', 'player_name', 'rank', 'total']
+    )
+
+    return league_standings_df
+
+
+def retrieve_manager_picks(
+        entry_id: int,
+        gameweek: int,
+        cache_directory: str
+    ) -> dict:
+
+    '''
+    Retrieves a manager's picks for a gameweek, using the cached copy if the picks have been retrieved before. Picks for
+    a completed gameweek never change, so cached picks never expire.
+
+    Args:
+        entry_id - The id of the manager's team.
+        gameweek - The gameweek to retrieve the picks for.
+        cache_directory - The full filepath to the folder the picks are cached in.
+
+    Returns:
+        manager_picks_dict - Dictionary containing the 'picks' and 'active_chip' of the manager, or None if the manager
+        has no picks for the gameweek (e.g. if they joined the game afterwards).
+    '''
+
+    cache_filepath = os.path.join(cache_directory, f'gameweek_{gameweek}', f'{entry_id}.json')
+    cached_picks_exist = os.path.exists(cache_filepath)
+
+    if cached_picks_exist:
+
+        with open(cache_filepath) as temporary_file:
+            return json.load(temporary_file)
+
+    else:
+        pass
+
+    try:
+        picks_response_dict = fetch_json(f'https://fantasy.premierleague.com/api/entry/{entry_id}/event/{gameweek}/picks/')
+
+    except APIError as api_error:
+
+        if api_error.status_code == 404:
+            return None
+
+        else:
+            raise
+
+    manager_picks_dict = {
+        'picks' : [[pick['element'], pick['multiplier']] for pick in picks_response_dict['picks']],
+        'active_chip' : picks_response_dict.get('active_chip')
+    }
+
+    # Writing to a temporary file first means an interrupted run never leaves a partial cache file behind
+    os.makedirs(os.path.dirname(cache_filepath), exist_ok= True)
+
+    with open(f'{cache_filepath}.tmp', 'w') as temporary_file:
+        json.dump(manager_picks_dict, temporary_file)
+
+    os.replace(f'{cache_filepath}.tmp', cache_filepath)
+
+    return manager_picks_dict
+
+
+def retrieve_league_picks(
+        entry_ids: list,
+        gameweek: int,
+        cache_directory: str,
+        max_workers: int
+    ) -> dict:
+
+    '''
+    Retrieves the picks of many managers at once, with a limit on the number of requests in flight, and stores them in
+    compact integer matrices.
+
+    Args:
+        entry_ids - List of the ids of the managers' teams.
+        gameweek - The gameweek to retrieve the picks for.
+        cache_directory - The full filepath to the folder the picks are cached in.
+        max_workers - The maximum number of requests to make at once.
+
+    Returns:
+        league_picks_dict - Dictionary containing the 'entry_ids' of the managers with picks, their 'picks' as an int32
+        matrix of player ids and their pick 'multipliers' as an int8 matrix, both of shape (managers, 15), and a list
+        of their 'active_chips'.
+    '''
+
+    with ThreadPoolExecutor(max_workers= max_workers) as executor:
+
+        manager_picks_list = list(
+            executor.map(
+                lambda entry_id: retrieve_manager_picks(entry_id, gameweek, cache_directory),
+                entry_ids
+            )
+        )
+
+    manager_positions = [position for position, manager_picks in enumerate(manager_picks_list) if manager_picks is not None]
+
+    picks_matrix = np.zeros((len(manager_positions), PICKS_PER_MANAGER, 2), dtype= 'int32')
+
+    for row_number, manager_position in enumerate(manager_positions):
+
+        manager_picks = manager_picks_list[manager_position]['picks'][:PICKS_PER_MANAGER]
+        picks_matrix[row_number, :len(manager_picks)] = manager_picks
+
+    league_picks_dict = {
+        'entry_ids' : np.array([entry_ids[manager_position] for manager_position in manager_positions], dtype= 'int64'),
+        'picks' : np.ascontiguousarray(picks_matrix[:, :, 0]),
+        'multipliers' : picks_matrix[:, :, 1].astype('int8'),
+        'active_chips' : [manager_picks_list[manager_position]['active_chip'] for manager_position in manager_positions]
+    }
+
+    return league_picks_dict
+
+
+def calculate_effective_ownership(league_picks_dict: dict) -> pd.DataFrame:
+
+    '''
+    Calculates the ownership, starting ownership, captaincy share and effective ownership of every player picked in the
+    league. Each measure is accumulated across all managers at once with a weighted count over the flattened picks.
+
+    Args:
+        league_picks_dict - Dictionary produced by retrieve_league_picks.
+
+    Returns:
+        effective_ownership_df - Dataframe containing each picked player's 'id' and percentage 'ownership',
+        'starting_ownership', 'captaincy' and 'effective_ownership', sorted by effective ownership.
+    '''
+
+    number_of_managers = len(league_picks_dict['entry_ids'])
+
+    picks = league_picks_dict['picks'].ravel()
+    multipliers = league_picks_dict['multipliers'].ravel().astype('int64')
+    number_of_player_ids = int(picks.max()) + 1 if picks.size else 1
+
+    # Each count is a percentage of managers, so a triple captain counts 300% towards effective ownership
+    with np.errstate(divide= 'ignore', invalid= 'ignore'):
+
+        ownership = np.bincount(picks, minlength= number_of_player_ids) / number_of_managers * 100
+        starting_ownership = np.bincount(picks, weights= multipliers > 0, minlength= number_of_player_ids) / number_of_managers * 100
+        captaincy = np.bincount(picks, weights= multipliers > 1, minlength= number_of_player_ids) / number_of_managers * 100
+        effective_ownership = np.bincount(picks, weights= multipliers, minlength= number_of_player_ids) / number_of_managers * 100
+
+    # Player id zero marks an empty pick slot
+    picked_player_ids = np.flatnonzero(ownership[1:] > 0) + 1
+
+    effective_ownership_df = pd.DataFrame(
+        {
+            'id' : picked_player_ids,
+            'ownership' : ownership[picked_player_ids].round(2),
+            'starting_ownership' : starting_ownership[picked_player_ids].round(2),
+            'captaincy' : captaincy[picked_player_ids].round(2),
+            'effective_ownership' : effective_ownership[picked_player_ids].round(2)
+        }
+    )
+
+    effective_ownership_df = effective_ownership_df.sort_values('effective_ownership', ascending= False, kind= 'stable')
+
+    return effective_ownership_df.reset_index(drop= True)
@@ -0,0 +1,338 @@
+import os
+import re
+import json
+import hashlib
+import pandas as pd
+from datetime import datetime, timezone
+
+
+MANIFEST_FILENAME = 'manifest.json'
+GAMEWEEK_FILENAME_PATTERN = re.compile(r'^Gameweek_(\d+)\.csv$')
+
+
+def calculate_schema_version(columns_list: list) -> str:
+
+    '''
+    Fingerprints the columns of a gameweek file, so files written under a different column configuration can be told
+    apart from current ones.
+
+    Args:
+        columns_list - The columns of the gameweek file, in order.
+
+    Returns:
+        schema_version - The first 12 characters of the SHA-256 hash of the column list.
+    '''
+
+    return hashlib.sha256(json.dumps(list(columns_list)).encode()).hexdigest()[:12]
+
+
+def load_manifest(gameweek_files_directory: str) -> dict:
+
+    '''
+    Reads in the manifest for a season, or creates an empty manifest if the file does not exist yet.
+
+    Args:
+        gameweek_files_directory - The full filepath to the folder containing the gameweek files for the season.
+
+    Returns:
+        manifest_dict - Dictionary containing an entry under 'outputs' for each gameweek file, keyed by filename.
+    '''
+
+    manifest_filepath = os.path.join(gameweek_files_directory, MANIFEST_FILENAME)
+    manifest_file_exists = os.path.exists(manifest_filepath)
+
+    if not manifest_file_exists:
+        return {'outputs' : {}}
+
+    else:
+        pass
+
+    with open(manifest_filepath) as temporary_file:
+        manifest_dict = json.load(temporary_file)
+
+    return manifest_dict
+
+
+def save_manifest(
+        manifest_dict: dict,
+        gameweek_files_directory: str
+    ):
+
+    '''
+    Writes the manifest for a season. The manifest is written to a temporary file first and then moved into place, so an
+    interrupted run never leaves a partial manifest behind.
+
+    Args:
+        manifest_dict - Dictionary containing the manifest entries.
+        gameweek_files_directory - The full filepath to the folder containing the gameweek files for the season.
+    '''
+
+    manifest_filepath = os.path.join(gameweek_files_directory, MANIFEST_FILENAME)
+
+    with open(f'{manifest_filepath}.tmp', 'w') as temporary_file:
+        json.dump(manifest_dict, temporary_file, indent= 4, sort_keys= True)
+
+    os.replace(f'{manifest_filepath}.tmp', manifest_filepath)
+
+
+def build_manifest_entry(
+        csv_bytes: bytes,
+        gameweek_number: int,
+        columns_list: list
+    ) -> dict:
+
+    '''Describes a gameweek file by its gameweek, row count, size, checksum, schema version and build time'''
+
+    manifest_entry = {
+        'gameweek' : gameweek_number,
+        'row_count' : max(csv_bytes.count(b'\n') - 1, 0),
+        'size_bytes' : len(csv_bytes),
+        'sha256' : hashlib.sha256(csv_bytes).hexdigest(),
+        'schema_version' : calculate_schema_version(columns_list),
+        'built_at' : datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    }
+
+    return manifest_entry
+
+
+def write_gameweek_file(
+        gameweek_df: pd.DataFrame,
+        gameweek_number: int,
+        gameweek_files_directory: str,
+        manifest_dict: dict
+    ) -> dict:
+
+    '''
+    Writes a gameweek file and records it in the manifest. The file is moved into place before the manifest is saved, so
+    the manifest never lists a file that has not been completely written.
+
+    Args:
+        gameweek_df - Dataframe containing the cleaned data for the gameweek.
+        gameweek_number - The gameweek the data belongs to.
+        gameweek_files_directory - The full filepath to the folder containing the gameweek files for the season.
+        manifest_dict - Dictionary containing the manifest entries, which is updated in place.
+
+    Returns:
+        manifest_dict - The updated manifest.
+    '''
+
+    csv_filename = f'Gameweek_{gameweek_number}.csv'
+    csv_filepath = os.path.join(gameweek_files_directory, csv_filename)
+    csv_bytes = gameweek_df.to_csv(index= False).encode()
+
+    with open(f'{csv_filepath}.tmp', 'wb') as temporary_file:
+        temporary_file.write(csv_bytes)
+
+    os.replace(f'{csv_filepath}.tmp', csv_filepath)
+
+    manifest_dict['outputs'][csv_filename] = build_manifest_entry(csv_bytes, gameweek_number, list(gameweek_df.columns))
+    save_manifest(manifest_dict, gameweek_files_directory)
+
+    return manifest_dict
+
+
+def scan_gameweek_files(gameweek_files_directory: str) -> dict:
+
+    '''Lists the gameweek files in a season's folder in a single pass, returning the size of each by filename'''
+
+    with os.scandir(gameweek_files_directory) as directory_entries:
+
+        gameweek_file_sizes_dict = {
+            directory_entry.name : directory_entry.stat().st_size
+            for directory_entry in directory_entries
+            if GAMEWEEK_FILENAME_PATTERN.match(directory_entry.name)
+        }
+
+    return gameweek_file_sizes_dict
+
+
+def adopt_untracked_files(
+        manifest_dict: dict,
+        gameweek_files_directory: str
+    ) -> list:
+
+    '''
+    Adds gameweek files that are not in the manifest, such as those written before the manifest existed, so they do not
+    have to be processed again. Only the untracked files are read.
+
+    Args:
+        manifest_dict - Dictionary containing the manifest entries, which is updated in place.
+        gameweek_files_directory - The full filepath to the folder containing the gameweek files for the season.
+
+    Returns:
+        adopted_gameweeks_list - List of the gameweek numbers added to the manifest.
+    '''
+
+    adopted_gameweeks_list = []
+
+    for csv_filename in scan_gameweek_files(gameweek_files_directory):
+
+        if csv_filename in manifest_dict['outputs']:
+            continue
+
+        else:
+            pass
+
+        with open(os.path.join(gameweek_files_directory, csv_filename), 'rb') as temporary_file:
+            csv_bytes = temporary_file.read()
+
+        gameweek_number = int(GAMEWEEK_FILENAME_PATTERN.match(csv_filename).group(1))
+        columns_list = csv_bytes.split(b'\n', 1)[0].decode().strip().split(',')
+
+        manifest_dict['outputs'][csv_filename] = build_manifest_entry(csv_bytes, gameweek_number, columns_list)
+        adopted_gameweeks_list.append(gameweek_number)
+
+    if adopted_gameweeks_list:
+        save_manifest(manifest_dict, gameweek_files_directory)
+
+    else:
+        pass
+
+    return sorted(adopted_gameweeks_list)
+
+
+def find_gameweeks_to_process(
+        manifest_dict: dict,
+        gameweek_files_directory: str,
+        gameweek_list: list,
+        schema_version: str,
+        verify_checksums: bool = False
+    ) -> list:
+
+    '''
+    Identifies the gameweeks whose file is missing, has been changed since it was written, or was written under a
+    different schema. The folder is listed once, and files are compared on size, so only verify_checksums reads them.
+
+    Args:
+        manifest_dict - Dictionary containing the manifest entries.
+        gameweek_files_directory - The full filepath to the folder containing the gameweek files for the season.
+        gameweek_list - List of the gameweek numbers that should have a file.
+        schema_version - The schema version of files written under the current column configuration.
+        verify_checksums - Whether to also compare the checksum of each file's content with the manifest.
+
+    Returns:
+        gameweeks_to_process_list - List of the gameweek numbers that need to be processed.
+    '''
+
+    gameweek_file_sizes_dict = scan_gameweek_files(gameweek_files_directory)
+    gameweeks_to_process_list = []
+
+    for gameweek_number in gameweek_list:
+
+        csv_filename = f'Gameweek_{gameweek_number}.csv'
+        manifest_entry = manifest_dict['outputs'].get(csv_filename)
+
+        gameweek_file_is_invalid = (
+            manifest_entry is None
+            or gameweek_file_sizes_dict.get(csv_filename) != manifest_entry['size_bytes']
+            or manifest_entry['schema_version'] != schema_version
+        )
+
+        if not gameweek_file_is_invalid and verify_checksums:
+
+            with open(os.path.join(gameweek_files_directory, csv_filename), 'rb') as temporary_file:
+                gameweek_file_is_invalid = hashlib.sha256(temporary_file.read()).hexdigest() != manifest_entry['sha256']
+
+        else:
+            pass
+
+        if gameweek_file_is_invalid:
+            gameweeks_to_process_list.append(gameweek_number)
+
+        else:
+            pass
+
+    return gameweeks_to_process_list
+
+
+def record_summary_file(
+        manifest_dict: dict,
+        gameweek_files_directory: str,
+        summary_filename: str,
+        gameweek_list: list
+    ) -> dict:
+
+    '''
+    Records which gameweek files a summary file, such as the season totals, was built from. Each gameweek is recorded by
+    its checksum in the manifest, alongside the checksum of the summary file itself, so a summary left behind by an
+    interrupted run or built from a since rewritten gameweek can be recognised.
+
+    Args:
+        manifest_dict - Dictionary containing the manifest entries, which is updated in place.
+        gameweek_files_directory - The full filepath to the folder containing the gameweek files for the season.
+        summary_filename - The filename of the summary file, which must already have been written.
+        gameweek_list - List of the gameweek numbers included in the summary file.
+
+    Returns:
+        manifest_dict - The updated manifest.
+    '''
+
+    with open(os.path.join(gameweek_files_directory, summary_filename), 'rb') as temporary_file:
+        summary_hash = hashlib.sha256(temporary_file.read()).hexdigest()
+
+    manifest_dict.setdefault('summaries', {})[summary_filename] = {
+        'sha256' : summary_hash,
+        'gameweeks' : included_gameweek_hashes(manifest_dict, gameweek_list),
+        'built_at' : datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    }
+
+    save_manifest(manifest_dict, gameweek_files_directory)
+
+    return manifest_dict
+
+
+def summary_file_is_current(
+        manifest_dict: dict,
+        gameweek_files_directory: str,
+        summary_filename: str,
+        gameweek_list: list
+    ) -> bool:
+
+    '''
+    Checks that a summary file is unchanged since it was recorded, and was built from exactly the given gameweek files as
+    they are currently recorded in the manifest.
+
+    Args:
+        manifest_dict - Dictionary containing the manifest entries.
+        gameweek_files_directory - The full filepath to the folder containing the gameweek files for the season.
+        summary_filename - The filename of the summary file.
+        gameweek_list - List of the gameweek numbers the summary file should include.
+
+    Returns:
+        summary_is_current - Whether the summary file can be used as it is.
+    '''
+
+    summary_entry = manifest_dict.get('summaries', {}).get(summary_filename)
+    summary_filepath = os.path.join(gameweek_files_directory, summary_filename)
+
+    if summary_entry is None or not os.path.exists(summary_filepath):
+        return False
+
+    else:
+        pass
+
+    if summary_entry['gameweeks'] != included_gameweek_hashes(manifest_dict, gameweek_list):
+        return False
+
+    else:
+        pass
+
+    with open(summary_filepath, 'rb') as temporary_file:
+        summary_is_current = hashlib.sha256(temporary_file.read()).hexdigest() == summary_entry['sha256']
+
+    return summary_is_current
+
+
+def included_gameweek_hashes(
+        manifest_dict: dict,
+        gameweek_list: list
+    ) -> dict:
+
+    '''Maps the filename of each gameweek in the list to its checksum in the manifest, which is None if it is untracked'''
+
+    gameweek_hashes_dict = {
+        f'Gameweek_{gameweek_number}.csv' : manifest_dict['outputs'].get(f'Gameweek_{gameweek_number}.csv', {}).get('sha256')
+        for gameweek_number in sorted(gameweek_list)
+    }
+
+    return gameweek_hashes_dict
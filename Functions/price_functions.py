@@ -0,0 +1,216 @@
+import numpy as np
+import pandas as pd
+
+
+PRICE_SNAPSHOT_DTYPES_DICT = {
+    'id' : 'int64',
+    'now_cost' : 'int64',
+    'transfers_in_event' : 'int64',
+    'transfers_out_event' : 'int64',
+    'selected_by_percent' : 'float64'
+}
+
+PRICE_CHANGES_COLUMNS_LIST = [
+    'id', 'previous_cost', 'now_cost', 'cost_change', 'net_transfers_between_snapshots', 'previous_snapshot_time', 'snapshot_time'
+]
+
+
+def prepare_price_snapshot(
+        general_fpl_info_dict: dict,
+        config_dict: dict,
+        snapshot_time: str
+    ) -> pd.DataFrame:
+
+    '''
+    Generates a snapshot of each player's price, transfer activity and ownership from the general FPL information.
+
+    Args:
+        general_fpl_info_dict - Dictionary containing general information about the current FPL season.
+        config_dict - Dictionary containing configuration info for processing of the FPL API returns.
+        snapshot_time - The time the general FPL information was retrieved, as a string with format "YYYY-MM-DD HH:MM:SS".
+
+    Returns:
+        price_snapshot_df - Dataframe containing one row per player, sorted by 'id', with costs given in millions and the
+        gameweek the transfer counts belong to.
+    '''
+
+    # The columns used to diff snapshots and predict price changes are always included, the config can only add to them
+    price_snapshot_columns_list = list(PRICE_SNAPSHOT_DTYPES_DICT) + [
+        column for column in config_dict['price_snapshot_columns_list'] if column not in PRICE_SNAPSHOT_DTYPES_DICT
+    ]
+    elements_list = general_fpl_info_dict['elements']
+
+    # Building each column directly avoids normalising every field of every player
+    price_snapshot_df = pd.DataFrame(
+        {column : [element[column] for element in elements_list] for column in price_snapshot_columns_list}
+    )
+
+    price_snapshot_df = price_snapshot_df.astype(PRICE_SNAPSHOT_DTYPES_DICT)
+
+    price_snapshot_df['now_cost'] = price_snapshot_df['now_cost'] / 10
+    price_snapshot_df['snapshot_time'] = snapshot_time
+
+    # Transfer counts reset at each deadline, when the next gameweek becomes the current one
+    current_event = next(
+        (event['id'] for event in general_fpl_info_dict.get('events', []) if event.get('is_current')),
+        None
+    )
+    price_snapshot_df['event'] = pd.array([current_event] * len(price_snapshot_df), dtype= 'Int64')
+
+    price_snapshot_df = price_snapshot_df.sort_values('id', kind= 'stable').reset_index(drop= True)
+
+    return price_snapshot_df
+
+
+def diff_price_snapshots(
+        previous_snapshot_df: pd.DataFrame,
+        current_snapshot_df: pd.DataFrame
+    ) -> pd.DataFrame:
+
+    '''
+    Identifies the players whose price has changed between two snapshots. Players are matched on 'id' using sorted
+    array lookups, so new or removed players are ignored.
+
+    Args:
+        previous_snapshot_df - The earlier price snapshot, sorted by 'id'.
+        current_snapshot_df - The later price snapshot, sorted by 'id'.
+
+    Returns:
+        price_changes_df - Dataframe containing the 'id', 'previous_cost', 'now_cost', 'cost_change' and net transfers
+        between the snapshots of each player whose price has changed, along with the time of both snapshots. Net
+        transfers are null when a deadline passed between the snapshots.
+    '''
+
+    # Without any previous players there is nothing to compare against
+    if previous_snapshot_df.empty:
+        return pd.DataFrame(columns= PRICE_CHANGES_COLUMNS_LIST)
+
+    else:
+        pass
+
+    previous_ids = previous_snapshot_df['id'].to_numpy()
+    current_ids = current_snapshot_df['id'].to_numpy()
+
+    # Locate each current player in the previous snapshot, flagging those who were not present
+    previous_positions = np.searchsorted(previous_ids, current_ids).clip(max= len(previous_ids) - 1)
+    matched_players = previous_ids[previous_positions] == current_ids
+
+    previous_cost = previous_snapshot_df['now_cost'].to_numpy()[previous_positions]
+    current_cost = current_snapshot_df['now_cost'].to_numpy()
+    cost_change = np.round(current_cost - previous_cost, 1)
+
+    # Transfer counts reset each gameweek, so only movement within the same gameweek is meaningful. Snapshots taken
+    # either side of a deadline, or without a recorded gameweek, have no net transfers between them
+    previous_net_transfers = (
+        previous_snapshot_df['transfers_in_event'].to_numpy() - previous_snapshot_df['transfers_out_event'].to_numpy()
+    )[previous_positions]
+    current_net_transfers = current_snapshot_df['transfers_in_event'].to_numpy() - current_snapshot_df['transfers_out_event'].to_numpy()
+
+    previous_events = snapshot_events(previous_snapshot_df)[previous_positions]
+    current_events = snapshot_events(current_snapshot_df)
+
+    net_transfers_between_snapshots = np.where(
+        previous_events == current_events,
+        current_net_transfers - previous_net_transfers,
+        np.nan
+    )
+
+    changed_players = matched_players & (cost_change != 0)
+
+    price_changes_df = pd.DataFrame(
+        {
+            'id' : current_ids[changed_players],
+            'previous_cost' : previous_cost[changed_players],
+            'now_cost' : current_cost[changed_players],
+            'cost_change' : cost_change[changed_players],
+            'net_transfers_between_snapshots' : pd.array(net_transfers_between_snapshots[changed_players]).astype('Int64'),
+            'previous_snapshot_time' : previous_snapshot_df['snapshot_time'].to_numpy()[previous_positions][changed_players],
+            'snapshot_time' : current_snapshot_df['snapshot_time'].to_numpy()[changed_players]
+        }
+    )
+
+    return price_changes_df
+
+
+def snapshot_events(price_snapshot_df: pd.DataFrame) -> np.ndarray:
+
+    '''Returns the gameweek of each row of a price snapshot as floats, with NaN for snapshots saved without one'''
+
+    if 'event' not in price_snapshot_df.columns:
+        return np.full(len(price_snapshot_df), np.nan)
+
+    else:
+        pass
+
+    return pd.to_numeric(price_snapshot_df['event'], errors= 'coerce').to_numpy(dtype= 'float64', na_value= np.nan)
+
+
+def predict_price_changes(
+        price_snapshot_df: pd.DataFrame,
+        total_players: int,
+        prediction_size: int
+    ) -> pd.DataFrame:
+
+    '''
+    Ranks the players most likely to rise or fall in price, based on their net transfers this gameweek relative to the
+    number of managers who own them.
+
+    Args:
+        price_snapshot_df - Dataframe containing a price snapshot produced by prepare_price_snapshot.
+        total_players - The total number of FPL managers, used to convert ownership percentages into managers.
+        prediction_size - The number of likely risers and likely fallers to return.
+
+    Returns:
+        price_predictions_df - Dataframe containing the likely risers followed by the likely fallers, each ordered from
+        strongest to weakest transfer pressure, with a 'direction' column of 'rise' or 'fall'.
+    '''
+
+    net_transfers = (price_snapshot_df['transfers_in_event'] - price_snapshot_df['transfers_out_event']).to_numpy()
+    owners = price_snapshot_df['selected_by_percent'].to_numpy() / 100 * total_players
+
+    # Players owned by almost nobody are treated as having at least one owner, to avoid dividing by zero
+    transfer_pressure = net_transfers / np.maximum(owners, 1)
+
+    price_predictions_list = []
+
+    for direction, signed_pressure in [('rise', transfer_pressure), ('fall', -transfer_pressure)]:
+
+        # Only players with pressure in the right direction are candidates
+        candidate_positions = np.flatnonzero(signed_pressure > 0)
+        number_of_predictions = min(prediction_size, len(candidate_positions))
+
+        if number_of_predictions == 0:
+            continue
+
+        else:
+            pass
+
+        # Partitioning finds the strongest candidates without sorting every player
+        strongest_positions = candidate_positions[
+            np.argpartition(-signed_pressure[candidate_positions], number_of_predictions - 1)[:number_of_predictions]
+        ]
+        strongest_positions = strongest_positions[np.argsort(-signed_pressure[strongest_positions], kind= 'stable')]
+
+        price_predictions_list.append(
+            pd.DataFrame(
+                {
+                    'id' : price_snapshot_df['id'].to_numpy()[strongest_positions],
+                    'now_cost' : price_snapshot_df['now_cost'].to_numpy()[strongest_positions],
+                    'selected_by_percent' : price_snapshot_df['selected_by_percent'].to_numpy()[strongest_positions],
+                    'net_transfers' : net_transfers[strongest_positions],
+                    'transfer_pressure' : transfer_pressure[strongest_positions].round(5),
+                    'direction' : direction,
+                    'snapshot_time' : price_snapshot_df['snapshot_time'].to_numpy()[strongest_positions]
+                }
+            )
+        )
+
+    if not price_predictions_list:
+        return pd.DataFrame(columns= ['id', 'now_cost', 'selected_by_percent', 'net_transfers', 'transfer_pressure', 'direction', 'snapshot_time'])
+
+    else:
+        pass
+
+    price_predictions_df = pd.concat(price_predictions_list, ignore_index= True)
+
+    return price_predictions_df
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+
+
+def calculate_per_90_rates(recent_gameweeks_df: pd.DataFrame) -> pd.DataFrame:
+
+    '''
+    Summarises each player's recent form as per-90 rates of expected goals, expected assists and expected goals conceded,
+    along with their expected minutes per gameweek.
+
+    Args:
+        recent_gameweeks_df - Dataframe containing the gameweek data for the gameweeks in the form window, with a
+        'gameweek' column identifying the gameweek of each row.
+
+    Returns:
+        player_rates_df - Dataframe with one row per player containing their most recent details and per-90 rates.
+    '''
+
+    number_of_gameweeks = recent_gameweeks_df['gameweek'].nunique()
+
+    # Players keep their most recent team and position, in case of a transfer during the form window
+    recent_gameweeks_df = recent_gameweeks_df.sort_values('gameweek', kind= 'stable')
+
+    player_rates_df = recent_gameweeks_df.groupby('id', sort= True).agg(
+        full_name= ('full_name', 'last'),
+        team_name= ('team_name', 'last'),
+        position= ('position', 'last'),
+        minutes= ('minutes', 'sum'),
+        expected_goals= ('expected_goals', 'sum'),
+        expected_assists= ('expected_assists', 'sum'),
+        expected_goals_conceded= ('expected_goals_conceded', 'sum')
+    )
+
+    # Players who have not played in the window have no rate, rather than an infinite one
+    nineties_played = (player_rates_df['minutes'] / 90).replace(0, np.nan)
+
+    player_rates_df['expected_minutes'] = player_rates_df['minutes'] / number_of_gameweeks
+    player_rates_df['expected_goals_per_90'] = (player_rates_df['expected_goals'] / nineties_played).fillna(0)
+    player_rates_df['expected_assists_per_90'] = (player_rates_df['expected_assists'] / nineties_played).fillna(0)
+    player_rates_df['expected_goals_conceded_per_90'] = (player_rates_df['expected_goals_conceded'] / nineties_played).fillna(0)
+
+    player_rates_df = player_rates_df.drop(
+        labels= ['minutes', 'expected_goals', 'expected_assists', 'expected_goals_conceded'],
+        axis= 1
+    )
+
+    return player_rates_df.reset_index()
+
+
+def project_player_points(
+        player_rates_df: pd.DataFrame,
+        fixture_matrices: dict,
+        config_dict: dict,
+        start_gameweek: int,
+        horizon: int
+    ) -> pd.DataFrame:
+
+    '''
+    Projects the expected points of every player in each gameweek of the window. Every player and gameweek is scored in
+    a single broadcasted array operation, combining each player's per-90 rates with their team's fixture matrices.
+
+    Args:
+        player_rates_df - Dataframe of per-90 rates produced by calculate_per_90_rates.
+        fixture_matrices - Dictionary of fixture matrices produced by build_fixture_matrices.
+        config_dict - Dictionary containing configuration info for processing of the FPL API returns.
+        start_gameweek - The first gameweek included in the projection.
+        horizon - The number of gameweeks included in the projection.
+
+    Returns:
+        player_projection_df - Dataframe containing each player's details, their expected points in each gameweek of the
+        window and their total expected points across the window.
+    '''
+
+    window = slice(start_gameweek - 1, start_gameweek - 1 + horizon)
+
+    # Players whose team is not in the fixture matrices (e.g. those who have left the league) are dropped
+    team_row = pd.Index(fixture_matrices['team_names']).get_indexer(player_rates_df['team_name'])
+    player_rates_df = player_rates_df[team_row >= 0].reset_index(drop= True)
+    team_row = team_row[team_row >= 0]
+
+    fixture_count = fixture_matrices['fixture_count'][team_row, window].astype('float64')
+    attack = fixture_matrices['attack'][team_row, window]
+    defence = fixture_matrices['defence'][team_row, window]
+
+    # Player level values are broadcast as columns against the (players, gameweeks) fixture matrices
+    goal_value = player_rates_df['position'].map(config_dict['goal_values']).fillna(0).to_numpy('float64')[:, None]
+    clean_sheet_value = player_rates_df['position'].map(config_dict['clean_sheet_values']).fillna(0).to_numpy('float64')[:, None]
+    minutes_fraction = np.clip(player_rates_df['expected_minutes'].to_numpy('float64') / 90, 0, 1)[:, None]
+    expected_goals_per_90 = player_rates_df['expected_goals_per_90'].to_numpy('float64')[:, None]
+    expected_assists_per_90 = player_rates_df['expected_assists_per_90'].to_numpy('float64')[:, None]
+    expected_goals_conceded_per_90 = player_rates_df['expected_goals_conceded_per_90'].to_numpy('float64')[:, None]
+
+    # Double gameweeks use the average defensive ratio of the two fixtures for each clean sheet chance
+    with np.errstate(divide= 'ignore', invalid= 'ignore'):
+        clean_sheet_probability = np.where(
+            fixture_count > 0,
+            np.exp(-expected_goals_conceded_per_90 * fixture_count / defence),
+            0
+        )
+
+    expected_points = minutes_fraction * (
+        fixture_count * 2
+        + expected_goals_per_90 * attack * goal_value
+        + expected_assists_per_90 * attack * 3
+        + fixture_count * clean_sheet_probability * clean_sheet_value
+    )
+
+    gameweek_columns = [f'gameweek_{gameweek}' for gameweek in range(start_gameweek, start_gameweek + expected_points.shape[1])]
+
+    player_projection_df = pd.concat(
+        [
+            player_rates_df[['id', 'full_name', 'team_name', 'position']],
+            pd.DataFrame(expected_points.round(2), columns= gameweek_columns)
+        ],
+        axis= 1
+    )
+
+    player_projection_df['projected_points'] = expected_points.sum(axis= 1).round(2)
+    player_projection_df = player_projection_df.sort_values('projected_points', ascending= False, kind= 'stable')
+
+    return player_projection_df.reset_index(drop= True)
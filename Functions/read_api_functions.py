@@ -0,0 +1,518 @@
+import os
+import re
+import json
+import time
+import threading
+import numpy as np
+import pandas as pd
+import functions.similarity_functions as similarity
+from collections import OrderedDict
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+GAMEWEEK_FILENAME_PATTERN = re.compile(r'^Gameweek_(\d+)\.csv$')
+PRICE_FILENAMES_LIST = ['player_cost.csv', 'price_changes.csv']
+
+# Season data is held in memory between requests, keyed by season folder, and only replaced once a file changes
+SEASON_DATA_CACHE = {}
+SEASON_DATA_LOCK = threading.Lock()
+
+# Query results are kept as encoded JSON, keyed by the version of the season data they were computed from
+QUERY_RESULT_CACHE = OrderedDict()
+QUERY_RESULT_LOCK = threading.Lock()
+
+
+def read_typed_csv(
+        csv_filepath: str,
+        config_dict: dict
+    ) -> pd.DataFrame:
+
+    '''Reads a season data file, converting every column listed in the config to its configured dtype'''
+
+    dataframe = pd.read_csv(csv_filepath)
+
+    column_dtypes = {
+        column : dtype for column, dtype in config_dict['column_dtypes_mapper'].items()
+        if column in dataframe.columns and dtype != 'object'
+    }
+
+    return dataframe.astype(column_dtypes)
+
+
+def refresh_season_data(
+        gameweek_files_directory: str,
+        config_dict: dict
+    ) -> dict:
+
+    '''
+    Returns the season's data, read into typed dataframes. The folder is listed at most once every
+    'read_api_refresh_seconds', in a single pass, and only files whose modification time or size has changed are read
+    in again. A changed season is stored as a new dictionary rather than updated in place, so requests already being
+    served keep a consistent copy.
+
+    Args:
+        gameweek_files_directory - The full filepath to the folder containing the gameweek files for the season.
+        config_dict - Dictionary containing configuration info for processing of the FPL API returns.
+
+    Returns:
+        season_data - Dictionary containing the 'version' of the data, when the folder was 'checked_at', the
+        'file_signatures' it was read from, the 'gameweek_dfs' keyed by gameweek, the combined 'gameweeks_df' with a
+        'gameweek' column, and the 'player_cost_df' and 'price_changes_df' (None if the file does not exist yet). The
+        'config_dict' it was read with is kept alongside, along with a 'feature_matrix_dict' for similarity queries
+        that is None until one is first run against this version.
+    '''
+
+    cached_season_data = SEASON_DATA_CACHE.get(gameweek_files_directory)
+
+    season_data_is_fresh = (
+        cached_season_data is not None
+        and time.monotonic() - cached_season_data['checked_at'] < config_dict['read_api_refresh_seconds']
+    )
+
+    if season_data_is_fresh:
+        return cached_season_data
+
+    else:
+        pass
+
+    with SEASON_DATA_LOCK:
+
+        previous_season_data = SEASON_DATA_CACHE.get(gameweek_files_directory, {
+            'version' : 0,
+            'checked_at' : 0,
+            'file_signatures' : {},
+            'gameweek_dfs' : {},
+            'gameweeks_df' : pd.DataFrame(columns= ['gameweek']),
+            'player_cost_df' : None,
+            'price_changes_df' : None,
+            'feature_matrix_dict' : None
+        })
+
+        with os.scandir(gameweek_files_directory) as directory_entries:
+
+            file_signatures = {
+                directory_entry.name : (directory_entry.stat().st_mtime_ns, directory_entry.stat().st_size)
+                for directory_entry in directory_entries
+                if GAMEWEEK_FILENAME_PATTERN.match(directory_entry.name) or directory_entry.name in PRICE_FILENAMES_LIST
+            }
+
+        if file_signatures == previous_season_data['file_signatures'] and previous_season_data['version'] > 0:
+
+            previous_season_data['checked_at'] = time.monotonic()
+            return previous_season_data
+
+        else:
+            pass
+
+        changed_filenames_list = [
+            filename for filename, file_signature in file_signatures.items()
+            if previous_season_data['file_signatures'].get(filename) != file_signature
+        ]
+
+        # Unchanged gameweeks keep their existing dataframe, and removed gameweeks are dropped
+        gameweek_dfs = {
+            gameweek : gameweek_df for gameweek, gameweek_df in previous_season_data['gameweek_dfs'].items()
+            if f'Gameweek_{gameweek}.csv' in file_signatures
+        }
+
+        season_data = dict(
+            previous_season_data,
+            version= previous_season_data['version'] + 1,
+            checked_at= time.monotonic(),
+            file_signatures= file_signatures,
+            config_dict= config_dict,
+            feature_matrix_dict= None
+        )
+
+        for filename in changed_filenames_list:
+
+            gameweek_match = GAMEWEEK_FILENAME_PATTERN.match(filename)
+            dataframe = read_typed_csv(os.path.join(gameweek_files_directory, filename), config_dict)
+
+            if gameweek_match:
+                gameweek_dfs[int(gameweek_match.group(1))] = dataframe
+
+            elif filename == 'player_cost.csv':
+                season_data['player_cost_df'] = dataframe
+
+            else:
+                season_data['price_changes_df'] = dataframe
+
+        for filename in PRICE_FILENAMES_LIST:
+
+            if filename not in file_signatures:
+                season_data[filename.replace('.csv', '_df')] = None
+
+            else:
+                pass
+
+        gameweek_dfs = dict(sorted(gameweek_dfs.items()))
+        season_data['gameweek_dfs'] = gameweek_dfs
+
+        if gameweek_dfs:
+            season_data['gameweeks_df'] = pd.concat(
+                [gameweek_df.assign(gameweek= gameweek) for gameweek, gameweek_df in gameweek_dfs.items()],
+                ignore_index= True
+            )
+
+        else:
+            season_data['gameweeks_df'] = pd.DataFrame(columns= ['gameweek'])
+
+        SEASON_DATA_CACHE[gameweek_files_directory] = season_data
+
+    return season_data
+
+
+def dataframe_to_json_bytes(dataframe: pd.DataFrame) -> bytes:
+
+    '''Encodes a dataframe as a JSON list of records, with missing values as null'''
+
+    return dataframe.to_json(orient= 'records').encode()
+
+
+def query_player_history(
+        season_data: dict,
+        player_id: int
+    ) -> bytes:
+
+    '''
+    Returns every gameweek row of a player, in gameweek order.
+
+    Raises:
+        LookupError - Raised if the player has no gameweek rows.
+    '''
+
+    gameweeks_df = season_data['gameweeks_df']
+
+    if 'id' not in gameweeks_df.columns or not (gameweeks_df['id'] == player_id).any():
+        raise LookupError(f'No gameweek data found for player {player_id}')
+
+    else:
+        pass
+
+    return dataframe_to_json_bytes(gameweeks_df[gameweeks_df['id'] == player_id])
+
+
+def query_gameweek_table(
+        season_data: dict,
+        gameweek: int,
+        position: str = None,
+        team: str = None,
+        sort_by: str = 'total_points',
+        limit: int = None
+    ) -> bytes:
+
+    '''
+    Returns a gameweek's rows, optionally filtered to a position or team, sorted in descending order of a column.
+
+    Raises:
+        LookupError - Raised if the gameweek has no data file.
+        ValueError - Raised if the sort column does not exist.
+    '''
+
+    gameweek_df = season_data['gameweek_dfs'].get(gameweek)
+
+    if gameweek_df is None:
+        raise LookupError(f'No data file found for gameweek {gameweek}')
+
+    else:
+        pass
+
+    if sort_by not in gameweek_df.columns:
+        raise ValueError(f"ValueError - Unable to sort by '{sort_by}', as it is not a gameweek column")
+
+    else:
+        pass
+
+    row_mask = np.ones(len(gameweek_df), dtype= bool)
+
+    if position is not None:
+        row_mask &= (gameweek_df['position'] == position).to_numpy()
+
+    else:
+        pass
+
+    if team is not None:
+        row_mask &= (gameweek_df['team_name'] == team).to_numpy()
+
+    else:
+        pass
+
+    gameweek_table_df = gameweek_df[row_mask].sort_values(sort_by, ascending= False, kind= 'stable')
+
+    return dataframe_to_json_bytes(gameweek_table_df.head(limit) if limit is not None else gameweek_table_df)
+
+
+def query_prices(
+        season_data: dict,
+        player_id: int = None
+    ) -> bytes:
+
+    '''
+    Returns the current cost of every player, or of a single player along with their recorded price changes.
+
+    Raises:
+        LookupError - Raised if no player costs have been retrieved yet, or the player has no cost.
+    '''
+
+    player_cost_df = season_data['player_cost_df']
+
+    if player_cost_df is None:
+        raise LookupError('No player costs have been retrieved yet')
+
+    else:
+        pass
+
+    if player_id is None:
+        return dataframe_to_json_bytes(player_cost_df)
+
+    else:
+        pass
+
+    player_cost_row_df = player_cost_df[player_cost_df['id'] == player_id]
+
+    if player_cost_row_df.empty:
+        raise LookupError(f'No cost found for player {player_id}')
+
+    else:
+        pass
+
+    price_changes_df = season_data['price_changes_df']
+    player_price_changes_df = (
+        price_changes_df[price_changes_df['id'] == player_id] if price_changes_df is not None else pd.DataFrame()
+    )
+
+    player_prices_dict = {
+        'id' : player_id,
+        'now_cost' : float(player_cost_row_df['now_cost'].iloc[0]),
+        'price_changes' : json.loads(player_price_changes_df.to_json(orient= 'records'))
+    }
+
+    return json.dumps(player_prices_dict).encode()
+
+
+def query_similar_players(
+        season_data: dict,
+        player_id: int,
+        number_of_players: int = 10,
+        position: str = None,
+        max_cost: float = None
+    ) -> bytes:
+
+    '''
+    Returns the players whose per-90 stats are closest to a player's, from most to least similar. The feature matrix is
+    built from the season data the first time it is needed, and reused until a file changes.
+
+    Raises:
+        LookupError - Raised if the player has not played enough minutes to be compared, or a cost limit is given
+        before any player costs have been retrieved.
+    '''
+
+    if season_data['gameweeks_df'].empty:
+        raise LookupError('No gameweek data has been retrieved yet')
+
+    else:
+        pass
+
+    # Two requests can build the same matrix at once, in which case either copy can be kept
+    if season_data['feature_matrix_dict'] is None:
+        season_data['feature_matrix_dict'] = similarity.build_feature_matrix(season_data['gameweeks_df'], season_data['config_dict'])
+
+    else:
+        pass
+
+    if player_id not in season_data['feature_matrix_dict']['ids']:
+        raise LookupError(f'Player {player_id} has not played enough minutes to be compared')
+
+    else:
+        pass
+
+    if max_cost is not None and season_data['player_cost_df'] is None:
+        raise LookupError('No player costs have been retrieved yet')
+
+    else:
+        pass
+
+    similar_players_df = similarity.find_similar_players(
+        feature_matrix_dict= season_data['feature_matrix_dict'],
+        player_ids= [player_id],
+        number_of_players= number_of_players,
+        position= position,
+        max_cost= max_cost,
+        player_cost_df= season_data['player_cost_df']
+    )
+
+    return dataframe_to_json_bytes(similar_players_df.drop(columns= 'query_id'))
+
+
+QUERY_FUNCTIONS_DICT = {
+    'player_history' : query_player_history,
+    'gameweek_table' : query_gameweek_table,
+    'prices' : query_prices,
+    'similar_players' : query_similar_players
+}
+
+
+def run_query(
+        gameweek_files_directory: str,
+        config_dict: dict,
+        query_name: str,
+        query_arguments: tuple = ()
+    ) -> bytes:
+
+    '''
+    Runs a query against the current season data, returning the encoded JSON result. Results are kept in a least
+    recently used cache of 'read_api_query_cache_size' entries. Keys include the data version, so results computed
+    before a file changed are never returned, and fall out of the cache as newer results are added.
+
+    Args:
+        gameweek_files_directory - The full filepath to the folder containing the gameweek files for the season.
+        config_dict - Dictionary containing configuration info for processing of the FPL API returns.
+        query_name - The name of the query, one of the keys of QUERY_FUNCTIONS_DICT.
+        query_arguments - Tuple of (name, value) pairs passed to the query function as keyword arguments.
+
+    Returns:
+        query_result - The query result, encoded as JSON.
+    '''
+
+    season_data = refresh_season_data(gameweek_files_directory, config_dict)
+    cache_key = (gameweek_files_directory, season_data['version'], query_name, query_arguments)
+
+    with QUERY_RESULT_LOCK:
+
+        query_result = QUERY_RESULT_CACHE.get(cache_key)
+
+        if query_result is not None:
+
+            QUERY_RESULT_CACHE.move_to_end(cache_key)
+            return query_result
+
+        else:
+            pass
+
+    # Queries run outside the lock, so a slow query does not hold up requests answered from the cache
+    query_result = QUERY_FUNCTIONS_DICT[query_name](season_data, **dict(query_arguments))
+
+    with QUERY_RESULT_LOCK:
+
+        QUERY_RESULT_CACHE[cache_key] = query_result
+
+        while len(QUERY_RESULT_CACHE) > config_dict['read_api_query_cache_size']:
+            QUERY_RESULT_CACHE.popitem(last= False)
+
+    return query_result
+
+
+def parse_request_path(request_path: str) -> tuple[str, tuple]:
+
+    '''
+    Converts a request path into a query name and its arguments.
+
+    Routes:
+        /players/<id>/history - A player's gameweek history.
+        /players/<id>/similar?position=&max_cost=&limit= - The players with the most similar per-90 stats to a player.
+        /gameweeks/<n>?position=&team=&sort_by=&limit= - A gameweek table.
+        /prices?id= - Current player costs, or a single player's cost and price changes.
+
+    Raises:
+        LookupError - Raised if the path does not match a route.
+        ValueError - Raised if an id, gameweek or limit is not a whole number, or a cost is not a number.
+    '''
+
+    parsed_url = urlparse(request_path)
+    path_parts_list = [part for part in parsed_url.path.split('/') if part]
+    parameters_dict = {key : values[-1] for key, values in parse_qs(parsed_url.query).items()}
+
+    try:
+
+        if len(path_parts_list) == 3 and path_parts_list[0] == 'players' and path_parts_list[2] == 'history':
+            return 'player_history', (('player_id', int(path_parts_list[1])),)
+
+        elif len(path_parts_list) == 3 and path_parts_list[0] == 'players' and path_parts_list[2] == 'similar':
+
+            query_arguments = [('player_id', int(path_parts_list[1]))]
+            query_arguments += [('number_of_players', int(parameters_dict['limit']))] if 'limit' in parameters_dict else []
+            query_arguments += [('position', parameters_dict['position'])] if 'position' in parameters_dict else []
+            query_arguments += [('max_cost', float(parameters_dict['max_cost']))] if 'max_cost' in parameters_dict else []
+
+            return 'similar_players', tuple(query_arguments)
+
+        elif len(path_parts_list) == 2 and path_parts_list[0] == 'gameweeks':
+
+            query_arguments = [('gameweek', int(path_parts_list[1]))]
+            query_arguments += [
+                (key, parameters_dict[key]) for key in ['position', 'team', 'sort_by'] if key in parameters_dict
+            ]
+            query_arguments += [('limit', int(parameters_dict['limit']))] if 'limit' in parameters_dict else []
+
+            return 'gameweek_table', tuple(query_arguments)
+
+        elif path_parts_list == ['prices']:
+            return 'prices', (('player_id', int(parameters_dict['id'])),) if 'id' in parameters_dict else ()
+
+        else:
+            pass
+
+    except ValueError:
+        raise ValueError(f'ValueError - Ids, gameweeks and limits must be whole numbers, and costs must be numbers: {request_path}')
+
+    raise LookupError(f'No route matches {parsed_url.path}')
+
+
+def create_read_api_server(
+        gameweek_files_directory: str,
+        config_dict: dict,
+        host: str,
+        port: int
+    ) -> ThreadingHTTPServer:
+
+    '''
+    Creates the HTTP server for the read API. Each request is handled on its own thread, and all threads share the
+    season data and query result caches.
+
+    Args:
+        gameweek_files_directory - The full filepath to the folder containing the gameweek files for the season.
+        config_dict - Dictionary containing configuration info for processing of the FPL API returns.
+        host - The address to listen on.
+        port - The port to listen on, or 0 to choose a free port.
+
+    Returns:
+        read_api_server - The server, ready for serve_forever to be called.
+    '''
+
+    class ReadAPIRequestHandler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+
+            try:
+
+                query_name, query_arguments = parse_request_path(self.path)
+                response_body = run_query(gameweek_files_directory, config_dict, query_name, query_arguments)
+                response_code = 200
+
+            except LookupError as lookup_error:
+                response_code, response_body = 404, json.dumps({'error' : str(lookup_error)}).encode()
+
+            except ValueError as value_error:
+                response_code, response_body = 400, json.dumps({'error' : str(value_error)}).encode()
+
+            except Exception as e:
+
+                response_code = 500
+                response_body = json.dumps({'error' : f'Error encountered while running query: {e}'}).encode()
+
+            self.send_response(response_code)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(response_body)))
+            self.end_headers()
+            self.wfile.write(response_body)
+
+        # Requests are not logged individually, as dashboards poll frequently
+        def log_message(self, format, *args):
+            pass
+
+    read_api_server = ThreadingHTTPServer((host, port), ReadAPIRequestHandler)
+    read_api_server.daemon_threads = True
+
+    return read_api_server
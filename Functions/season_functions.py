@@ -0,0 +1,236 @@
+import os
+import numpy as np
+import pandas as pd
+import functions.fpl_functions as fpl
+
+
+PLAYER_DETAILS_COLUMNS_LIST = ['full_name', 'team_name', 'position']
+
+
+def load_season_totals(
+        season_totals_filepath: str,
+        config_dict: dict
+    ) -> pd.DataFrame:
+
+    '''
+    Reads in the season totals file, or creates an empty season totals dataframe if the file does not exist yet.
+
+    Args:
+        season_totals_filepath - The full filepath to the season totals csv file.
+        config_dict - Dictionary containing configuration info for processing of the FPL API returns.
+
+    Returns:
+        season_totals_df - Dataframe indexed by player 'id', containing each player's details and season totals.
+    '''
+
+    season_totals_file_exists = os.path.exists(season_totals_filepath)
+
+    if not season_totals_file_exists:
+        return empty_season_totals(config_dict= config_dict)
+
+    else:
+        pass
+
+    season_totals_df = pd.read_csv(season_totals_filepath, index_col= 'id')
+
+    return season_totals_df
+
+
+def empty_season_totals(config_dict: dict) -> pd.DataFrame:
+
+    '''
+    Creates an empty season totals dataframe, for a season with no gameweeks processed yet.
+
+    Args:
+        config_dict - Dictionary containing configuration info for processing of the FPL API returns.
+
+    Returns:
+        season_totals_df - Empty dataframe indexed by player 'id', with a column for each player detail and season total.
+    '''
+
+    season_totals_df = pd.DataFrame(
+        columns= PLAYER_DETAILS_COLUMNS_LIST + ['gameweeks'] + config_dict['season_total_columns'],
+        index= pd.Index([], name= 'id', dtype= 'int64')
+    )
+
+    return season_totals_df
+
+
+def save_season_totals(
+        season_totals_df: pd.DataFrame,
+        season_totals_filepath: str
+    ):
+
+    '''
+    Writes the season totals to a csv file. The file is written to a temporary file first and then moved into place, so
+    an interrupted run never leaves partial season totals behind.
+
+    Args:
+        season_totals_df - Dataframe indexed by player 'id', containing each player's details and season totals.
+        season_totals_filepath - The full filepath to the season totals csv file.
+    '''
+
+    season_totals_df.to_csv(f'{season_totals_filepath}.tmp', index= True)
+    os.replace(f'{season_totals_filepath}.tmp', season_totals_filepath)
+
+
+def update_season_totals(
+        season_totals_df: pd.DataFrame,
+        gameweek_df: pd.DataFrame,
+        config_dict: dict
+    ) -> pd.DataFrame:
+
+    '''
+    Adds a single newly processed gameweek to the season totals. Players appearing for the first time are added, and
+    every player's details are updated to their most recent team and position.
+
+    Args:
+        season_totals_df - Dataframe indexed by player 'id', containing each player's details and season totals.
+        gameweek_df - Dataframe containing player data for the gameweek.
+        config_dict - Dictionary containing configuration info for processing of the FPL API returns.
+
+    Returns:
+        season_totals_df - The updated season totals.
+    '''
+
+    total_columns_list = ['gameweeks'] + config_dict['season_total_columns']
+
+    gameweek_df = gameweek_df.set_index('id')
+    gameweek_df = gameweek_df.assign(gameweeks= 1)
+
+    season_totals = season_totals_df[total_columns_list].astype('float64').add(
+        gameweek_df[total_columns_list].astype('float64'),
+        fill_value= 0
+    )
+
+    player_details = gameweek_df[PLAYER_DETAILS_COLUMNS_LIST].combine_first(season_totals_df[PLAYER_DETAILS_COLUMNS_LIST])
+
+    season_totals_df = player_details.join(season_totals)
+    season_totals_df = season_totals_df.astype(season_totals_dtypes(season_totals_df, config_dict))
+
+    return season_totals_df
+
+
+def rebuild_season_totals(
+        gameweek_files_directory: str,
+        gameweek_list: list,
+        config_dict: dict
+    ) -> pd.DataFrame:
+
+    '''
+    Builds the season totals from scratch by summing every gameweek file.
+
+    Args:
+        gameweek_files_directory - The full filepath to the folder containing the gameweek files for the season.
+        gameweek_list - List of the gameweek numbers to include in the totals.
+        config_dict - Dictionary containing configuration info for processing of the FPL API returns.
+
+    Returns:
+        season_totals_df - Dataframe indexed by player 'id', containing each player's details and season totals.
+    '''
+
+    if not gameweek_list:
+        return empty_season_totals(config_dict= config_dict)
+
+    else:
+        pass
+
+    gameweeks_df = fpl.load_gameweek_files(
+        gameweek_files_directory= gameweek_files_directory,
+        gameweek_list= sorted(gameweek_list)
+    )
+
+    gameweeks_df['gameweeks'] = 1
+    player_groups = gameweeks_df.groupby('id', sort= True)
+
+    season_totals_df = player_groups[PLAYER_DETAILS_COLUMNS_LIST].last().join(
+        player_groups[['gameweeks'] + config_dict['season_total_columns']].sum()
+    )
+
+    season_totals_df = season_totals_df.astype(season_totals_dtypes(season_totals_df, config_dict))
+
+    return season_totals_df
+
+
+def season_totals_dtypes(
+        season_totals_df: pd.DataFrame,
+        config_dict: dict
+    ) -> dict:
+
+    '''
+    Determines the dtype of each season totals column, so that counting stats stay as integers after being summed.
+
+    Args:
+        season_totals_df - Dataframe indexed by player 'id', containing each player's details and season totals.
+        config_dict - Dictionary containing configuration info for processing of the FPL API returns.
+
+    Returns:
+        dtypes_mapper - Dictionary mapping each column of the season totals to its dtype.
+    '''
+
+    dtypes_mapper = {'gameweeks' : 'int64'}
+
+    for column in config_dict['season_total_columns']:
+        dtypes_mapper[column] = config_dict['column_dtypes_mapper'].get(column, 'float64')
+
+    dtypes_mapper = {column : dtype for column, dtype in dtypes_mapper.items() if column in season_totals_df.columns}
+
+    return dtypes_mapper
+
+
+def check_season_totals(
+        season_totals_df: pd.DataFrame,
+        rebuilt_season_totals_df: pd.DataFrame,
+        config_dict: dict
+    ) -> list:
+
+    '''
+    Compares the incrementally maintained season totals against a full rebuild.
+
+    Args:
+        season_totals_df - The incrementally maintained season totals.
+        rebuilt_season_totals_df - The season totals produced by rebuild_season_totals.
+        config_dict - Dictionary containing configuration info for processing of the FPL API returns.
+
+    Returns:
+        mismatched_ids_list - List of the ids of players whose totals are missing or differ between the two dataframes.
+    '''
+
+    total_columns_list = ['gameweeks'] + config_dict['season_total_columns']
+
+    all_ids = season_totals_df.index.union(rebuilt_season_totals_df.index)
+    incremental_totals = season_totals_df[total_columns_list].reindex(all_ids).to_numpy('float64')
+    rebuilt_totals = rebuilt_season_totals_df[total_columns_list].reindex(all_ids).to_numpy('float64')
+
+    # Summing in a different order can introduce tiny floating point differences, which are not mismatches
+    matching_rows = np.isclose(incremental_totals, rebuilt_totals, rtol= 0, atol= 1e-6).all(axis= 1)
+    mismatched_ids_list = [int(player_id) for player_id in all_ids[~matching_rows]]
+
+    return mismatched_ids_list
+
+
+def add_per_90_metrics(
+        season_totals_df: pd.DataFrame,
+        config_dict: dict
+    ) -> pd.DataFrame:
+
+    '''
+    Adds per-90 versions of the configured season totals columns, ahead of the season totals being saved. The columns
+    are left out of the totals when the file is next read in and updated, so are always calculated from the latest totals.
+
+    Args:
+        season_totals_df - Dataframe indexed by player 'id', containing each player's details and season totals.
+        config_dict - Dictionary containing configuration info for processing of the FPL API returns.
+
+    Returns:
+        season_totals_df - The season totals with an added '<column>_per_90' column for each configured column. Players
+        who have not played have a per-90 value of zero.
+    '''
+
+    season_totals_df = season_totals_df.copy()
+    nineties_played = (season_totals_df['minutes'] / 90).replace(0, np.nan)
+
+    for column in config_dict['season_per_90_columns']:
+        season_totals_df[f'{column}_per_90'] = (season_totals_df[column] / nineties_played).fillna(0).round(2)
+
+    return season_totals_df
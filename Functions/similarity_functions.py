@@ -0,0 +1,267 @@
+import os
+import re
+import numpy as np
+import pandas as pd
+import functions.fpl_functions as fpl
+
+
+# Feature matrices are kept between queries, keyed by the gameweek files they were built from
+FEATURE_MATRIX_CACHE = {}
+
+
+def build_feature_matrix(
+        gameweeks_df: pd.DataFrame,
+        config_dict: dict
+    ) -> dict:
+
+    '''
+    Builds a normalised matrix of per-90 stats, with one row per player who has played enough minutes. Minutes are
+    included as an average per gameweek, and every feature is scaled to have a mean of zero and standard deviation of one.
+
+    Args:
+        gameweeks_df - Dataframe containing the gameweek data for the gameweeks to include, with a 'gameweek' column.
+        config_dict - Dictionary containing configuration info for processing of the FPL API returns.
+
+    Returns:
+        feature_matrix_dict - Dictionary containing the 'players_df' details of each row, the 'ids' array, the float32
+        'matrix' of shape (players, features) and the 'squared_norms' of each row.
+    '''
+
+    feature_columns_list = config_dict['similarity_feature_columns']
+    number_of_gameweeks = gameweeks_df['gameweek'].nunique()
+
+    # Players keep their most recent team and position
+    gameweeks_df = gameweeks_df.sort_values('gameweek', kind= 'stable')
+    player_groups = gameweeks_df.groupby('id', sort= True)
+
+    players_df = player_groups[['full_name', 'team_name', 'position']].last()
+    player_totals = player_groups[sorted(set(feature_columns_list) | {'minutes'})].sum()
+
+    player_totals = player_totals[player_totals['minutes'] >= config_dict['similarity_minimum_minutes']]
+    players_df = players_df.loc[player_totals.index]
+
+    nineties_played = player_totals['minutes'].to_numpy('float64')[:, None] / 90
+    feature_values = player_totals[feature_columns_list].to_numpy('float64')
+
+    minutes_column_mask = np.array([column == 'minutes' for column in feature_columns_list])
+    feature_values = np.where(minutes_column_mask, feature_values / number_of_gameweeks, feature_values / nineties_played)
+
+    # Features with no spread carry no information, so are left at zero rather than divided by zero
+    feature_standard_deviations = feature_values.std(axis= 0)
+    feature_standard_deviations[feature_standard_deviations == 0] = 1
+
+    matrix = ((feature_values - feature_values.mean(axis= 0)) / feature_standard_deviations).astype('float32')
+
+    feature_matrix_dict = {
+        'players_df' : players_df.reset_index(),
+        'ids' : player_totals.index.to_numpy(),
+        'matrix' : matrix,
+        'squared_norms' : np.einsum('ij,ij->i', matrix, matrix)
+    }
+
+    return feature_matrix_dict
+
+
+def load_feature_matrix(
+        gameweek_files_directory: str,
+        config_dict: dict
+    ) -> dict:
+
+    '''
+    Retrieves the feature matrix for a season, only rebuilding it if the gameweek files have changed since it was last built.
+
+    Args:
+        gameweek_files_directory - The full filepath to the folder containing the gameweek files for the season.
+        config_dict - Dictionary containing configuration info for processing of the FPL API returns.
+
+    Returns:
+        feature_matrix_dict - Dictionary produced by build_feature_matrix.
+
+    Raises:
+        FileNotFoundError - Raised if the directory contains no gameweek files.
+    '''
+
+    gameweek_files_list = []
+
+    with os.scandir(gameweek_files_directory) as directory_entries:
+
+        for directory_entry in directory_entries:
+
+            gameweek_match = re.fullmatch(r'Gameweek_(\d+)\.csv', directory_entry.name)
+
+            if gameweek_match:
+
+                file_stats = directory_entry.stat()
+                gameweek_files_list.append((int(gameweek_match.group(1)), file_stats.st_mtime_ns, file_stats.st_size))
+
+            else:
+                pass
+
+    if not gameweek_files_list:
+        raise FileNotFoundError(f'No gameweek files found in {gameweek_files_directory}')
+
+    else:
+        pass
+
+    cache_key = (
+        gameweek_files_directory,
+        tuple(sorted(gameweek_files_list)),
+        tuple(config_dict['similarity_feature_columns']),
+        config_dict['similarity_minimum_minutes']
+    )
+
+    if cache_key not in FEATURE_MATRIX_CACHE:
+
+        gameweeks_df = fpl.load_gameweek_files(
+            gameweek_files_directory= gameweek_files_directory,
+            gameweek_list= sorted(gameweek for gameweek, _, _ in gameweek_files_list)
+        )
+
+        # Only the most recent build of each season is worth keeping
+        for existing_cache_key in [key for key in FEATURE_MATRIX_CACHE if key[0] == gameweek_files_directory]:
+            del FEATURE_MATRIX_CACHE[existing_cache_key]
+
+        FEATURE_MATRIX_CACHE[cache_key] = build_feature_matrix(gameweeks_df, config_dict)
+
+    else:
+        pass
+
+    return FEATURE_MATRIX_CACHE[cache_key]
+
+
+def find_similar_players(
+        feature_matrix_dict: dict,
+        player_ids: list,
+        number_of_players: int = 10,
+        position: str = None,
+        max_cost: float = None,
+        player_cost_df: pd.DataFrame = None
+    ) -> pd.DataFrame:
+
+    '''
+    Finds the players whose per-90 stats are closest to each of the given players. Distances from every query player to
+    every other player are calculated in a single matrix operation.
+
+    Args:
+        feature_matrix_dict - Dictionary produced by build_feature_matrix or load_feature_matrix.
+        player_ids - List of the ids of the players to find similar players for.
+        number_of_players - The number of similar players to return for each query player.
+        position - Optionally restricts the similar players to a single position (e.g. 'MID').
+        max_cost - Optionally restricts the similar players to those costing no more than this amount, in millions.
+        player_cost_df - Dataframe containing the 'id' and 'now_cost' of each player, required when max_cost is given.
+
+    Returns:
+        similar_players_df - Dataframe containing the 'query_id', followed by the details, cost (if player_cost_df is
+        given) and 'distance' of each similar player, ordered from most to least similar for each query player.
+
+    Raises:
+        ValueError - Raised if a query player is not in the feature matrix, or max_cost is given without player_cost_df.
+    '''
+
+    players_df = feature_matrix_dict['players_df']
+    matrix = feature_matrix_dict['matrix']
+    squared_norms = feature_matrix_dict['squared_norms']
+
+    query_positions = pd.Index(feature_matrix_dict['ids']).get_indexer(player_ids)
+
+    if (query_positions < 0).any():
+
+        missing_ids_list = [player_id for player_id, query_position in zip(player_ids, query_positions) if query_position < 0]
+        raise ValueError(f'ValueError - Player id(s) {missing_ids_list} have not played enough minutes to be compared')
+
+    else:
+        pass
+
+    # Candidate filters are shared by every query, so are applied as a single mask
+    candidate_mask = np.ones(len(players_df), dtype= bool)
+
+    if position is not None:
+        candidate_mask &= (players_df['position'] == position).to_numpy()
+
+    else:
+        pass
+
+    if player_cost_df is not None:
+        player_costs = player_cost_df.set_index('id')['now_cost'].reindex(feature_matrix_dict['ids']).to_numpy('float64')
+
+    else:
+        player_costs = None
+
+    if max_cost is not None:
+
+        if player_costs is None:
+            raise ValueError('ValueError - player_cost_df must be provided to filter by cost')
+
+        else:
+            pass
+
+        candidate_mask &= player_costs <= max_cost
+
+    else:
+        pass
+
+    squared_distances = (
+        squared_norms[query_positions][:, None]
+        + squared_norms[None, :]
+        - 2 * matrix[query_positions] @ matrix.T
+    )
+
+    squared_distances[:, ~candidate_mask] = np.inf
+    squared_distances[np.arange(len(query_positions)), query_positions] = np.inf
+
+    number_of_candidates = int(candidate_mask.sum())
+    similar_players_list = []
+
+    for query_number, (player_id, query_position) in enumerate(zip(player_ids, query_positions)):
+
+        query_distances = squared_distances[query_number]
+
+        # A query player is never similar to themselves, so is left out of the candidates when they pass the filters
+        query_number_of_players = min(number_of_players, number_of_candidates - int(candidate_mask[query_position]))
+
+        # Partitioning finds the closest players without sorting every distance
+        if query_number_of_players > 0:
+            closest_positions = np.argpartition(query_distances, query_number_of_players - 1)[:query_number_of_players]
+
+        else:
+            closest_positions = np.array([], dtype= 'int64')
+
+        closest_positions = closest_positions[np.isfinite(query_distances[closest_positions])]
+        closest_positions = closest_positions[np.argsort(query_distances[closest_positions], kind= 'stable')]
+
+        query_similar_players_df = players_df.iloc[closest_positions].reset_index(drop= True)
+        query_similar_players_df.insert(0, 'query_id', player_id)
+
+        if player_costs is not None:
+            query_similar_players_df['now_cost'] = player_costs[closest_positions]
+
+        else:
+            pass
+
+        # Rounding errors can leave tiny negative squared distances for near-identical players
+        query_similar_players_df['distance'] = np.sqrt(np.maximum(query_distances[closest_positions], 0)).round(3)
+
+        similar_players_list.append(query_similar_players_df)
+
+    # Without any query players there is nothing to combine, so an empty dataframe with the same columns is returned
+    if not similar_players_list:
+
+        empty_similar_players_df = players_df.iloc[0:0].reset_index(drop= True)
+        empty_similar_players_df.insert(0, 'query_id', pd.Series(dtype= 'int64'))
+
+        if player_costs is not None:
+            empty_similar_players_df['now_cost'] = pd.Series(dtype= 'float64')
+
+        else:
+            pass
+
+        empty_similar_players_df['distance'] = pd.Series(dtype= 'float64')
+
+        return empty_similar_players_df
+
+    else:
+        pass
+
+    similar_players_df = pd.concat(similar_players_list, ignore_index= True)
+
+    return similar_players_df
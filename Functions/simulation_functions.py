@@ -0,0 +1,305 @@
+import os
+import numpy as np
+import pandas as pd
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Simulated points are whole numbers, so each chunk of trials is reduced to a per-player histogram of points scored
+POINTS_HISTOGRAM_SIZE = 256
+
+
+def prepare_simulation_inputs(
+        player_rates_df: pd.DataFrame,
+        fixture_matrices: dict,
+        config_dict: dict,
+        gameweek: int
+    ) -> dict:
+
+    '''
+    Converts each player's per-90 rates and their team's fixtures in the gameweek into the arrays sampled by
+    simulate_trials, using the same fixture adjustments as project_player_points.
+
+    Args:
+        player_rates_df - Dataframe of per-90 rates produced by calculate_per_90_rates.
+        fixture_matrices - Dictionary of fixture matrices produced by build_fixture_matrices.
+        config_dict - Dictionary containing configuration info for processing of the FPL API returns.
+        gameweek - The gameweek being simulated.
+
+    Returns:
+        simulation_inputs - Dictionary containing the player details dataframe under 'players_df', and numpy arrays of
+        the per-player sampling rates and point values.
+    '''
+
+    # Players whose team is not in the fixture matrices (e.g. those who have left the league) are dropped
+    team_row = pd.Index(fixture_matrices['team_names']).get_indexer(player_rates_df['team_name'])
+    players_df = player_rates_df[team_row >= 0].reset_index(drop= True)
+    team_row = team_row[team_row >= 0]
+
+    fixture_count = fixture_matrices['fixture_count'][team_row, gameweek - 1].astype('int64')
+    attack = fixture_matrices['attack'][team_row, gameweek - 1]
+    defence = fixture_matrices['defence'][team_row, gameweek - 1]
+
+    minutes_fraction = np.clip(players_df['expected_minutes'].to_numpy('float64') / 90, 0, 1)
+
+    with np.errstate(divide= 'ignore', invalid= 'ignore'):
+        clean_sheet_probability = np.where(
+            fixture_count > 0,
+            np.exp(-players_df['expected_goals_conceded_per_90'].to_numpy('float64') * fixture_count / defence),
+            0
+        )
+
+    # A team keeps a clean sheet at the minutes weighted average of its players' chances
+    number_of_teams = len(fixture_matrices['team_names'])
+    team_minutes = np.bincount(team_row, weights= minutes_fraction, minlength= number_of_teams)
+
+    with np.errstate(divide= 'ignore', invalid= 'ignore'):
+        team_clean_sheet_probability = np.nan_to_num(
+            np.bincount(team_row, weights= minutes_fraction * clean_sheet_probability, minlength= number_of_teams) / team_minutes
+        )
+
+    simulation_inputs = {
+        'players_df' : players_df[['id', 'full_name', 'team_name', 'position']],
+        'team_row' : team_row,
+        'number_of_teams' : number_of_teams,
+        'team_fixture_count' : fixture_matrices['fixture_count'][:, gameweek - 1].astype('int64'),
+        'fixture_count' : fixture_count,
+        'minutes_fraction' : minutes_fraction,
+        'goal_rate' : players_df['expected_goals_per_90'].to_numpy('float64') * attack,
+        'assist_rate' : players_df['expected_assists_per_90'].to_numpy('float64') * attack,
+        'clean_sheet_probability' : clean_sheet_probability,
+        'team_clean_sheet_probability' : team_clean_sheet_probability,
+        'goal_value' : players_df['position'].map(config_dict['goal_values']).fillna(0).to_numpy('int64'),
+        'clean_sheet_value' : players_df['position'].map(config_dict['clean_sheet_values']).fillna(0).to_numpy('int64')
+    }
+
+    return simulation_inputs
+
+
+def simulate_trials(
+        simulation_inputs: dict,
+        number_of_trials: int,
+        seed_sequence: np.random.SeedSequence,
+        team_correlation: bool = False
+    ) -> dict:
+
+    '''
+    Samples the points of every player across a chunk of trials at once, as (trials, players) arrays. Appearances are
+    Bernoulli draws on expected minutes, goals and assists are Poisson draws on the fixture adjusted rates, and clean
+    sheets come from a uniform draw shared by each team in each fixture, so teammates keep clean sheets together.
+
+    Args:
+        simulation_inputs - Dictionary of arrays produced by prepare_simulation_inputs.
+        number_of_trials - The number of trials in the chunk.
+        seed_sequence - Seed for the chunk's random number generator.
+        team_correlation - Whether to include the sums needed to correlate each player's points with their team's goals
+        and clean sheets.
+
+    Returns:
+        trial_summary - Dictionary containing the per-player 'points_histogram', along with the correlation sums if
+        requested.
+    '''
+
+    rng = np.random.default_rng(seed_sequence)
+    number_of_players = len(simulation_inputs['team_row'])
+    number_of_teams = simulation_inputs['number_of_teams']
+    team_row = simulation_inputs['team_row']
+    fixture_count = simulation_inputs['fixture_count']
+
+    appearances = rng.random((number_of_trials, number_of_players)) < simulation_inputs['minutes_fraction']
+    goals = rng.poisson(simulation_inputs['goal_rate'], (number_of_trials, number_of_players)) * appearances
+    assists = rng.poisson(simulation_inputs['assist_rate'], (number_of_trials, number_of_players)) * appearances
+
+    # One uniform draw per team and fixture slot, with slots beyond the team's fixture count never keeping a clean sheet
+    maximum_fixtures = max(int(simulation_inputs['team_fixture_count'].max(initial= 0)), 1)
+    team_draws = rng.random((number_of_trials, number_of_teams, maximum_fixtures))
+    team_fixture_slot_played = np.arange(maximum_fixtures) < simulation_inputs['team_fixture_count'][:, None]
+
+    clean_sheets = (
+        (team_draws[:, team_row, :] < simulation_inputs['clean_sheet_probability'][:, None])
+        & team_fixture_slot_played[team_row]
+    ).sum(axis= 2) * appearances
+
+    points = (
+        appearances * fixture_count * 2
+        + goals * simulation_inputs['goal_value']
+        + assists * 3
+        + clean_sheets * simulation_inputs['clean_sheet_value']
+    )
+    points = np.minimum(points, POINTS_HISTOGRAM_SIZE - 1)
+
+    points_histogram = np.bincount(
+        (np.arange(number_of_players) * POINTS_HISTOGRAM_SIZE + points).ravel(),
+        minlength= number_of_players * POINTS_HISTOGRAM_SIZE
+    ).reshape(number_of_players, POINTS_HISTOGRAM_SIZE)
+
+    trial_summary = {'points_histogram' : points_histogram}
+
+    if not team_correlation:
+        return trial_summary
+
+    else:
+        pass
+
+    # Team outcomes are the goals scored by the team's players, and the clean sheets kept at the team's average chance
+    team_indicator = np.zeros((number_of_players, number_of_teams))
+    team_indicator[np.arange(number_of_players), team_row] = 1
+
+    team_goals = (goals @ team_indicator)[:, team_row]
+    team_clean_sheets = (
+        (team_draws < simulation_inputs['team_clean_sheet_probability'][:, None]) & team_fixture_slot_played
+    ).sum(axis= 2)[:, team_row]
+
+    points = points.astype('float64')
+
+    trial_summary.update(
+        sum_points= points.sum(axis= 0),
+        sum_points_squared= (points ** 2).sum(axis= 0),
+        sum_team_goals= team_goals.sum(axis= 0),
+        sum_team_goals_squared= (team_goals ** 2).sum(axis= 0),
+        sum_points_team_goals= (points * team_goals).sum(axis= 0),
+        sum_team_clean_sheets= team_clean_sheets.sum(axis= 0),
+        sum_team_clean_sheets_squared= (team_clean_sheets ** 2).sum(axis= 0),
+        sum_points_team_clean_sheets= (points * team_clean_sheets).sum(axis= 0)
+    )
+
+    return trial_summary
+
+
+def correlation_from_sums(
+        number_of_trials: int,
+        sum_x: np.ndarray,
+        sum_x_squared: np.ndarray,
+        sum_y: np.ndarray,
+        sum_y_squared: np.ndarray,
+        sum_xy: np.ndarray
+    ) -> np.ndarray:
+
+    '''Returns the Pearson correlation of each column pair from their running sums, or NaN where either does not vary'''
+
+    covariance = sum_xy - sum_x * sum_y / number_of_trials
+    variance_x = sum_x_squared - sum_x ** 2 / number_of_trials
+    variance_y = sum_y_squared - sum_y ** 2 / number_of_trials
+
+    with np.errstate(divide= 'ignore', invalid= 'ignore'):
+        correlation = covariance / np.sqrt(variance_x * variance_y)
+
+    return np.where((variance_x > 1e-9) & (variance_y > 1e-9), correlation, np.nan)
+
+
+def simulate_gameweek_points(
+        player_rates_df: pd.DataFrame,
+        fixture_matrices: dict,
+        config_dict: dict,
+        gameweek: int,
+        number_of_trials: int,
+        random_seed: int = None,
+        team_correlation: bool = False,
+        max_workers: int = None
+    ) -> pd.DataFrame:
+
+    '''
+    Simulates the points of every player in a gameweek, and summarises each player's distribution of points. Trials are
+    run in chunks of 'simulation_chunk_trials', which are spread over a process pool once the number of trials reaches
+    'simulation_parallel_trials'. Each chunk has its own seed, so results do not depend on the number of workers.
+
+    Args:
+        player_rates_df - Dataframe of per-90 rates produced by calculate_per_90_rates.
+        fixture_matrices - Dictionary of fixture matrices produced by build_fixture_matrices.
+        config_dict - Dictionary containing configuration info for processing of the FPL API returns.
+        gameweek - The gameweek being simulated.
+        number_of_trials - The number of trials to simulate.
+        random_seed - Seed for the simulation, or None for a different simulation on each call.
+        team_correlation - Whether to include the correlation of each player's points with their team's goals and clean
+        sheets.
+        max_workers - The number of processes used for large runs, defaulting to the number of cores.
+
+    Returns:
+        player_simulation_df - Dataframe containing each player's details, mean points, configured percentiles of points
+        and optionally their correlation with team outcomes, sorted by mean points.
+
+    Raises:
+        ValueError - If the number of trials is not positive.
+    '''
+
+    if number_of_trials < 1:
+        raise ValueError(f'ValueError - The number of trials must be positive, not {number_of_trials}')
+
+    else:
+        pass
+
+    simulation_inputs = prepare_simulation_inputs(player_rates_df, fixture_matrices, config_dict, gameweek)
+
+    chunk_size = config_dict['simulation_chunk_trials']
+    chunk_sizes_list = [min(chunk_size, number_of_trials - start) for start in range(0, number_of_trials, chunk_size)]
+    seed_sequences_list = np.random.SeedSequence(random_seed).spawn(len(chunk_sizes_list))
+
+    # A pool of one process would only add the cost of starting it, e.g. on a single core machine
+    max_workers = max_workers or os.cpu_count() or 1
+
+    run_in_parallel = (
+        number_of_trials >= config_dict['simulation_parallel_trials'] and len(chunk_sizes_list) > 1 and max_workers > 1
+    )
+
+    if run_in_parallel:
+
+        with ProcessPoolExecutor(max_workers= max_workers) as executor:
+            trial_summaries_list = list(
+                executor.map(
+                    simulate_trials,
+                    repeat(simulation_inputs),
+                    chunk_sizes_list,
+                    seed_sequences_list,
+                    repeat(team_correlation)
+                )
+            )
+
+    else:
+        trial_summaries_list = list(
+            map(simulate_trials, repeat(simulation_inputs), chunk_sizes_list, seed_sequences_list, repeat(team_correlation))
+        )
+
+    totals_dict = {
+        key : sum(trial_summary[key] for trial_summary in trial_summaries_list)
+        for key in trial_summaries_list[0]
+    }
+
+    # Percentiles are read from the cumulative histogram, as the smallest points total reaching each share of trials
+    cumulative_counts = totals_dict['points_histogram'].cumsum(axis= 1)
+    player_simulation_df = simulation_inputs['players_df'].copy()
+    player_simulation_df['mean_points'] = (
+        totals_dict['points_histogram'] @ np.arange(POINTS_HISTOGRAM_SIZE) / number_of_trials
+    ).round(2)
+
+    for percentile in config_dict['simulation_percentiles']:
+
+        player_simulation_df[f'percentile_{percentile}'] = (
+            cumulative_counts < np.ceil(number_of_trials * percentile / 100)
+        ).sum(axis= 1)
+
+    if team_correlation:
+
+        player_simulation_df['team_goals_correlation'] = correlation_from_sums(
+            number_of_trials,
+            totals_dict['sum_points'],
+            totals_dict['sum_points_squared'],
+            totals_dict['sum_team_goals'],
+            totals_dict['sum_team_goals_squared'],
+            totals_dict['sum_points_team_goals']
+        ).round(3)
+
+        player_simulation_df['team_clean_sheets_correlation'] = correlation_from_sums(
+            number_of_trials,
+            totals_dict['sum_points'],
+            totals_dict['sum_points_squared'],
+            totals_dict['sum_team_clean_sheets'],
+            totals_dict['sum_team_clean_sheets_squared'],
+            totals_dict['sum_points_team_clean_sheets']
+        ).round(3)
+
+    else:
+        pass
+
+    player_simulation_df = player_simulation_df.sort_values('mean_points', ascending= False, kind= 'stable')
+
+    return player_simulation_df.reset_index(drop= True)
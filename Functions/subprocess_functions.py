@@ -1,59 +1,307 @@
+import os
 import time
+import signal
+import threading
 import subprocess
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
 
 def subprocess_runner(
         operations_list: list,
         time_limit_seconds: int,
-        script_name: str
-    ):
+        script_name: str,
+        log_filepath: str
+    ) -> dict:
+
+    '''Runs a specified script as a subprocess, streaming its output line by line into a log file
 
-    '''Runs a specified script as a subprocess
-    
     Args:
         operations_list - List of variables to pass into the subprocess, first two items in this list should be the python environment \
         the script should be run in, followed by the filepath to the script
         time_limit_seconds - The amount of time in seconds that the script should be allowed to run before it is terminated
         script_name - The name of the script
+        log_filepath - The full filepath to the log file the script's output is appended to
 
     Returns:
-        running_subprocess - 
+        stage_result - Dictionary containing the 'script_name', 'return_code', 'timed_out', 'duration_seconds' and \
+        'log_filepath' of the run. The return code is None if the script could not be started.
     '''
 
-    try:
+    start_time = time.perf_counter()
+
+    # Unbuffered output lets each line reach the log as soon as it is printed
+    subprocess_environment = dict(os.environ, PYTHONUNBUFFERED= '1')
+
+    # Starting the script in its own process group allows any children it spawns to be killed along with it
+    if os.name != 'nt':
+        process_group_kwargs = {'start_new_session' : True}
+
+    else:
+        process_group_kwargs = {'creationflags' : subprocess.CREATE_NEW_PROCESS_GROUP}
+
+    with open(log_filepath, 'a', encoding= 'utf-8') as log_file:
+
+        log_file.write(f'========== {script_name} started at {datetime.now():%Y-%m-%d %H:%M:%S} ==========\n')
+        log_file.flush()
+
+        try:
+
+            running_subprocess = subprocess.Popen(
+                args= operations_list,
+                stdout= subprocess.PIPE,
+                stderr= subprocess.STDOUT,
+                text= True,
+                encoding= 'utf-8',
+                errors= 'replace',
+                env= subprocess_environment,
+                **process_group_kwargs
+            )
+
+        except OSError as e:
+
+            log_file.write(f'{script_name} could not be started: {e}\n')
 
-        running_subprocess = subprocess.Popen(
-            args= operations_list,
-            stdout= subprocess.PIPE,
-            stderr= subprocess.PIPE
+            stage_result = {
+                'script_name' : script_name,
+                'return_code' : None,
+                'timed_out' : False,
+                'duration_seconds' : round(time.perf_counter() - start_time, 2),
+                'log_filepath' : log_filepath
+            }
+
+            return stage_result
+
+        log_streaming_thread = threading.Thread(
+            target= stream_output_to_log,
+            args= (running_subprocess.stdout, log_file),
+            daemon= True
         )
+        log_streaming_thread.start()
 
-        running_subprocess.communicate(timeout= time_limit_seconds)
-        running_subprocess.terminate()
+        try:
 
-        return
+            running_subprocess.wait(timeout= time_limit_seconds)
+
+            # A child the script started can hold the output pipe open after the script exits, so the time limit
+            # also applies to draining the output
+            remaining_seconds = max(time_limit_seconds - (time.perf_counter() - start_time), 0)
+            log_streaming_thread.join(timeout= remaining_seconds)
+            timed_out = log_streaming_thread.is_alive()
+
+        except subprocess.TimeoutExpired:
+            timed_out = True
+
+        if timed_out:
 
-    except subprocess.TimeoutExpired as e:
+            terminate_process_group(running_subprocess, log_streaming_thread= log_streaming_thread)
+            log_streaming_thread.join(timeout= 5)
 
-        running_subprocess.terminate()
-        subprocess_still_running = running_subprocess.poll() is None
+        else:
+            pass
+
+        duration_seconds = round(time.perf_counter() - start_time, 2)
+
+        if timed_out:
+            log_file.write(f'Time limit of {time_limit_seconds}s was reached for {script_name}, the process group was terminated.\n')
 
-        if not subprocess_still_running:
-            raise subprocess.TimeoutExpired(f'Time limit was reached for {script_name}, subprocess was successfully terminated.')
-        
         else:
             pass
 
-        running_subprocess.kill()
-        subprocess_still_running = running_subprocess.poll() is None
+        log_file.write(
+            f'========== {script_name} ended with return code {running_subprocess.returncode} '
+            f'after {duration_seconds}s ==========\n'
+        )
+
+    stage_result = {
+        'script_name' : script_name,
+        'return_code' : running_subprocess.returncode,
+        'timed_out' : timed_out,
+        'duration_seconds' : duration_seconds,
+        'log_filepath' : log_filepath
+    }
+
+    return stage_result
+
+
+def stream_output_to_log(
+        output_stream,
+        log_file
+    ):
+
+    '''Writes each line of a subprocess's output to a log file as soon as it is produced, prefixed with a timestamp
+
+    Args:
+        output_stream - The stdout pipe of the running subprocess
+        log_file - The open log file to write to
+    '''
+
+    for line in output_stream:
+
+        log_file.write(f'{datetime.now():%H:%M:%S} | {line}')
+        log_file.flush()
+
+    output_stream.close()
+
+
+def terminate_process_group(
+        running_subprocess: subprocess.Popen,
+        grace_period_seconds: int = 5,
+        log_streaming_thread: threading.Thread = None
+    ):
+
+    '''Terminates a subprocess along with any children in its process group, escalating to a kill if the processes \
+    do not exit within the grace period
+
+    Args:
+        running_subprocess - The subprocess to terminate, which must have been started in its own process group
+        grace_period_seconds - The amount of time in seconds the processes are given to exit before being killed
+        log_streaming_thread - The thread streaming the subprocess's output, if given the processes are also killed \
+        when a child is still holding the output open at the end of the grace period
+    '''
+
+    try:
+
+        if os.name != 'nt':
+            os.killpg(running_subprocess.pid, signal.SIGTERM)
+
+        else:
+            running_subprocess.send_signal(signal.CTRL_BREAK_EVENT)
+
+        running_subprocess.wait(timeout= grace_period_seconds)
+
+        if log_streaming_thread is not None:
+            log_streaming_thread.join(timeout= grace_period_seconds)
 
-        if not subprocess_still_running:
-            raise subprocess.TimeoutExpired(f'Time limit was reached for {script_name}, subprocess was successfully terminated.')
-        
         else:
-            raise subprocess.TimeoutExpired(f'Time limit was reached for {script_name}, subprocess could not be terminated. PID: {running_subprocess.pid}')
-        
-    except Exception as e:
-        raise Exception(f'{e}')
-    
+            pass
+
+        if log_streaming_thread is None or not log_streaming_thread.is_alive():
+            return
+
+        else:
+            pass
+
+    except subprocess.TimeoutExpired:
+        pass
+
+    except ProcessLookupError:
+        return
+
+    try:
+
+        if os.name != 'nt':
+            os.killpg(running_subprocess.pid, signal.SIGKILL)
+
+        else:
+            running_subprocess.kill()
+
+    except ProcessLookupError:
+        pass
+
+    running_subprocess.wait()
+
+
+def run_stages(
+        stages_list: list,
+        max_workers: int,
+        log_directory: str
+    ) -> list:
+
+    '''Runs a set of scripts concurrently, up to a limit on the number of scripts running at once. A stage only starts \
+    once every stage it depends on has succeeded, and is skipped if any of them fail or time out
+
+    Args:
+        stages_list - List of stage dictionaries, each containing the 'script_name', 'operations_list' and \
+        'time_limit_seconds' of a script, along with an optional 'depends_on' list of other script names
+        max_workers - The maximum number of scripts to run at once
+        log_directory - The full filepath to the folder the log file of each script is written to
+
+    Returns:
+        stage_results_list - List of stage result dictionaries, in the order the stages were given. Skipped stages have \
+        a return code of None and a 'skipped' value of True
+    '''
+
+    os.makedirs(log_directory, exist_ok= True)
+
+    stage_results = {}
+    pending_stages_list = list(stages_list)
+    running_futures = {}
+
+    with ThreadPoolExecutor(max_workers= max_workers) as executor:
+
+        while pending_stages_list or running_futures:
+
+            for stage in list(pending_stages_list):
+
+                dependencies_list = stage.get('depends_on', [])
+                dependencies_finished = all(dependency in stage_results for dependency in dependencies_list)
+
+                if not dependencies_finished:
+                    continue
+
+                else:
+                    pass
+
+                pending_stages_list.remove(stage)
+                dependencies_succeeded = all(stage_succeeded(stage_results[dependency]) for dependency in dependencies_list)
+
+                if not dependencies_succeeded:
+
+                    stage_results[stage['script_name']] = {
+                        'script_name' : stage['script_name'],
+                        'return_code' : None,
+                        'timed_out' : False,
+                        'duration_seconds' : 0,
+                        'log_filepath' : None,
+                        'skipped' : True
+                    }
+
+                    continue
+
+                else:
+                    pass
+
+                future = executor.submit(
+                    subprocess_runner,
+                    operations_list= stage['operations_list'],
+                    time_limit_seconds= stage['time_limit_seconds'],
+                    script_name= stage['script_name'],
+                    log_filepath= os.path.join(log_directory, f'{stage["script_name"]}.log')
+                )
+
+                running_futures[future] = stage['script_name']
+
+            # Stages whose dependencies were skipped can be resolved straight away
+            if not running_futures:
+
+                if pending_stages_list and not any(
+                    all(dependency in stage_results for dependency in stage.get('depends_on', []))
+                    for stage in pending_stages_list
+                ):
+                    raise ValueError(f'ValueError - Stages depend on unknown or circular stages: {[stage["script_name"] for stage in pending_stages_list]}')
+
+                else:
+                    continue
+
+            else:
+                pass
+
+            finished_futures, _ = wait(running_futures, return_when= FIRST_COMPLETED)
+
+            for future in finished_futures:
+
+                script_name = running_futures.pop(future)
+                stage_results[script_name] = dict(future.result(), skipped= False)
+
+    stage_results_list = [stage_results[stage['script_name']] for stage in stages_list]
+
+    return stage_results_list
+
+
+def stage_succeeded(stage_result: dict) -> bool:
 
+    '''Checks whether a stage finished successfully. A stage that reached its time limit has failed, even if its process \
+    exited with a return code of 0 after being terminated'''
 
+    return stage_result['return_code'] == 0 and not stage_result['timed_out']
@@ -0,0 +1,267 @@
+import os
+import json
+import argparse
+import multiprocessing
+import functions.fpl_functions as fpl
+import functions.fixture_functions as fixtures
+import functions.projection_functions as projection
+import functions.simulation_functions as simulation
+import functions.manifest_functions as manifest
+from functions.fpl_functions import APIError
+
+
+print('---------- SCRIPT STARTED ----------')
+
+
+# Every API response is archived, and replay mode rebuilds the projections from the archive without any calls to the API
+argument_parser = argparse.ArgumentParser()
+argument_parser.add_argument('--replay', action= 'store_true', help= 'Rebuild the projections from the payload archive')
+argument_parser.add_argument('--season', help= 'Season to replay, in the format YYYY-YY, defaulting to the most recent')
+arguments = argument_parser.parse_args()
+
+ARCHIVE_DIRECTORY = os.path.join(os.path.dirname(__file__), 'database_files', 'archive')
+
+
+
+# Retrieve general information about the FPL season from the API
+print('Retrieving general information about the current FPL season...')
+
+try:
+
+    general_fpl_info_dict = fpl.retrieve_general_data(
+        archive_directory= ARCHIVE_DIRECTORY,
+        replay= arguments.replay,
+        season= arguments.season
+    )
+
+except APIError as api_error:
+
+    print(api_error)
+    print('********** SCRIPT ENDED ON ERROR **********')
+    exit(1)
+
+except Exception as e:
+
+    print(f'Unexpected error encountered while retrieving general FPL data - {e}')
+    print('********** SCRIPT ENDED ON ERROR **********')
+    exit(1)
+
+
+
+# Determine the current season
+print('Determining the current Premier League season...')
+
+try:
+    current_season = fpl.determine_current_season(general_fpl_info_dict= general_fpl_info_dict)
+
+except ValueError as value_error:
+
+    print(value_error)
+    print('********** SCRIPT ENDED ON ERROR **********')
+    exit(1)
+
+except Exception as e:
+
+    print(f'Unexpected error encountered while determining the current Premier League season - {e}')
+    print('********** SCRIPT ENDED ON ERROR **********')
+    exit(1)
+
+
+
+# Generate file paths required for the script
+(
+    CONFIG_JSON_FILEPATH,
+    GAMEWEEK_FILES_DIRECTORY
+)= fpl.pathfinder(season= current_season)
+
+TEAM_PROJECTION_FILEPATH = os.path.join(GAMEWEEK_FILES_DIRECTORY, 'team_projection.csv')
+FIXTURE_DIFFICULTY_FILEPATH = os.path.join(GAMEWEEK_FILES_DIRECTORY, 'fixture_difficulty.csv')
+PLAYER_PROJECTION_FILEPATH = os.path.join(GAMEWEEK_FILES_DIRECTORY, 'player_projection.csv')
+PLAYER_SIMULATION_FILEPATH = os.path.join(GAMEWEEK_FILES_DIRECTORY, 'player_simulation.csv')
+
+
+
+# Read in config file
+print('Reading in config file...')
+try:
+
+    with open(CONFIG_JSON_FILEPATH) as temporary_file:
+        config = json.load(temporary_file)
+
+except Exception as e:
+
+    print(f'Error encountered while reading in config file: {e}')
+    print('********** SCRIPT ENDED ON ERROR **********')
+    exit(1)
+
+
+
+# Determine the first gameweek to project
+print('Checking which FPL gameweek has been most recently completed...')
+
+try:
+    last_completed_gameweek = fpl.find_last_completed_gameweek(general_fpl_info_dict= general_fpl_info_dict)
+
+except Exception as e:
+
+    print(f'Error encountered while identifying last completed gameweek: {e}')
+    print('********** SCRIPT ENDED ON ERROR **********')
+    exit(1)
+
+number_of_gameweeks = len(general_fpl_info_dict['events'])
+next_gameweek = (last_completed_gameweek or 0) + 1
+
+if next_gameweek > number_of_gameweeks:
+
+    print('All gameweeks have been completed, there are no fixtures left to project.')
+    print('---------- SCRIPT COMPLETED ----------')
+    exit(0)
+
+else:
+    pass
+
+
+
+# Retrieve the fixture list from the API
+try:
+
+    fixtures_list = fixtures.retrieve_fixtures_data(
+        season= current_season,
+        archive_directory= ARCHIVE_DIRECTORY,
+        replay= arguments.replay
+    )
+
+except APIError as api_error:
+
+    print(api_error)
+    print('********** SCRIPT ENDED ON ERROR **********')
+    exit(1)
+
+except Exception as e:
+
+    print(f'Unexpected error encountered while retrieving fixture data - {e}')
+    print('********** SCRIPT ENDED ON ERROR **********')
+    exit(1)
+
+
+
+# Build the fixture matrices and project team strength over the configured horizon
+print(f'Projecting team strength from gameweek {next_gameweek} over {config["projection_horizon"]} gameweek(s)...')
+
+try:
+
+    fixture_matrices = fixtures.build_fixture_matrices(
+        fixtures_list= fixtures_list,
+        general_fpl_info_dict= general_fpl_info_dict,
+        number_of_gameweeks= number_of_gameweeks
+    )
+
+    team_projection_df = fixtures.project_team_strength(
+        fixture_matrices= fixture_matrices,
+        start_gameweek= next_gameweek,
+        horizon= config['projection_horizon']
+    )
+
+    fixture_difficulty_df = fixtures.fixture_difficulty_dataframe(
+        fixture_matrices= fixture_matrices,
+        start_gameweek= next_gameweek,
+        horizon= config['projection_horizon']
+    )
+
+except Exception as e:
+
+    print(f'Error encountered while projecting team strength: {e}')
+    print('********** SCRIPT ENDED ON ERROR **********')
+    exit(1)
+
+
+
+# Project player points from their recent form, using the gameweek files recorded in the season manifest
+manifest_dict = manifest.load_manifest(gameweek_files_directory= GAMEWEEK_FILES_DIRECTORY)
+
+form_gameweeks_list = [
+    x for x in range(max(1, next_gameweek - config['projection_form_gameweeks']), next_gameweek)
+    if f'Gameweek_{x}.csv' in manifest_dict['outputs']
+]
+
+if not form_gameweeks_list:
+
+    print('No gameweek files are available yet, player points will not be projected.')
+    player_projection_df = None
+    player_simulation_df = None
+
+else:
+
+    print(f'Projecting player points using form from gameweek(s): {form_gameweeks_list}...')
+
+    try:
+
+        recent_gameweeks_df = fpl.load_gameweek_files(
+            gameweek_files_directory= GAMEWEEK_FILES_DIRECTORY,
+            gameweek_list= form_gameweeks_list
+        )
+
+        player_rates_df = projection.calculate_per_90_rates(recent_gameweeks_df= recent_gameweeks_df)
+
+        player_projection_df = projection.project_player_points(
+            player_rates_df= player_rates_df,
+            fixture_matrices= fixture_matrices,
+            config_dict= config,
+            start_gameweek= next_gameweek,
+            horizon= config['projection_horizon']
+        )
+
+    except Exception as e:
+
+        print(f'Error encountered while projecting player points: {e}')
+        print('********** SCRIPT ENDED ON ERROR **********')
+        exit(1)
+
+    print(f'Simulating gameweek {next_gameweek} points over {config["simulation_trials"]} trials...')
+
+    # Worker processes started by spawn re-run this script on import, so large runs only use a pool under fork
+    try:
+
+        player_simulation_df = simulation.simulate_gameweek_points(
+            player_rates_df= player_rates_df,
+            fixture_matrices= fixture_matrices,
+            config_dict= config,
+            gameweek= next_gameweek,
+            number_of_trials= config['simulation_trials'],
+            team_correlation= True,
+            max_workers= None if multiprocessing.get_start_method() == 'fork' else 1
+        )
+
+    except Exception as e:
+
+        print(f'Error encountered while simulating player points: {e}')
+        print('********** SCRIPT ENDED ON ERROR **********')
+        exit(1)
+
+
+
+# Write projections to csv
+# Other scripts run alongside this one and may create the folder at the same time, so an existing folder is not an error
+season_directory_exists = os.path.exists(GAMEWEEK_FILES_DIRECTORY)
+
+if not season_directory_exists:
+
+    print(f'Creating directory for {current_season} season data files')
+    os.makedirs(GAMEWEEK_FILES_DIRECTORY, exist_ok= True)
+
+else:
+    pass
+
+team_projection_df.to_csv(TEAM_PROJECTION_FILEPATH, index= False)
+fixture_difficulty_df.to_csv(FIXTURE_DIFFICULTY_FILEPATH, index= False)
+
+if player_projection_df is not None:
+
+    player_projection_df.to_csv(PLAYER_PROJECTION_FILEPATH, index= False)
+    player_simulation_df.to_csv(PLAYER_SIMULATION_FILEPATH, index= False)
+
+else:
+    pass
+
+print('Fixture projection file(s) successfully created.')
+print('---------- SCRIPT COMPLETED ----------')
@@ -1,20 +1,37 @@
 import os
 import json
-import requests
-import pandas as pd
-from datetime import datetime
+import argparse
 import functions.fpl_functions as fpl
+import functions.leaderboard_functions as leaderboards
+import functions.season_functions as season
+import functions.manifest_functions as manifest
+import functions.archive_functions as archive
 from functions.fpl_functions import APIError
 
 
 print('---------- SCRIPT STARTED ----------')
 
 
+# Every API response is archived, and replay mode rebuilds the season from the archive without any calls to the API
+argument_parser = argparse.ArgumentParser()
+argument_parser.add_argument('--replay', action= 'store_true', help= 'Rebuild every completed gameweek from the payload archive')
+argument_parser.add_argument('--season', help= 'Season to replay, in the format YYYY-YY, defaulting to the most recent')
+arguments = argument_parser.parse_args()
+
+ARCHIVE_DIRECTORY = os.path.join(os.path.dirname(__file__), 'database_files', 'archive')
+
+
+
 # Retrieve general information about the FPL season from the API
 print('Retrieving general information about the current FPL season...')
 
 try:
-    general_fpl_info_dict = fpl.retrieve_general_data()
+
+    general_fpl_info_dict = fpl.retrieve_general_data(
+        archive_directory= ARCHIVE_DIRECTORY,
+        replay= arguments.replay,
+        season= arguments.season
+    )
 
 except APIError as api_error:
 
@@ -23,7 +40,10 @@ except APIError as api_error:
     exit(1)
 
 except Exception as e:
+
     print(f'Unexpected error encountered while retrieving general FPL data - {e}')
+    print('********** SCRIPT ENDED ON ERROR **********')
+    exit(1)
 
 
 
@@ -53,6 +73,11 @@ except Exception as e:
     GAMEWEEK_FILES_DIRECTORY
 )= fpl.pathfinder(season= current_season)
 
+LEADERBOARDS_FILENAME = 'leaderboards.json'
+SEASON_TOTALS_FILENAME = 'season_totals.csv'
+LEADERBOARDS_FILEPATH = os.path.join(GAMEWEEK_FILES_DIRECTORY, LEADERBOARDS_FILENAME)
+SEASON_TOTALS_FILEPATH = os.path.join(GAMEWEEK_FILES_DIRECTORY, SEASON_TOTALS_FILENAME)
+
 
 
 # Read in config file
@@ -91,32 +116,107 @@ if not last_completed_gameweek:
 
 
 # Create a directory to store the seasons data files if it doesn't exist already
+# Other scripts run alongside this one and may create the folder at the same time, so an existing folder is not an error
 season_directory_exists = os.path.exists(GAMEWEEK_FILES_DIRECTORY)
 
 if not season_directory_exists:
 
     print(f'Creating directory for {current_season} season data files')
-    os.makedirs(GAMEWEEK_FILES_DIRECTORY)
+    os.makedirs(GAMEWEEK_FILES_DIRECTORY, exist_ok= True)
 
 else:
     pass
 
 
 
-# Determine which gameweeks need to be processed
-missing_gameweeks_list = [
-    x for x in range(1, last_completed_gameweek + 1) 
-    if f'Gameweek_{x}.csv' not in os.listdir(GAMEWEEK_FILES_DIRECTORY)
-]
+# Compile the column configuration into a single plan for cleaning each gameweek dataframe
+transform_plan = fpl.compile_transform_plan(config_dict= config)
+schema_version = manifest.calculate_schema_version(columns_list= transform_plan['output_columns'])
+
+
+
+# Determine which gameweeks need to be processed from the season manifest, which in replay mode is all of them
+try:
+
+    manifest_dict = manifest.load_manifest(gameweek_files_directory= GAMEWEEK_FILES_DIRECTORY)
+    adopted_gameweeks_list = manifest.adopt_untracked_files(
+        manifest_dict= manifest_dict,
+        gameweek_files_directory= GAMEWEEK_FILES_DIRECTORY
+    )
+
+    if adopted_gameweeks_list:
+        print(f'Added existing data files for gameweek(s) {adopted_gameweeks_list} to the season manifest.')
+
+    else:
+        pass
+
+    if arguments.replay:
+        missing_gameweeks_list = list(range(1, last_completed_gameweek + 1))
+
+    else:
+
+        missing_gameweeks_list = manifest.find_gameweeks_to_process(
+            manifest_dict= manifest_dict,
+            gameweek_files_directory= GAMEWEEK_FILES_DIRECTORY,
+            gameweek_list= list(range(1, last_completed_gameweek + 1)),
+            schema_version= schema_version,
+            verify_checksums= config['verify_manifest_checksums']
+        )
+
+except Exception as e:
+
+    print(f'Error encountered while reading the season manifest: {e}')
+    print('********** SCRIPT ENDED ON ERROR **********')
+    exit(1)
+
+# The season totals and leaderboards are recorded in the manifest with the gameweek files they were built from, so
+# those left out of date by an interrupted run, or by gameweeks being written again, are built afresh
+completed_gameweeks_list = [x for x in range(1, last_completed_gameweek + 1) if x not in missing_gameweeks_list]
 
-if not missing_gameweeks_list:
+season_totals_are_current, leaderboards_are_current = (
+    manifest.summary_file_is_current(
+        manifest_dict= manifest_dict,
+        gameweek_files_directory= GAMEWEEK_FILES_DIRECTORY,
+        summary_filename= summary_filename,
+        gameweek_list= completed_gameweeks_list
+    )
+    for summary_filename in [SEASON_TOTALS_FILENAME, LEADERBOARDS_FILENAME]
+)
+
+if not missing_gameweeks_list and season_totals_are_current and leaderboards_are_current:
 
     print('Data files have already been generated for all completed gameweeks.')
     print('---------- SCRIPT COMPLETED ----------')
     exit(0)
 
+elif not missing_gameweeks_list:
+    print('Data files have already been generated for all completed gameweeks, but the season totals or leaderboards are out of date.')
+
+else:
+    print(f'Data files are missing, changed or out of date for gameweek(s): {missing_gameweeks_list}.')
+
+
+
+# In replay mode, check the archive holds every gameweek before anything is written. Each gameweek is replayed with
+# the general information fetched closest to, but not after, its live data, so players keep the details they had then
+if arguments.replay:
+
+    try:
+
+        replay_entries_dict = archive.match_replay_payloads(
+            gameweek_list= missing_gameweeks_list,
+            archive_directory= ARCHIVE_DIRECTORY,
+            season= current_season
+        )
+
+    except Exception as e:
+
+        print(f'Unable to replay the {current_season} season from the payload archive: {e}')
+        print('********** SCRIPT ENDED ON ERROR **********')
+        exit(1)
+
 else:
-    print(f'Data files have not been generated for gameweek(s): {missing_gameweeks_list}.')
+    pass
 
 
 
@@ -135,73 +235,214 @@ except Exception as e:
     print('********** SCRIPT ENDED ON ERROR **********')
     exit(1)
 
+# Replayed player details are keyed by the hash of the general information they came from, so each is prepared once
+replay_player_details_dfs = {}
+
+
+
+# Read in the leaderboards and season totals, which are updated as each gameweek file is written
+try:
+
+    # A replay rebuilds every gameweek, so the leaderboards and season totals start again from empty
+    if arguments.replay:
+
+        season_totals_df = season.empty_season_totals(config_dict= config)
+        leaderboards_dict = leaderboards.empty_leaderboards()
+
+    else:
+
+        if season_totals_are_current:
+
+            season_totals_df = season.load_season_totals(
+                season_totals_filepath= SEASON_TOTALS_FILEPATH,
+                config_dict= config
+            )
+
+        else:
+
+            print('Building season totals from the existing gameweek files...')
+            season_totals_df = season.rebuild_season_totals(
+                gameweek_files_directory= GAMEWEEK_FILES_DIRECTORY,
+                gameweek_list= completed_gameweeks_list,
+                config_dict= config
+            )
+
+        if leaderboards_are_current:
+            leaderboards_dict = leaderboards.load_leaderboards(leaderboards_filepath= LEADERBOARDS_FILEPATH)
+
+        else:
+
+            print('Building leaderboards from the existing gameweek files...')
+            leaderboards_dict = leaderboards.rebuild_leaderboards(
+                gameweek_files_directory= GAMEWEEK_FILES_DIRECTORY,
+                gameweek_list= completed_gameweeks_list,
+                season_totals_df= season_totals_df,
+                config_dict= config
+            )
+
+except Exception as e:
+
+    print(f'Error encountered while reading in leaderboards and season totals: {e}')
+    print('********** SCRIPT ENDED ON ERROR **********')
+    exit(1)
+
 
 
-# Retrieve player data for the required gameweek(s) from the API
-print('Retrieving player data for the required gameweek(s) from the FPL API')
+# Retrieve and clean every required gameweek before anything is written, so a failure part way through leaves the
+# season's files as they were
+print(f'Retrieving player data for the required gameweek(s) from the {"payload archive" if arguments.replay else "FPL API"}')
+
+full_gameweek_dfs = {}
 
 for gameweek_number in missing_gameweeks_list:
 
-    GAMEWEEK_ENDPOINT_URL = f"https://fantasy.premierleague.com/api/event/{gameweek_number}/live/"
-    gameweek_data_response = requests.get(GAMEWEEK_ENDPOINT_URL)
-    api_return_code = gameweek_data_response.status_code
+    try:
+
+        # The archive entries were matched before anything was written, so their objects are read directly by hash
+        # rather than searching the archive index again for every gameweek
+        if arguments.replay:
+
+            live_entry = replay_entries_dict[gameweek_number]['live']
+            general_entry = replay_entries_dict[gameweek_number]['general']
+
+            print(f'Reading gameweek {gameweek_number} data from the payload archive...')
+            gameweek_dict = archive.read_archived_object(
+                payload_hash= live_entry['sha256'],
+                archive_directory= ARCHIVE_DIRECTORY
+            )
+
+            if general_entry['sha256'] not in replay_player_details_dfs:
+
+                replay_player_details_dfs[general_entry['sha256']] = fpl.prepare_player_details_df(
+                    general_fpl_info_dict= archive.read_archived_object(
+                        payload_hash= general_entry['sha256'],
+                        archive_directory= ARCHIVE_DIRECTORY
+                    ),
+                    config_dict= config
+                )
+
+            else:
+                pass
 
-    if api_return_code != 200:
+            gameweek_player_details_df = replay_player_details_dfs[general_entry['sha256']]
+
+        else:
+
+            gameweek_dict = fpl.retrieve_gameweek_data(
+                gameweek_number= gameweek_number,
+                season= current_season,
+                archive_directory= ARCHIVE_DIRECTORY
+            )
+
+            gameweek_player_details_df = player_details_df
+
+    except Exception as e:
 
         # NOTE: Can probably add a warning message here, continue with the script and remove the 'failed gw' from the 
         #       list of gws to process.
 
-        print(f'API call for last completed gameweek unsuccessful. Return code: {api_return_code}')
+        print(f'Retrieving data for gameweek {gameweek_number} unsuccessful: {e}')
         print('********** SCRIPT ENDED ON ERROR **********')
         exit(1)
 
-    else:
+    # Convert gameweek dictionary into dataframe and merge with player details
+    full_gameweek_df = fpl.build_gameweek_df(
+        gameweek_dict= gameweek_dict,
+        player_details_df= gameweek_player_details_df
+    )
 
-        gameweek_dict = gameweek_data_response.json()
+    # Clean dataframe, dropping managers and adding the attacking score
+    full_gameweek_dfs[gameweek_number] = fpl.apply_transform_plan(full_gameweek_df, transform_plan)
 
-    # Convert gameweek dictionary into dataframe and merge with player details
-    player_dataframe_list = []
-    number_of_players = len(gameweek_dict['elements'])
 
-    for player in range(0, number_of_players):
 
-        player_id = gameweek_dict['elements'][player]['id']
-        player_data_df = pd.json_normalize(gameweek_dict['elements'][player]['stats'])
-        player_data_df['id'] = player_id
+# Write each gameweek file, adding only the newly processed gameweek to the season totals and leaderboards
+for gameweek_number, full_gameweek_df in full_gameweek_dfs.items():
 
-        player_dataframe_list.append(player_data_df)
+    manifest_dict = manifest.write_gameweek_file(
+        gameweek_df= full_gameweek_df,
+        gameweek_number= gameweek_number,
+        gameweek_files_directory= GAMEWEEK_FILES_DIRECTORY,
+        manifest_dict= manifest_dict
+    )
 
-    full_gameweek_df = pd.concat(player_dataframe_list)
-    full_gameweek_df = full_gameweek_df.merge(
-        right= player_details_df,
-        how= 'inner',
-        on= 'id'
+    season_totals_df = season.update_season_totals(
+        season_totals_df= season_totals_df,
+        gameweek_df= full_gameweek_df,
+        config_dict= config
     )
 
-    # Clean dataframe and write to csv
-    full_gameweek_df = full_gameweek_df.drop(
-        labels= config['columns_to_drop_list'], 
-        axis= 1
+    leaderboards_dict = leaderboards.update_gameweek_leaderboards(
+        leaderboards_dict= leaderboards_dict,
+        gameweek_df= full_gameweek_df,
+        gameweek_number= gameweek_number,
+        config_dict= config
     )
 
-    # Drop managers from dataframe
-    full_gameweek_df = full_gameweek_df[full_gameweek_df['position'] != 'MNG']
+# The season leaderboards only depend on the final totals, so are built once every gameweek has been added
+leaderboards_dict = leaderboards.update_season_leaderboards(
+    leaderboards_dict= leaderboards_dict,
+    season_totals_df= season_totals_df,
+    config_dict= config
+)
+
+# Per-90 columns are only added to the saved file, and are recalculated from the totals each time it is written
+season.save_season_totals(
+    season_totals_df= season.add_per_90_metrics(season_totals_df= season_totals_df, config_dict= config),
+    season_totals_filepath= SEASON_TOTALS_FILEPATH
+)
+
+leaderboards.save_leaderboards(
+    leaderboards_dict= leaderboards_dict,
+    leaderboards_filepath= LEADERBOARDS_FILEPATH
+)
 
-    full_gameweek_df = full_gameweek_df.astype(config['column_dtypes_mapper'])
-    full_gameweek_df = fpl.attacking_score_calculation(full_gameweek_df, config)
-    full_gameweek_df = full_gameweek_df[config['column_reordering_list']]
+### Double gameweeks will likely break this for-loop, but I don't know exactly how, will need to revisit later in the season
+
+
+
+# Optionally check the season totals against a full rebuild from the gameweek files
+if config['verify_season_totals']:
+
+    print('Checking season totals against a full rebuild...')
+    rebuilt_season_totals_df = season.rebuild_season_totals(
+        gameweek_files_directory= GAMEWEEK_FILES_DIRECTORY,
+        gameweek_list= list(range(1, last_completed_gameweek + 1)),
+        config_dict= config
+    )
 
-    csv_filepath = os.path.join(
-        GAMEWEEK_FILES_DIRECTORY,
-        f'Gameweek_{gameweek_number}.csv'
+    mismatched_ids_list = season.check_season_totals(
+        season_totals_df= season_totals_df,
+        rebuilt_season_totals_df= rebuilt_season_totals_df,
+        config_dict= config
     )
 
-    full_gameweek_df.to_csv(
-        path_or_buf= csv_filepath,
-        index= False
+    if mismatched_ids_list:
+
+        print(f'Season totals did not match the rebuild for player id(s): {mismatched_ids_list}, replacing with the rebuild.')
+        season.save_season_totals(
+            season_totals_df= season.add_per_90_metrics(season_totals_df= rebuilt_season_totals_df, config_dict= config),
+            season_totals_filepath= SEASON_TOTALS_FILEPATH
+        )
+
+    else:
+        print('Season totals match the rebuild.')
+
+else:
+    pass
+
+
+
+# Record the gameweeks the season totals and leaderboards now include, only once both have been written
+for summary_filename in [SEASON_TOTALS_FILENAME, LEADERBOARDS_FILENAME]:
+
+    manifest_dict = manifest.record_summary_file(
+        manifest_dict= manifest_dict,
+        gameweek_files_directory= GAMEWEEK_FILES_DIRECTORY,
+        summary_filename= summary_filename,
+        gameweek_list= list(range(1, last_completed_gameweek + 1))
     )
 
-### Double gameweeks will likely break this for-loop, but I don't know exactly how, will need to revisit later in the season
 
 print('Gameweek file(s) successfully created.')
 print('---------- SCRIPT COMPLETED ----------')
\ No newline at end of file
@@ -0,0 +1,154 @@
+import os
+import json
+import functions.fpl_functions as fpl
+import functions.league_functions as leagues
+from functions.fpl_functions import APIError
+
+
+print('---------- SCRIPT STARTED ----------')
+
+
+# Retrieve general information about the FPL season from the API
+print('Retrieving general information about the current FPL season...')
+
+ARCHIVE_DIRECTORY = os.path.join(os.path.dirname(__file__), 'database_files', 'archive')
+
+try:
+    general_fpl_info_dict = fpl.retrieve_general_data(archive_directory= ARCHIVE_DIRECTORY)
+
+except APIError as api_error:
+
+    print(api_error)
+    print('********** SCRIPT ENDED ON ERROR **********')
+    exit(1)
+
+except Exception as e:
+
+    print(f'Unexpected error encountered while retrieving general FPL data - {e}')
+    print('********** SCRIPT ENDED ON ERROR **********')
+    exit(1)
+
+
+
+# Determine the current season
+print('Determining the current Premier League season...')
+
+try:
+    current_season = fpl.determine_current_season(general_fpl_info_dict= general_fpl_info_dict)
+
+except ValueError as value_error:
+
+    print(value_error)
+    print('********** SCRIPT ENDED ON ERROR **********')
+    exit(1)
+
+except Exception as e:
+
+    print(f'Unexpected error encountered while determining the current Premier League season - {e}')
+    print('********** SCRIPT ENDED ON ERROR **********')
+    exit(1)
+
+
+
+# Generate file paths required for the script
+(
+    CONFIG_JSON_FILEPATH,
+    GAMEWEEK_FILES_DIRECTORY
+)= fpl.pathfinder(season= current_season)
+
+LEAGUE_FILES_DIRECTORY = os.path.join(GAMEWEEK_FILES_DIRECTORY, 'leagues')
+PICKS_CACHE_DIRECTORY = os.path.join(LEAGUE_FILES_DIRECTORY, 'picks_cache')
+
+
+
+# Read in config file
+print('Reading in config file...')
+try:
+
+    with open(CONFIG_JSON_FILEPATH) as temporary_file:
+        config = json.load(temporary_file)
+
+except Exception as e:
+
+    print(f'Error encountered while reading in config file: {e}')
+    print('********** SCRIPT ENDED ON ERROR **********')
+    exit(1)
+
+if not config['league_ids']:
+
+    print('No mini-leagues have been configured.')
+    print('---------- SCRIPT COMPLETED ----------')
+    exit(0)
+
+else:
+    pass
+
+
+
+# Determine the current gameweek
+print('Checking which FPL gameweek has been most recently completed...')
+
+try:
+    last_completed_gameweek = fpl.find_last_completed_gameweek(general_fpl_info_dict= general_fpl_info_dict)
+
+except Exception as e:
+
+    print(f'Error encountered while identifying last completed gameweek: {e}')
+    print('********** SCRIPT ENDED ON ERROR **********')
+    exit(1)
+
+if not last_completed_gameweek:
+
+    print('No gameweeks have been completed yet')
+    print('---------- SCRIPT COMPLETED ----------')
+    exit(0)
+
+else:
+    pass
+
+os.makedirs(LEAGUE_FILES_DIRECTORY, exist_ok= True)
+
+
+
+# Retrieve the standings and picks of each configured league, and calculate effective ownership
+for league_id in config['league_ids']:
+
+    try:
+
+        print(f'Retrieving standings for league {league_id}...')
+        league_standings_df = leagues.retrieve_league_standings(league_id= league_id)
+
+        print(f'Retrieving gameweek {last_completed_gameweek} picks for {len(league_standings_df)} manager(s)...')
+        league_picks_dict = leagues.retrieve_league_picks(
+            entry_ids= league_standings_df['entry'].tolist(),
+            gameweek= last_completed_gameweek,
+            cache_directory= PICKS_CACHE_DIRECTORY,
+            max_workers= config['league_max_workers']
+        )
+
+        effective_ownership_df = leagues.calculate_effective_ownership(league_picks_dict= league_picks_dict)
+
+    except APIError as api_error:
+
+        print(f'{api_error}')
+        print('********** SCRIPT ENDED ON ERROR **********')
+        exit(1)
+
+    except Exception as e:
+
+        print(f'Error encountered while processing league {league_id}: {e}')
+        print('********** SCRIPT ENDED ON ERROR **********')
+        exit(1)
+
+    league_standings_df.to_csv(
+        os.path.join(LEAGUE_FILES_DIRECTORY, f'League_{league_id}_standings.csv'),
+        index= False
+    )
+
+    effective_ownership_df.to_csv(
+        os.path.join(LEAGUE_FILES_DIRECTORY, f'League_{league_id}_Gameweek_{last_completed_gameweek}_ownership.csv'),
+        index= False
+    )
+
+print('League file(s) successfully created.')
+print('---------- SCRIPT COMPLETED ----------')
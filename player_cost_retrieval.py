@@ -1,35 +1,26 @@
 import pandas as pd
-import requests
 import json
 import os
 from datetime import datetime
 import functions.fpl_functions as fpl
+import functions.price_functions as prices
+from functions.fpl_functions import APIError
 
 
 print('---------- SCRIPT STARTED ----------')
 
 
-# Retrieve general information about the FPL season from the API
-try:
-
-    print('Making request to General Info API...')
-    general_fpl_info = requests.get('https://fantasy.premierleague.com/api/bootstrap-static/')
-    api_return_code = str(general_fpl_info)[-5:-2]
-
-    if api_return_code != '200':
+# Retrieve general information about the FPL season from the API, archiving the raw response like the other scripts
+print('Retrieving general information about the current FPL season...')
 
-        raise ValueError
+ARCHIVE_DIRECTORY = os.path.join(os.path.dirname(__file__), 'database_files', 'archive')
 
-    else:
-
-        print('General Info API request successful.')
-        general_fpl_info = general_fpl_info.json()
+try:
+    general_fpl_info = fpl.retrieve_general_data(archive_directory= ARCHIVE_DIRECTORY)
 
-        pass
+except APIError as api_error:
 
-except ValueError:
-    
-    print(f'General Info API request failed, return code: {api_return_code}')
+    print(api_error)
     print('********** SCRIPT ENDED ON ERROR **********')
     exit(1)
 
@@ -38,20 +29,13 @@ except Exception as e:
     print(f'Error encountered while making General Info API request: {e}')
     print('********** SCRIPT ENDED ON ERROR **********')
     exit(1)
-    
-
-del api_return_code
 
 
 # Determine the current season
 try:
 
     print('Determining the current Premier League season...')
-    season_start_date_str = general_fpl_info['events'][0]['deadline_time']
-    season_start_year = datetime.strptime(season_start_date_str, '%Y-%m-%dT%H:%M:%SZ').year
-    season_end_year = season_start_year + 1
-
-    current_season = f'{season_start_year}-{str(season_end_year)[-2:]}'
+    current_season = fpl.determine_current_season(general_fpl_info_dict= general_fpl_info)
 
 except Exception as e:
 
@@ -59,8 +43,6 @@ except Exception as e:
     print('********** SCRIPT ENDED ON ERROR **********')
     exit(1)
 
-del season_start_date_str, season_start_year, season_end_year
-
 
 # Generate file paths required for the script
 print('Retrieving file paths required for the script...')
@@ -70,6 +52,28 @@ print('Retrieving file paths required for the script...')
 )= fpl.pathfinder(season= current_season)
 
 PLAYER_COST_DATABASE_FILEPATH = os.path.join(GAMEWEEK_FILES_DIRECTORY, 'player_cost.csv')
+PRICE_SNAPSHOT_FILEPATH = os.path.join(GAMEWEEK_FILES_DIRECTORY, 'player_price_snapshot.csv')
+PRICE_CHANGES_FILEPATH = os.path.join(GAMEWEEK_FILES_DIRECTORY, 'price_changes.csv')
+PRICE_PREDICTIONS_FILEPATH = os.path.join(GAMEWEEK_FILES_DIRECTORY, 'price_predictions.csv')
+
+# This script runs alongside gameweek_data_retrieval, so cannot rely on it having created the season's folder yet
+os.makedirs(GAMEWEEK_FILES_DIRECTORY, exist_ok= True)
+
+snapshot_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+# Read in config file
+print('Reading in config file...')
+try:
+
+    with open(CONFIG_JSON_FILEPATH) as temporary_file:
+        config = json.load(temporary_file)
+
+except Exception as e:
+
+    print(f'Error encountered while reading in config file: {e}')
+    print('********** SCRIPT ENDED ON ERROR **********')
+    exit(1)
 
 
 # Retrieve player costs and write to csv
@@ -80,7 +84,9 @@ try:
     general_fpl_info_dataframe = general_fpl_info_dataframe[['id', 'now_cost']]
     general_fpl_info_dataframe['now_cost'] = general_fpl_info_dataframe['now_cost'] / 10
 
-    general_fpl_info_dataframe.to_csv(PLAYER_COST_DATABASE_FILEPATH, index= False)
+    # Other scripts read this file while this one runs, so it is written in full before replacing the previous version
+    general_fpl_info_dataframe.to_csv(f'{PLAYER_COST_DATABASE_FILEPATH}.tmp', index= False)
+    os.replace(f'{PLAYER_COST_DATABASE_FILEPATH}.tmp', PLAYER_COST_DATABASE_FILEPATH)
 
 except KeyError as e:
 
@@ -101,4 +107,67 @@ except Exception as e:
     exit(1)
 
 print('Database successfully updated.')
+
+
+# Compare against the previous price snapshot and predict upcoming price changes
+print('Tracking price changes and predicting likely risers and fallers...')
+try:
+
+    price_snapshot_df = prices.prepare_price_snapshot(
+        general_fpl_info_dict= general_fpl_info,
+        config_dict= config,
+        snapshot_time= snapshot_time
+    )
+
+    previous_snapshot_exists = os.path.exists(PRICE_SNAPSHOT_FILEPATH)
+
+    if previous_snapshot_exists:
+
+        previous_snapshot_df = pd.read_csv(PRICE_SNAPSHOT_FILEPATH)
+        price_changes_df = prices.diff_price_snapshots(
+            previous_snapshot_df= previous_snapshot_df,
+            current_snapshot_df= price_snapshot_df
+        )
+
+        if not price_changes_df.empty:
+
+            print(f'{len(price_changes_df)} price change(s) detected since {previous_snapshot_df["snapshot_time"].iloc[0]}.')
+            price_changes_df.to_csv(
+                PRICE_CHANGES_FILEPATH,
+                mode= 'a',
+                header= not os.path.exists(PRICE_CHANGES_FILEPATH),
+                index= False
+            )
+
+        else:
+            print('No price changes detected since the previous snapshot.')
+
+    else:
+        print('No previous price snapshot found, price changes will be tracked from the next run.')
+
+    price_predictions_df = prices.predict_price_changes(
+        price_snapshot_df= price_snapshot_df,
+        total_players= general_fpl_info['total_players'],
+        prediction_size= config['price_prediction_size']
+    )
+
+    price_predictions_df.to_csv(f'{PRICE_PREDICTIONS_FILEPATH}.tmp', index= False)
+    os.replace(f'{PRICE_PREDICTIONS_FILEPATH}.tmp', PRICE_PREDICTIONS_FILEPATH)
+
+    price_snapshot_df.to_csv(f'{PRICE_SNAPSHOT_FILEPATH}.tmp', index= False)
+    os.replace(f'{PRICE_SNAPSHOT_FILEPATH}.tmp', PRICE_SNAPSHOT_FILEPATH)
+
+except KeyError as e:
+
+    print(f'Price tracking field is missing from the general_fpl_info dictionary: {e}')
+    print('********** SCRIPT ENDED ON ERROR **********')
+    exit(1)
+
+except Exception as e:
+
+    print(f'Error occurred while tracking player prices: {e}')
+    print('********** SCRIPT ENDED ON ERROR **********')
+    exit(1)
+
+print('Price tracking files successfully updated.')
 print('---------- SCRIPT COMPLETED ----------')
\ No newline at end of file
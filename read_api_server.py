@@ -0,0 +1,97 @@
+import os
+import re
+import json
+import argparse
+import functions.fpl_functions as fpl
+import functions.read_api_functions as read_api
+
+
+print('---------- SCRIPT STARTED ----------')
+
+
+# The season defaults to the most recent one with a data folder, so the server never needs to call the FPL API
+argument_parser = argparse.ArgumentParser()
+argument_parser.add_argument('--season', help= 'Season to serve, in the format YYYY-YY, defaulting to the most recent')
+argument_parser.add_argument('--host', help= 'Address to listen on, defaulting to the configured read_api_host')
+argument_parser.add_argument('--port', type= int, help= 'Port to listen on, defaulting to the configured read_api_port')
+arguments = argument_parser.parse_args()
+
+DATABASE_FILES_DIRECTORY = os.path.join(os.path.dirname(__file__), 'database_files')
+
+if arguments.season is not None:
+    current_season = arguments.season
+
+else:
+
+    seasons_list = sorted(
+        folder_name for folder_name in os.listdir(DATABASE_FILES_DIRECTORY)
+        if re.match(r'^\d{4}-\d{2}$', folder_name)
+    ) if os.path.exists(DATABASE_FILES_DIRECTORY) else []
+
+    if not seasons_list:
+
+        print(f'No season data folders were found in {DATABASE_FILES_DIRECTORY}')
+        print('********** SCRIPT ENDED ON ERROR **********')
+        exit(1)
+
+    else:
+        current_season = seasons_list[-1]
+
+
+
+# Generate file paths required for the script
+(
+    CONFIG_JSON_FILEPATH,
+    GAMEWEEK_FILES_DIRECTORY
+)= fpl.pathfinder(season= current_season)
+
+
+
+# Read in config file
+print('Reading in config file...')
+try:
+
+    with open(CONFIG_JSON_FILEPATH) as temporary_file:
+        config = json.load(temporary_file)
+
+except Exception as e:
+
+    print(f'Error encountered while reading in config file: {e}')
+    print('********** SCRIPT ENDED ON ERROR **********')
+    exit(1)
+
+
+
+# Load the season into memory once up front, so the first requests do not wait for every file to be read
+print(f'Loading {current_season} season data...')
+
+try:
+
+    season_data = read_api.refresh_season_data(
+        gameweek_files_directory= GAMEWEEK_FILES_DIRECTORY,
+        config_dict= config
+    )
+
+    read_api_server = read_api.create_read_api_server(
+        gameweek_files_directory= GAMEWEEK_FILES_DIRECTORY,
+        config_dict= config,
+        host= arguments.host or config['read_api_host'],
+        port= arguments.port or config['read_api_port']
+    )
+
+except Exception as e:
+
+    print(f'Error encountered while starting the read API: {e}')
+    print('********** SCRIPT ENDED ON ERROR **********')
+    exit(1)
+
+print(f'Loaded {len(season_data["gameweek_dfs"])} gameweek file(s).')
+print(f'Serving {current_season} season data on http://{read_api_server.server_address[0]}:{read_api_server.server_address[1]}')
+
+try:
+    read_api_server.serve_forever()
+
+except KeyboardInterrupt:
+    read_api_server.server_close()
+
+print('---------- SCRIPT COMPLETED ----------')
@@ -1,9 +1,10 @@
 import os
-import subprocess
 import functions.subprocess_functions as subprocess
 
 print('---------- SCRIPT STARTED ----------')
-print('Running gameweek_data_retrieval script...')
+
+MAX_WORKERS = 2
+LOG_DIRECTORY = os.path.join(os.path.dirname(__file__), 'logs')
 
 if os.name != 'nt':
 
@@ -27,49 +28,71 @@ else:
         )
     )
 
-try:
+# The fixture projections use the gameweek files, so must wait for gameweek_data_retrieval to succeed
+stages_list = [
 
-    script_filepath = os.path.join(
-        os.path.dirname(__file__),
-        'gameweek_data_retrieval.py'
-    )
+    {
+        'script_name' : 'gameweek_data_retrieval',
+        'operations_list' : [venv_file_path, os.path.join(os.path.dirname(__file__), 'gameweek_data_retrieval.py')],
+        'time_limit_seconds' : 60
+    },
 
-    subprocess.subprocess_runner(
-        operations_list= [venv_file_path, script_filepath],
-        time_limit_seconds= 60,
-        script_name= 'gameweek_data_retrieval'
-    )
+    {
+        'script_name' : 'player_cost_retrieval',
+        'operations_list' : [venv_file_path, os.path.join(os.path.dirname(__file__), 'player_cost_retrieval.py')],
+        'time_limit_seconds' : 60
+    },
 
-except subprocess.TimeoutExpired as e:
-    
-    print(f'Timeout: {e}')
+    {
+        'script_name' : 'fixture_data_retrieval',
+        'operations_list' : [venv_file_path, os.path.join(os.path.dirname(__file__), 'fixture_data_retrieval.py')],
+        'time_limit_seconds' : 60,
+        'depends_on' : ['gameweek_data_retrieval']
+    },
 
-except Exception as e:
+    {
+        'script_name' : 'league_data_retrieval',
+        'operations_list' : [venv_file_path, os.path.join(os.path.dirname(__file__), 'league_data_retrieval.py')],
+        'time_limit_seconds' : 1800
+    }
 
-    print(f'Exception: {e}')
+]
 
-print('Running player_cost_retrieval script...')
+print(f'Running {len(stages_list)} scripts with up to {MAX_WORKERS} at once, logs are written to {LOG_DIRECTORY}')
 
 try:
 
-    script_filepath = os.path.join(
-        os.path.dirname(__file__),
-        'player_cost_retrieval.py'
+    stage_results_list = subprocess.run_stages(
+        stages_list= stages_list,
+        max_workers= MAX_WORKERS,
+        log_directory= LOG_DIRECTORY
     )
 
-    subprocess.subprocess_runner(
-        operations_list= [venv_file_path, script_filepath],
-        time_limit_seconds= 60,
-        script_name= 'gameweek_data_retrieval'
-    )
-
-except subprocess.TimeoutExpired as e:
-    
-    print(f'Timeout: {e}')
-
 except Exception as e:
 
     print(f'Exception: {e}')
+    print('********** SCRIPT ENDED ON ERROR **********')
+    exit(1)
 
-print('---------- SCRIPT ENDED ----------')
+for stage_result in stage_results_list:
+
+    if stage_result['skipped']:
+        print(f'{stage_result["script_name"]}: skipped, as a script it depends on did not succeed')
+
+    elif stage_result['timed_out']:
+        print(f'{stage_result["script_name"]}: timed out after {stage_result["duration_seconds"]}s')
+
+    else:
+        print(f'{stage_result["script_name"]}: return code {stage_result["return_code"]} after {stage_result["duration_seconds"]}s')
+
+any_stage_failed = not all(subprocess.stage_succeeded(stage_result) for stage_result in stage_results_list)
 
+if any_stage_failed:
+
+    print('********** SCRIPT ENDED ON ERROR **********')
+    exit(1)
+
+else:
+    pass
+
+print('---------- SCRIPT ENDED ----------')
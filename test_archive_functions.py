@@ -0,0 +1,91 @@
+import os
+import json
+import unittest
+import tempfile
+import functions.archive_functions as archive
+
+
+class TestArchiveFunctions(unittest.TestCase):
+
+
+    def test_archive_payload(self):
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+
+            first_hash = archive.archive_payload(b'{"elements": [1]}', 'event/1/live/', temporary_directory, '2024-25', '2024-08-20T08:00:00Z')
+            repeat_hash = archive.archive_payload(b'{"elements": [1]}', 'event/1/live/', temporary_directory, '2024-25', '2024-08-21T08:00:00Z')
+            archive.archive_payload(b'{"elements": [2]}', 'event/2/live/', temporary_directory, '2024-25', '2024-08-27T08:00:00Z')
+
+            stored_objects_list = [
+                filename for _, _, filenames in os.walk(os.path.join(temporary_directory, 'objects')) for filename in filenames
+            ]
+
+            archive_index_df = archive.load_archive_index(temporary_directory)
+
+        # Identical responses are stored once, but every fetch is indexed
+        self.assertEqual(first_hash, repeat_hash)
+        self.assertEqual(len(stored_objects_list), 2)
+        self.assertIn(f'{first_hash}.json.gz', stored_objects_list)
+
+        self.assertEqual(list(archive_index_df['endpoint']), ['event/1/live/', 'event/1/live/', 'event/2/live/'])
+        self.assertEqual(list(archive_index_df['size_bytes']), [17, 17, 17])
+
+        # An empty archive has an empty index
+        self.assertTrue(archive.load_archive_index(os.path.join(temporary_directory, 'missing')).empty)
+
+
+    def test_read_archived_payload(self):
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+
+            archive.archive_payload(json.dumps({'season' : 'old'}).encode(), 'bootstrap-static/', temporary_directory, '2023-24', '2024-05-20T08:00:00Z')
+            archive.archive_payload(json.dumps({'season' : 'early'}).encode(), 'bootstrap-static/', temporary_directory, '2024-25', '2024-08-20T08:00:00Z')
+            archive.archive_payload(json.dumps({'season' : 'late'}).encode(), 'bootstrap-static/', temporary_directory, '2024-25', '2024-09-20T08:00:00Z')
+
+            latest_payload = archive.read_archived_payload('bootstrap-static/', temporary_directory)
+            season_payload = archive.read_archived_payload('bootstrap-static/', temporary_directory, season= '2023-24')
+
+            with self.assertRaises(ValueError):
+                archive.read_archived_payload('fixtures/', temporary_directory)
+
+            earlier_payload = archive.read_archived_payload(
+                'bootstrap-static/', temporary_directory, season= '2024-25', fetched_before= '2024-09-20T07:59:59Z'
+            )
+
+            with self.assertRaises(ValueError):
+                archive.read_archived_payload('bootstrap-static/', temporary_directory, season= '2024-25', fetched_before= '2024-08-01T00:00:00Z')
+
+            # Matched entries can be read straight from their hash
+            late_entry = archive.find_archived_entry('bootstrap-static/', temporary_directory, season= '2024-25')
+            object_payload = archive.read_archived_object(late_entry['sha256'], temporary_directory)
+
+        self.assertEqual(latest_payload, {'season' : 'late'})
+        self.assertEqual(object_payload, {'season' : 'late'})
+        self.assertEqual(season_payload, {'season' : 'old'})
+        self.assertEqual(earlier_payload, {'season' : 'early'})
+
+
+    def test_match_replay_payloads(self):
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+
+            early_hash = archive.archive_payload(b'{"elements": "early"}', 'bootstrap-static/', temporary_directory, '2024-25', '2024-08-20T08:00:00Z')
+            archive.archive_payload(b'{"events": 1}', 'event/1/live/', temporary_directory, '2024-25', '2024-08-20T08:00:05Z')
+            late_hash = archive.archive_payload(b'{"elements": "late"}', 'bootstrap-static/', temporary_directory, '2024-25', '2024-08-27T08:00:00Z')
+            archive.archive_payload(b'{"events": 2}', 'event/2/live/', temporary_directory, '2024-25', '2024-08-27T08:00:00Z')
+            archive.archive_payload(b'{"elements": "later"}', 'bootstrap-static/', temporary_directory, '2024-25', '2024-09-01T08:00:00Z')
+
+            replay_entries_dict = archive.match_replay_payloads([1, 2], temporary_directory, '2024-25')
+
+            # Gameweek 3 has no live response, so nothing is matched
+            with self.assertRaises(ValueError):
+                archive.match_replay_payloads([1, 2, 3], temporary_directory, '2024-25')
+
+        self.assertEqual(replay_entries_dict[1]['general']['sha256'], early_hash)
+        self.assertEqual(replay_entries_dict[2]['general']['sha256'], late_hash)
+        self.assertEqual(replay_entries_dict[2]['live']['fetched_at'], '2024-08-27T08:00:00Z')
+
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+import numpy as np
+import pandas as pd
+import functions.fixture_functions as fixtures
+
+
+class TestFixtureFunctions(unittest.TestCase):
+
+
+    def setUp(self):
+
+        self.general_fpl_info_dict = {
+
+            'teams' : [
+                {
+                    'id' : 1, 'name' : 'Arsenal',
+                    'strength_attack_home' : 1200, 'strength_attack_away' : 1100,
+                    'strength_defence_home' : 1300, 'strength_defence_away' : 1200
+                },
+
+                {
+                    'id' : 2, 'name' : 'Aston Villa',
+                    'strength_attack_home' : 1100, 'strength_attack_away' : 1000,
+                    'strength_defence_home' : 1100, 'strength_defence_away' : 1000
+                },
+
+                {
+                    'id' : 3, 'name' : 'Bournemouth',
+                    'strength_attack_home' : 1000, 'strength_attack_away' : 1000,
+                    'strength_defence_home' : 1000, 'strength_defence_away' : 1000
+                }
+            ]
+        }
+
+        # Bournemouth blank in gameweek 1, Arsenal have a double in gameweek 2, and one fixture is unscheduled
+        self.fixtures_list = [
+            {'event' : 1, 'team_h' : 1, 'team_a' : 2, 'team_h_difficulty' : 3, 'team_a_difficulty' : 4},
+            {'event' : 2, 'team_h' : 3, 'team_a' : 1, 'team_h_difficulty' : 4, 'team_a_difficulty' : 2},
+            {'event' : 2, 'team_h' : 1, 'team_a' : 2, 'team_h_difficulty' : 3, 'team_a_difficulty' : 4},
+            {'event' : None, 'team_h' : 2, 'team_a' : 3, 'team_h_difficulty' : 2, 'team_a_difficulty' : 3}
+        ]
+
+
+    def test_build_fixture_matrices(self):
+
+        fixture_matrices = fixtures.build_fixture_matrices(
+            fixtures_list= self.fixtures_list,
+            general_fpl_info_dict= self.general_fpl_info_dict,
+            number_of_gameweeks= 3
+        )
+
+        expected_fixture_count = np.array([[1, 2, 0], [1, 1, 0], [0, 1, 0]])
+        expected_difficulty = np.array([[3, 5, 0], [4, 4, 0], [0, 4, 0]])
+
+        np.testing.assert_array_equal(fixture_matrices['fixture_count'], expected_fixture_count)
+        np.testing.assert_array_equal(fixture_matrices['difficulty'], expected_difficulty)
+
+        # Arsenal at home to Villa, then away at Bournemouth and home to Villa in the double gameweek
+        self.assertAlmostEqual(fixture_matrices['attack'][0, 0], 1200 / 1000)
+        self.assertAlmostEqual(fixture_matrices['attack'][0, 1], 1100 / 1000 + 1200 / 1000)
+        self.assertAlmostEqual(fixture_matrices['defence'][2, 1], 1000 / 1100)
+
+
+    def test_project_team_strength(self):
+
+        fixture_matrices = fixtures.build_fixture_matrices(
+            fixtures_list= self.fixtures_list,
+            general_fpl_info_dict= self.general_fpl_info_dict,
+            number_of_gameweeks= 3
+        )
+
+        team_projection_df = fixtures.project_team_strength(
+            fixture_matrices= fixture_matrices,
+            start_gameweek= 1,
+            horizon= 2
+        )
+
+        self.assertEqual(list(team_projection_df['team_name']), ['Arsenal', 'Aston Villa', 'Bournemouth'])
+        self.assertEqual(list(team_projection_df['fixtures']), [3, 2, 1])
+        self.assertEqual(list(team_projection_df['average_difficulty']), [2.67, 4.0, 4.0])
+        self.assertAlmostEqual(team_projection_df['projected_attack'].iloc[0], 3.5)
+
+
+        # Test that a window containing no fixtures produces an empty average difficulty
+        team_projection_df = fixtures.project_team_strength(
+            fixture_matrices= fixture_matrices,
+            start_gameweek= 3,
+            horizon= 1
+        )
+
+        self.assertTrue(team_projection_df['average_difficulty'].isna().all())
+        self.assertEqual(list(team_projection_df['projected_attack']), [0.0, 0.0, 0.0])
+
+
+    def test_fixture_difficulty_dataframe(self):
+
+        fixture_matrices = fixtures.build_fixture_matrices(
+            fixtures_list= self.fixtures_list,
+            general_fpl_info_dict= self.general_fpl_info_dict,
+            number_of_gameweeks= 3
+        )
+
+        fixture_difficulty_df = fixtures.fixture_difficulty_dataframe(
+            fixture_matrices= fixture_matrices,
+            start_gameweek= 2,
+            horizon= 2
+        )
+
+        expected_dataframe = pd.DataFrame(
+            {
+                'team_name' : ['Arsenal', 'Aston Villa', 'Bournemouth'],
+                'gameweek_2' : [5, 4, 4],
+                'gameweek_3' : [0, 0, 0]
+            }
+        )
+
+        pd.testing.assert_frame_equal(fixture_difficulty_df, expected_dataframe, check_dtype= False)
+
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -1,5 +1,10 @@
+import os
+import json
 import unittest
 import requests
+import tempfile
+import tracemalloc
+import numpy as np
 import pandas as pd
 from unittest.mock import patch, Mock
 import functions.fpl_functions as fpl
@@ -32,6 +37,29 @@ class TestFplFunctions(unittest.TestCase):
 
         mock_get.assert_called_with('https://fantasy.premierleague.com/api/bootstrap-static/')
 
+
+    @patch('functions.fpl_functions.requests.get')
+    def test_retrieve_gameweek_data(self, mock_get):
+
+        mock_response_success = Mock()
+        mock_response_success.status_code = 200
+        mock_response_success.content = b'{"elements": []}'
+        mock_response_success.json.return_value = {'elements' : []}
+        mock_get.return_value = mock_response_success
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+
+            # A fetched response is archived, and replayed without calling the API again
+            api_response = fpl.retrieve_gameweek_data(5, '2024-25', archive_directory= temporary_directory)
+            replayed_response = fpl.retrieve_gameweek_data(5, '2024-25', archive_directory= temporary_directory, replay= True)
+
+            with self.assertRaises(ValueError):
+                fpl.retrieve_gameweek_data(6, '2024-25', archive_directory= temporary_directory, replay= True)
+
+        self.assertEqual(api_response, {'elements' : []})
+        self.assertEqual(replayed_response, {'elements' : []})
+        mock_get.assert_called_once_with('https://fantasy.premierleague.com/api/event/5/live/')
+
     
 
     def test_determine_current_season(self):
@@ -183,6 +211,43 @@ class TestFplFunctions(unittest.TestCase):
         pd.testing.assert_frame_equal(player_details_df, expected_dataframe)
 
     
+    def test_build_gameweek_df(self):
+
+        gameweek_dict = {
+
+            'elements' : [
+                {'id' : 351, 'stats' : {'minutes' : 90, 'influence' : '50.2', 'expected_goals' : '0.82', 'in_dreamteam' : True}, 'explain' : []},
+                {'id' : 999, 'stats' : {'minutes' : 0, 'influence' : '0.0', 'expected_goals' : '0.00', 'in_dreamteam' : False}, 'explain' : []},
+                {'id' : 328, 'stats' : {'minutes' : 90, 'influence' : '64.8', 'expected_goals' : '1.86', 'in_dreamteam' : True}, 'explain' : []}
+            ]
+        }
+
+        player_details_df = pd.DataFrame(
+            {
+                'id' : [328, 351],
+                'full_name' : ['Mohamed Salah', 'Erling Haaland'],
+                'team_name' : ['Liverpool', 'Man City'],
+                'position' : ['MID', 'FWD']
+            }
+        )
+
+        full_gameweek_df = fpl.build_gameweek_df(gameweek_dict, player_details_df)
+
+        # The output must match the original approach of building a single-row dataframe per player
+        player_dataframe_list = []
+
+        for element in gameweek_dict['elements']:
+
+            player_data_df = pd.json_normalize(element['stats'])
+            player_data_df['id'] = element['id']
+            player_dataframe_list.append(player_data_df)
+
+        expected_dataframe = pd.concat(player_dataframe_list).merge(right= player_details_df, how= 'inner', on= 'id')
+
+        pd.testing.assert_frame_equal(full_gameweek_df, expected_dataframe)
+        self.assertEqual(list(full_gameweek_df['id']), [351, 328])
+
+
     def test_attacking_score_calculation(self):
 
         input_data = {
@@ -221,6 +286,102 @@ class TestFplFunctions(unittest.TestCase):
         pd.testing.assert_frame_equal(output_dataframe, expected_dataframe)
 
 
+    def test_apply_transform_plan(self):
+
+        with open(os.path.join(os.path.dirname(__file__), 'Configuration', 'fpl_config.json')) as temporary_file:
+            config_dict = json.load(temporary_file)
+
+        number_of_players = 7000
+        rng = np.random.default_rng(0)
+
+        # Mimics the merged dataframe built from the gameweek endpoint, where several stats are returned as strings
+        merged_df = pd.DataFrame(
+            {
+                'minutes' : rng.integers(0, 91, number_of_players),
+                'goals_scored' : rng.integers(0, 3, number_of_players),
+                'assists' : rng.integers(0, 3, number_of_players),
+                'clean_sheets' : rng.integers(0, 2, number_of_players),
+                'goals_conceded' : rng.integers(0, 4, number_of_players),
+                'own_goals' : np.zeros(number_of_players, dtype= 'int64'),
+                'penalties_saved' : np.zeros(number_of_players, dtype= 'int64'),
+                'penalties_missed' : np.zeros(number_of_players, dtype= 'int64'),
+                'yellow_cards' : rng.integers(0, 2, number_of_players),
+                'red_cards' : np.zeros(number_of_players, dtype= 'int64'),
+                'saves' : rng.integers(0, 5, number_of_players),
+                'bonus' : rng.integers(0, 4, number_of_players),
+                'bps' : rng.integers(0, 40, number_of_players),
+                'influence' : [f'{x:.1f}' for x in rng.uniform(0, 80, number_of_players)],
+                'creativity' : [f'{x:.1f}' for x in rng.uniform(0, 80, number_of_players)],
+                'threat' : [f'{x:.1f}' for x in rng.uniform(0, 80, number_of_players)],
+                'ict_index' : [f'{x:.1f}' for x in rng.uniform(0, 20, number_of_players)],
+                'starts' : rng.integers(0, 2, number_of_players),
+                'expected_goals' : [f'{x:.2f}' for x in rng.uniform(0, 1.5, number_of_players)],
+                'expected_assists' : [f'{x:.2f}' for x in rng.uniform(0, 1, number_of_players)],
+                'expected_goal_involvements' : [f'{x:.2f}' for x in rng.uniform(0, 2, number_of_players)],
+                'expected_goals_conceded' : [f'{x:.2f}' for x in rng.uniform(0, 3, number_of_players)],
+                'total_points' : rng.integers(-2, 20, number_of_players),
+                'in_dreamteam' : rng.integers(0, 2, number_of_players).astype(bool),
+                'id' : np.arange(number_of_players),
+                'full_name' : [f'Player {x}' for x in range(number_of_players)],
+                'team_name' : rng.choice(['Arsenal', 'Liverpool', 'Man City'], number_of_players),
+                'position' : rng.choice(['GKP', 'DEF', 'MID', 'FWD', 'MNG'], number_of_players)
+            }
+        )
+
+        # A frozen copy of the original row-wise scoring, so the plan is compared against the old behaviour rather than
+        # against the current attacking_score_calculation
+        def goal_value_multiplier(row):
+
+            player_position = row['position']
+            goal_value = config_dict['goal_values'][player_position]
+            return row['expected_goals'] * goal_value
+
+        def transform_with_chain(dataframe):
+
+            dataframe = dataframe.drop(labels= config_dict['columns_to_drop_list'], axis= 1)
+            dataframe = dataframe[dataframe['position'] != 'MNG']
+            dataframe = dataframe.astype(config_dict['column_dtypes_mapper'])
+
+            dataframe['minutes_score'] = (dataframe['minutes'] / 90) * 2
+            dataframe['xgoals_score'] = dataframe.apply(goal_value_multiplier, axis= 1)
+            dataframe['xassist_score'] = dataframe['expected_assists'] * 3
+
+            dataframe = dataframe.astype({'minutes_score' : 'float64', 'xgoals_score' : 'float64', 'xassist_score' : 'float64'})
+
+            dataframe['attacking_score'] = dataframe['minutes_score'] + dataframe['xgoals_score'] + dataframe['xassist_score']
+            dataframe['attacking_score'] = dataframe['attacking_score'].round(2)
+            dataframe = dataframe.drop(['minutes_score', 'xgoals_score', 'xassist_score'], axis= 1)
+
+            dataframe = dataframe[config_dict['column_reordering_list']]
+
+            return dataframe
+
+        def transform_with_plan(dataframe):
+
+            transform_plan = fpl.compile_transform_plan(config_dict)
+            return fpl.apply_transform_plan(dataframe, transform_plan)
+
+        # Test that the csv output matches the original chain byte for byte
+        chain_csv = transform_with_chain(merged_df.copy()).to_csv(index= False)
+        plan_csv = transform_with_plan(merged_df.copy()).to_csv(index= False)
+
+        self.assertEqual(plan_csv, chain_csv)
+        self.assertNotIn('MNG', plan_csv)
+
+
+        # Test that the plan's peak memory is below the original chain's
+        peak_memory_dict = {}
+
+        for transform_name, transform in [('chain', transform_with_chain), ('plan', transform_with_plan)]:
+
+            tracemalloc.start()
+            transform(merged_df)
+            peak_memory_dict[transform_name] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        self.assertLess(peak_memory_dict['plan'], peak_memory_dict['chain'])
+
+
 if __name__ == '__main__':
     
     # unittest.main()
@@ -0,0 +1,125 @@
+import os
+import unittest
+import tempfile
+import pandas as pd
+from unittest.mock import patch
+import functions.leaderboard_functions as leaderboards
+import functions.season_functions as season
+
+
+class TestLeaderboardFunctions(unittest.TestCase):
+
+
+    def setUp(self):
+
+        self.config_dict = {
+            'leaderboard_metrics' : ['attacking_score', 'total_points'],
+            'leaderboard_size' : 2,
+            'season_total_columns' : ['attacking_score', 'total_points'],
+            'column_dtypes_mapper' : {'total_points' : 'int64'}
+        }
+
+        self.gameweek_1_df = pd.DataFrame(
+            {
+                'id' : [15, 36, 328, 351],
+                'full_name' : ['David Raya Martin', 'Lucas Digne', 'Mohamed Salah', 'Erling Haaland'],
+                'team_name' : ['Arsenal', 'Aston Villa', 'Liverpool', 'Man City'],
+                'position' : ['GKP', 'DEF', 'MID', 'FWD'],
+                'attacking_score' : [2.15, 3.17, 11.78, 5.37],
+                'total_points' : [6, 2, 12, 2]
+            }
+        )
+
+        self.gameweek_2_df = self.gameweek_1_df.assign(
+            attacking_score= [2.0, 3.0, 1.0, 12.0],
+            total_points= [2, 8, 2, 13]
+        )
+
+
+    def test_build_leaderboard(self):
+
+        records = [
+            (1, 'Player A', 'Arsenal', 'MID', 4.0),
+            (2, 'Player B', 'Arsenal', 'MID', 6.0),
+            (3, 'Player C', 'Liverpool', 'MID', 5.0),
+            (4, 'Player D', 'Liverpool', 'FWD', 6.0),
+            (5, 'Player E', 'Liverpool', 'FWD', float('nan'))
+        ]
+
+        leaderboard_dict = leaderboards.build_leaderboard(records, size= 2)
+
+        # Ties are broken in favour of the lower player id, and missing values are ignored
+        self.assertEqual([entry['id'] for entry in leaderboard_dict['overall']], [2, 4])
+        self.assertEqual([entry['id'] for entry in leaderboard_dict['position']['MID']], [2, 3])
+        self.assertEqual([entry['id'] for entry in leaderboard_dict['position']['FWD']], [4])
+        self.assertEqual([entry['id'] for entry in leaderboard_dict['team']['Liverpool']], [4, 3])
+
+
+    def test_update_and_query_leaderboards(self):
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+
+            leaderboards_filepath = os.path.join(temporary_directory, 'leaderboards.json')
+            leaderboards_dict = leaderboards.load_leaderboards(leaderboards_filepath)
+            season_totals_df = season.empty_season_totals(self.config_dict)
+
+            for gameweek_number, gameweek_df in [(1, self.gameweek_1_df), (2, self.gameweek_2_df)]:
+
+                season_totals_df = season.update_season_totals(season_totals_df, gameweek_df, self.config_dict)
+                leaderboards_dict = leaderboards.update_leaderboards(
+                    leaderboards_dict, gameweek_df, gameweek_number, season_totals_df, self.config_dict
+                )
+                leaderboards.save_leaderboards(leaderboards_dict, leaderboards_filepath)
+
+            leaderboards_dict = leaderboards.load_leaderboards(leaderboards_filepath)
+
+        gameweek_leaderboard = leaderboards.query_leaderboard(leaderboards_dict, 'attacking_score', gameweek= 1)
+        self.assertEqual([entry['full_name'] for entry in gameweek_leaderboard], ['Mohamed Salah', 'Erling Haaland'])
+
+        season_leaderboard = leaderboards.query_leaderboard(leaderboards_dict, 'total_points')
+        self.assertEqual([(entry['id'], entry['value']) for entry in season_leaderboard], [(351, 15.0), (328, 14.0)])
+
+        team_leaderboard = leaderboards.query_leaderboard(leaderboards_dict, 'total_points', team= 'Aston Villa')
+        self.assertEqual([(entry['id'], entry['value']) for entry in team_leaderboard], [(36, 10.0)])
+
+        position_leaderboard = leaderboards.query_leaderboard(leaderboards_dict, 'attacking_score', gameweek= 2, position= 'GKP', limit= 1)
+        self.assertEqual([entry['id'] for entry in position_leaderboard], [15])
+
+
+        # Test if correct exception is raised when the leaderboard doesn't exist
+        with self.assertRaises(ValueError):
+            leaderboards.query_leaderboard(leaderboards_dict, 'attacking_score', gameweek= 3)
+
+
+    def test_rebuild_leaderboards(self):
+
+        leaderboards_dict = leaderboards.empty_leaderboards()
+        season_totals_df = season.empty_season_totals(self.config_dict)
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+
+            for gameweek_number, gameweek_df in [(1, self.gameweek_1_df), (2, self.gameweek_2_df)]:
+
+                gameweek_df.to_csv(os.path.join(temporary_directory, f'Gameweek_{gameweek_number}.csv'), index= False)
+                season_totals_df = season.update_season_totals(season_totals_df, gameweek_df, self.config_dict)
+                leaderboards_dict = leaderboards.update_leaderboards(
+                    leaderboards_dict, gameweek_df, gameweek_number, season_totals_df, self.config_dict
+                )
+
+            # The season leaderboards are built once, rather than once per gameweek
+            with patch('functions.leaderboard_functions.update_season_leaderboards', wraps= leaderboards.update_season_leaderboards) as mock_update_season_leaderboards:
+                rebuilt_leaderboards_dict = leaderboards.rebuild_leaderboards(temporary_directory, [1, 2], season_totals_df, self.config_dict)
+
+            mock_update_season_leaderboards.assert_called_once()
+
+            leaderboards.save_leaderboards(rebuilt_leaderboards_dict, os.path.join(temporary_directory, 'leaderboards.json'))
+            directory_contents_list = sorted(os.listdir(temporary_directory))
+
+        self.assertEqual(rebuilt_leaderboards_dict, leaderboards_dict)
+        self.assertEqual(leaderboards.rebuild_leaderboards(temporary_directory, [], season_totals_df, self.config_dict), {'gameweeks' : {}, 'season' : {}})
+        self.assertEqual(directory_contents_list, ['Gameweek_1.csv', 'Gameweek_2.csv', 'leaderboards.json'])
+
+
+if __name__ == '__main__':
+
+    unittest.main()
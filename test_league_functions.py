@@ -0,0 +1,144 @@
+import os
+import unittest
+import tempfile
+import numpy as np
+from unittest.mock import patch, Mock
+import functions.league_functions as leagues
+from functions.fpl_functions import APIError
+
+
+class TestLeagueFunctions(unittest.TestCase):
+
+
+    @patch('functions.league_functions.time.sleep')
+    @patch('functions.league_functions.requests.Session')
+    def test_fetch_json(self, mock_session_class, mock_sleep):
+
+        # A rate limited request is retried before succeeding
+        mock_response_limited = Mock(status_code= 429, headers= {'Retry-After' : '1'})
+        mock_response_success = Mock(status_code= 200, headers= {})
+        mock_response_success.json.return_value = {'key' : 'value'}
+
+        mock_session_class.return_value.get.side_effect = [mock_response_limited, mock_response_success]
+
+        if hasattr(leagues.THREAD_LOCAL_STORAGE, 'session'):
+            del leagues.THREAD_LOCAL_STORAGE.session
+
+        else:
+            pass
+
+        self.assertEqual(leagues.fetch_json('https://example.com'), {'key' : 'value'})
+        mock_sleep.assert_called_once_with(1.0)
+
+
+        # Test an unsuccessful API call
+        mock_response_error = Mock(status_code= 404, headers= {})
+        mock_response_error.raise_for_status.side_effect = leagues.requests.exceptions.HTTPError
+        mock_session_class.return_value.get.side_effect = [mock_response_error]
+
+        with self.assertRaises(APIError) as api_error_context:
+            leagues.fetch_json('https://example.com')
+
+        self.assertEqual(api_error_context.exception.status_code, 404)
+
+
+        # Connection failures and timeouts are retried, as is a server error with a Retry-After date
+        mock_response_unavailable = Mock(status_code= 503, headers= {'Retry-After' : 'Wed, 21 Oct 2015 07:28:00 GMT'})
+        mock_session_class.return_value.get.side_effect = [
+            leagues.requests.exceptions.ConnectionError('reset'),
+            leagues.requests.exceptions.Timeout('timed out'),
+            mock_response_unavailable,
+            mock_response_success
+        ]
+        mock_sleep.reset_mock()
+
+        self.assertEqual(leagues.fetch_json('https://example.com'), {'key' : 'value'})
+        self.assertEqual([call.args[0] for call in mock_sleep.call_args_list], [1, 2, 0])
+
+        # A connection that keeps failing raises an APIError without a response code
+        mock_session_class.return_value.get.side_effect = leagues.requests.exceptions.ConnectionError('reset')
+
+        with self.assertRaises(APIError) as api_error_context:
+            leagues.fetch_json('https://example.com', max_retries= 1)
+
+        self.assertIsNone(api_error_context.exception.status_code)
+
+        del leagues.THREAD_LOCAL_STORAGE.session
+
+
+    @patch('functions.league_functions.fetch_json')
+    def test_retrieve_league_standings(self, mock_fetch_json):
+
+        mock_fetch_json.side_effect = [
+            {'standings' : {'has_next' : True, 'results' : [{'entry' : 1, 'entry_name' : 'A', 'player_name' : 'Ann', 'rank' : 1, 'total' : 80}]}},
+            {'standings' : {'has_next' : False, 'results' : [{'entry' : 2, 'entry_name' : 'B', 'player_name' : 'Bob', 'rank' : 2, 'total' : 70}]}}
+        ]
+
+        league_standings_df = leagues.retrieve_league_standings(league_id= 314)
+
+        self.assertEqual(list(league_standings_df['entry']), [1, 2])
+        mock_fetch_json.assert_called_with('https://fantasy.premierleague.com/api/leagues-classic/314/standings/?page_standings=2')
+
+
+    @patch('functions.league_functions.fetch_json')
+    def test_retrieve_league_picks(self, mock_fetch_json):
+
+        def fake_fetch_json(url):
+
+            entry_id = int(url.split('/entry/')[1].split('/')[0])
+
+            if entry_id == 3:
+                raise APIError(f'Response Code: 404 - {url}', status_code= 404)
+
+            else:
+                pass
+
+            picks_list = [{'element' : element, 'multiplier' : 1} for element in range(entry_id, entry_id + 15)]
+            picks_list[0]['multiplier'] = 2
+            picks_list[-1]['multiplier'] = 0
+
+            return {'picks' : picks_list, 'active_chip' : None}
+
+        mock_fetch_json.side_effect = fake_fetch_json
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+
+            league_picks_dict = leagues.retrieve_league_picks([1, 2, 3], 5, temporary_directory, max_workers= 2)
+            first_call_count = mock_fetch_json.call_count
+
+            # Cached picks are not requested again
+            leagues.retrieve_league_picks([1, 2], 5, temporary_directory, max_workers= 2)
+            cached_files_list = sorted(os.listdir(os.path.join(temporary_directory, 'gameweek_5')))
+
+        self.assertEqual(first_call_count, 3)
+        self.assertEqual(mock_fetch_json.call_count, 3)
+        self.assertEqual(cached_files_list, ['1.json', '2.json'])
+
+        self.assertEqual(list(league_picks_dict['entry_ids']), [1, 2])
+        self.assertEqual(league_picks_dict['picks'].shape, (2, 15))
+        self.assertEqual(league_picks_dict['picks'].dtype, 'int32')
+        self.assertEqual(league_picks_dict['multipliers'].dtype, 'int8')
+        self.assertEqual(list(league_picks_dict['picks'][1, :3]), [2, 3, 4])
+
+
+    def test_calculate_effective_ownership(self):
+
+        league_picks_dict = {
+            'entry_ids' : np.array([1, 2, 3, 4]),
+            'picks' : np.array([[10, 20, 30], [10, 20, 40], [10, 30, 40], [20, 30, 40]], dtype= 'int32'),
+            'multipliers' : np.array([[2, 1, 0], [3, 1, 1], [1, 2, 0], [1, 1, 2]], dtype= 'int8')
+        }
+
+        effective_ownership_df = leagues.calculate_effective_ownership(league_picks_dict).set_index('id')
+
+        self.assertEqual(list(effective_ownership_df.index), [10, 20, 30, 40])
+        self.assertEqual(effective_ownership_df.loc[10, 'ownership'], 75.0)
+        self.assertEqual(effective_ownership_df.loc[10, 'captaincy'], 50.0)
+        self.assertEqual(effective_ownership_df.loc[10, 'effective_ownership'], 150.0)
+        self.assertEqual(effective_ownership_df.loc[30, 'starting_ownership'], 50.0)
+        self.assertEqual(effective_ownership_df.loc[40, 'effective_ownership'], 75.0)
+
+
+if __name__ == '__main__':
+
+    unittest.main()
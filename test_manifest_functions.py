@@ -0,0 +1,137 @@
+import os
+import unittest
+import tempfile
+import pandas as pd
+import functions.manifest_functions as manifest
+
+
+class TestManifestFunctions(unittest.TestCase):
+
+
+    def setUp(self):
+
+        self.gameweek_df = pd.DataFrame(
+            {
+                'full_name' : ['Mohamed Salah', 'Erling Haaland'],
+                'total_points' : [12, 2],
+                'id' : [328, 351]
+            }
+        )
+
+        self.schema_version = manifest.calculate_schema_version(['full_name', 'total_points', 'id'])
+
+
+    def test_write_gameweek_file(self):
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+
+            manifest_dict = manifest.write_gameweek_file(self.gameweek_df, 1, temporary_directory, manifest.load_manifest(temporary_directory))
+            saved_manifest_dict = manifest.load_manifest(temporary_directory)
+            written_df = pd.read_csv(os.path.join(temporary_directory, 'Gameweek_1.csv'))
+            directory_contents_list = sorted(os.listdir(temporary_directory))
+
+        manifest_entry = saved_manifest_dict['outputs']['Gameweek_1.csv']
+
+        self.assertEqual(manifest_dict, saved_manifest_dict)
+        self.assertEqual(directory_contents_list, ['Gameweek_1.csv', 'manifest.json'])
+        self.assertEqual(manifest_entry['gameweek'], 1)
+        self.assertEqual(manifest_entry['row_count'], 2)
+        self.assertEqual(manifest_entry['schema_version'], self.schema_version)
+        self.assertEqual(len(manifest_entry['sha256']), 64)
+        pd.testing.assert_frame_equal(written_df, self.gameweek_df)
+
+
+    def test_find_gameweeks_to_process(self):
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+
+            manifest_dict = manifest.load_manifest(temporary_directory)
+
+            for gameweek_number in [1, 2, 3, 4]:
+                manifest.write_gameweek_file(self.gameweek_df, gameweek_number, temporary_directory, manifest_dict)
+
+            # Gameweek 2 is deleted, gameweek 3 is truncated and gameweek 4 is changed without its size changing
+            os.remove(os.path.join(temporary_directory, 'Gameweek_2.csv'))
+
+            with open(os.path.join(temporary_directory, 'Gameweek_3.csv'), 'a') as temporary_file:
+                temporary_file.write('partial')
+
+            with open(os.path.join(temporary_directory, 'Gameweek_4.csv'), 'r+') as temporary_file:
+                temporary_file.write('F')
+
+            gameweeks_to_process_list = manifest.find_gameweeks_to_process(
+                manifest_dict, temporary_directory, [1, 2, 3, 4, 5], self.schema_version
+            )
+
+            verified_gameweeks_to_process_list = manifest.find_gameweeks_to_process(
+                manifest_dict, temporary_directory, [1, 2, 3, 4, 5], self.schema_version, verify_checksums= True
+            )
+
+            # Files written under a different column configuration are all out of date
+            changed_schema_gameweeks_list = manifest.find_gameweeks_to_process(
+                manifest_dict, temporary_directory, [1], manifest.calculate_schema_version(['id'])
+            )
+
+        self.assertEqual(gameweeks_to_process_list, [2, 3, 5])
+        self.assertEqual(verified_gameweeks_to_process_list, [2, 3, 4, 5])
+        self.assertEqual(changed_schema_gameweeks_list, [1])
+
+
+    def test_adopt_untracked_files(self):
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+
+            self.gameweek_df.to_csv(os.path.join(temporary_directory, 'Gameweek_7.csv'), index= False)
+            self.gameweek_df.to_csv(os.path.join(temporary_directory, 'season_totals.csv'), index= False)
+
+            manifest_dict = manifest.load_manifest(temporary_directory)
+            adopted_gameweeks_list = manifest.adopt_untracked_files(manifest_dict, temporary_directory)
+            repeat_adopted_gameweeks_list = manifest.adopt_untracked_files(manifest_dict, temporary_directory)
+
+            gameweeks_to_process_list = manifest.find_gameweeks_to_process(
+                manifest_dict, temporary_directory, [7], self.schema_version
+            )
+
+        self.assertEqual(adopted_gameweeks_list, [7])
+        self.assertEqual(repeat_adopted_gameweeks_list, [])
+        self.assertEqual(manifest_dict['outputs']['Gameweek_7.csv']['row_count'], 2)
+        self.assertEqual(gameweeks_to_process_list, [])
+
+
+    def test_summary_file_is_current(self):
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+
+            manifest_dict = manifest.load_manifest(temporary_directory)
+
+            for gameweek_number in [1, 2]:
+                manifest.write_gameweek_file(self.gameweek_df, gameweek_number, temporary_directory, manifest_dict)
+
+            self.gameweek_df.to_csv(os.path.join(temporary_directory, 'season_totals.csv'), index= False)
+
+            unrecorded_is_current = manifest.summary_file_is_current(manifest_dict, temporary_directory, 'season_totals.csv', [1, 2])
+            manifest.record_summary_file(manifest_dict, temporary_directory, 'season_totals.csv', [1, 2])
+            recorded_is_current = manifest.summary_file_is_current(
+                manifest.load_manifest(temporary_directory), temporary_directory, 'season_totals.csv', [1, 2]
+            )
+
+            # A new gameweek, or a rewritten one, is not yet included in the summary
+            new_gameweek_is_current = manifest.summary_file_is_current(manifest_dict, temporary_directory, 'season_totals.csv', [1, 2, 3])
+            manifest.write_gameweek_file(self.gameweek_df.assign(total_points= [1, 1]), 2, temporary_directory, manifest_dict)
+            rewritten_gameweek_is_current = manifest.summary_file_is_current(manifest_dict, temporary_directory, 'season_totals.csv', [1, 2])
+
+            # A summary file changed since it was recorded is also out of date
+            manifest.record_summary_file(manifest_dict, temporary_directory, 'season_totals.csv', [1, 2])
+            self.gameweek_df.head(1).to_csv(os.path.join(temporary_directory, 'season_totals.csv'), index= False)
+            changed_summary_is_current = manifest.summary_file_is_current(manifest_dict, temporary_directory, 'season_totals.csv', [1, 2])
+
+        self.assertFalse(unrecorded_is_current)
+        self.assertTrue(recorded_is_current)
+        self.assertFalse(new_gameweek_is_current)
+        self.assertFalse(rewritten_gameweek_is_current)
+        self.assertFalse(changed_summary_is_current)
+
+
+if __name__ == '__main__':
+
+    unittest.main()
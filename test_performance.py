@@ -0,0 +1,417 @@
+import gc
+import os
+import json
+import time
+import unittest
+import tracemalloc
+import numpy as np
+import pandas as pd
+import functions.fpl_functions as fpl
+import functions.price_functions as prices
+import functions.league_functions as leagues
+import functions.season_functions as season
+import functions.fixture_functions as fixtures
+import functions.projection_functions as projection
+import functions.similarity_functions as similarity
+import functions.simulation_functions as simulation
+import functions.leaderboard_functions as leaderboards
+
+
+# The performance tier is slower than the correctness tests, so only runs when requested:
+#   FPL_RUN_PERFORMANCE_TESTS=1 python -m pytest test_performance.py
+# After an intentional change in performance, the stored baseline is refreshed with:
+#   FPL_UPDATE_PERFORMANCE_BASELINE=1 python -m pytest test_performance.py
+RUN_PERFORMANCE_TESTS = os.environ.get('FPL_RUN_PERFORMANCE_TESTS') == '1'
+UPDATE_PERFORMANCE_BASELINE = os.environ.get('FPL_UPDATE_PERFORMANCE_BASELINE') == '1'
+
+PERFORMANCE_BASELINE_FILEPATH = os.path.join(os.path.dirname(__file__), 'performance_baseline.json')
+CONFIG_JSON_FILEPATH = os.path.join(os.path.dirname(__file__), 'Configuration', 'fpl_config.json')
+
+# Times are allowed to grow by this factor over the baseline, and peak memory by this factor
+TIME_TOLERANCE = float(os.environ.get('FPL_PERFORMANCE_TIME_TOLERANCE', 2.0))
+MEMORY_TOLERANCE = float(os.environ.get('FPL_PERFORMANCE_MEMORY_TOLERANCE', 1.5))
+
+# Very fast functions are dominated by timer noise, so every budget includes a small fixed allowance
+TIME_ALLOWANCE_UNITS = 0.05
+MEMORY_ALLOWANCE_BYTES = 256 * 1024
+
+# Going from production to 10x scale should cost roughly 10x, a quadratic function would cost roughly 100x
+MAXIMUM_SCALING_FACTOR = 40
+
+PRODUCTION_NUMBER_OF_PLAYERS = 800
+SCALES_LIST = [1, 10]
+
+STAT_COLUMNS_LIST = [
+    'minutes', 'goals_scored', 'assists', 'clean_sheets', 'goals_conceded', 'own_goals', 'penalties_saved',
+    'penalties_missed', 'yellow_cards', 'red_cards', 'saves', 'bonus', 'bps', 'influence', 'creativity', 'threat',
+    'ict_index', 'starts', 'expected_goals', 'expected_assists', 'expected_goal_involvements', 'expected_goals_conceded',
+    'total_points', 'in_dreamteam'
+]
+
+STRING_STAT_COLUMNS_LIST = [
+    'influence', 'creativity', 'threat', 'ict_index', 'expected_goals', 'expected_assists',
+    'expected_goal_involvements', 'expected_goals_conceded'
+]
+
+
+def generate_general_fpl_info_dict(
+        number_of_players: int,
+        number_of_teams: int,
+        rng: np.random.Generator
+    ) -> dict:
+
+    '''Generates a synthetic response from the general information endpoint'''
+
+    general_fpl_info_dict = {
+
+        'elements' : [
+            {
+                'id' : player_id,
+                'team' : int(rng.integers(1, number_of_teams + 1)),
+                'element_type' : int(rng.choice([1, 2, 3, 4, 5], p= [0.1, 0.3, 0.35, 0.2, 0.05])),
+                'first_name' : f'First{player_id}',
+                'second_name' : f'Second{player_id}',
+                'now_cost' : int(rng.integers(40, 150)),
+                'transfers_in_event' : int(rng.integers(0, 200000)),
+                'transfers_out_event' : int(rng.integers(0, 200000)),
+                'selected_by_percent' : f'{rng.uniform(0, 60):.1f}'
+            }
+            for player_id in range(1, number_of_players + 1)
+        ],
+
+        'teams' : [
+            {
+                'id' : team_id,
+                'name' : f'Team {team_id}',
+                'strength_attack_home' : int(rng.integers(1000, 1400)),
+                'strength_attack_away' : int(rng.integers(1000, 1400)),
+                'strength_defence_home' : int(rng.integers(1000, 1400)),
+                'strength_defence_away' : int(rng.integers(1000, 1400))
+            }
+            for team_id in range(1, number_of_teams + 1)
+        ],
+
+        'element_types' : [
+            {'id' : 1, 'singular_name_short' : 'GKP'},
+            {'id' : 2, 'singular_name_short' : 'DEF'},
+            {'id' : 3, 'singular_name_short' : 'MID'},
+            {'id' : 4, 'singular_name_short' : 'FWD'},
+            {'id' : 5, 'singular_name_short' : 'MNG'}
+        ],
+
+        'total_players' : 10000000
+    }
+
+    return general_fpl_info_dict
+
+
+def generate_gameweek_dict(
+        number_of_players: int,
+        rng: np.random.Generator
+    ) -> dict:
+
+    '''Generates a synthetic response from the gameweek endpoint'''
+
+    gameweek_dict = {'elements' : []}
+
+    for player_id in range(1, number_of_players + 1):
+
+        stats_dict = {column : int(rng.integers(0, 5)) for column in STAT_COLUMNS_LIST}
+        stats_dict.update({column : f'{rng.uniform(0, 2):.2f}' for column in STRING_STAT_COLUMNS_LIST})
+        stats_dict.update(minutes= int(rng.integers(0, 91)), in_dreamteam= bool(rng.integers(0, 2)))
+
+        gameweek_dict['elements'].append({'id' : player_id, 'stats' : stats_dict, 'explain' : []})
+
+    return gameweek_dict
+
+
+def generate_fixtures_list(
+        number_of_teams: int,
+        rng: np.random.Generator
+    ) -> list:
+
+    '''Generates a synthetic response from the fixtures endpoint, with each team playing once per gameweek'''
+
+    fixtures_list = []
+
+    for gameweek in range(1, 39):
+
+        shuffled_team_ids = rng.permutation(np.arange(1, number_of_teams + 1))
+
+        for home_team_id, away_team_id in zip(shuffled_team_ids[0::2], shuffled_team_ids[1::2]):
+
+            fixtures_list.append(
+                {
+                    'event' : gameweek,
+                    'team_h' : int(home_team_id),
+                    'team_a' : int(away_team_id),
+                    'team_h_difficulty' : int(rng.integers(1, 6)),
+                    'team_a_difficulty' : int(rng.integers(1, 6))
+                }
+            )
+
+    return fixtures_list
+
+
+def prepare_performance_cases(
+        scale: int,
+        config_dict: dict
+    ) -> dict:
+
+    '''
+    Builds synthetic inputs at the given multiple of production scale, and returns a zero-argument callable for each
+    function covered by the performance tier.
+    '''
+
+    rng = np.random.default_rng(scale)
+    number_of_players = PRODUCTION_NUMBER_OF_PLAYERS * scale
+    number_of_teams = 20 * scale
+
+    general_fpl_info_dict = generate_general_fpl_info_dict(number_of_players, number_of_teams, rng)
+    gameweek_dict = generate_gameweek_dict(number_of_players, rng)
+    fixtures_list = generate_fixtures_list(number_of_teams, rng)
+
+    player_details_df = fpl.prepare_player_details_df(general_fpl_info_dict, config_dict)
+    merged_gameweek_df = fpl.build_gameweek_df(gameweek_dict, player_details_df)
+
+    transform_plan = fpl.compile_transform_plan(config_dict)
+    gameweek_df = fpl.apply_transform_plan(merged_gameweek_df, transform_plan)
+
+    fixture_matrices = fixtures.build_fixture_matrices(fixtures_list, general_fpl_info_dict)
+    player_rates_df = projection.calculate_per_90_rates(gameweek_df.assign(gameweek= 1))
+
+    season_totals_df = season.update_season_totals(season.empty_season_totals(config_dict), gameweek_df, config_dict)
+
+    price_snapshot_df = prices.prepare_price_snapshot(general_fpl_info_dict, config_dict, '2024-10-28 08:00:00')
+    next_price_snapshot_df = price_snapshot_df.assign(
+        now_cost= price_snapshot_df['now_cost'] + rng.choice([-0.1, 0, 0.1], number_of_players)
+    )
+
+    number_of_managers = 1000 * scale
+    league_picks_dict = {
+        'entry_ids' : np.arange(number_of_managers),
+        'picks' : rng.integers(1, number_of_players + 1, (number_of_managers, 15)).astype('int32'),
+        'multipliers' : rng.choice([0, 1, 2], (number_of_managers, 15), p= [0.25, 0.7, 0.05]).astype('int8')
+    }
+
+    feature_matrix_dict = similarity.build_feature_matrix(gameweek_df.assign(gameweek= 1), dict(config_dict, similarity_minimum_minutes= 1))
+    query_ids = list(feature_matrix_dict['ids'][:5])
+
+    performance_cases = {
+        'build_gameweek_df' : lambda: fpl.build_gameweek_df(gameweek_dict, player_details_df),
+        'prepare_player_details_df' : lambda: fpl.prepare_player_details_df(general_fpl_info_dict, config_dict),
+        'apply_transform_plan' : lambda: fpl.apply_transform_plan(merged_gameweek_df, transform_plan),
+        'attacking_score_calculation' : lambda: fpl.attacking_score_calculation(gameweek_df.copy(), config_dict),
+        'build_fixture_matrices' : lambda: fixtures.build_fixture_matrices(fixtures_list, general_fpl_info_dict),
+        'project_player_points' : lambda: projection.project_player_points(player_rates_df, fixture_matrices, config_dict, 1, 6),
+        'simulate_gameweek_points' : lambda: simulation.simulate_gameweek_points(
+            player_rates_df, fixture_matrices, config_dict, 1, 250, random_seed= 0, team_correlation= True, max_workers= 1
+        ),
+        'update_season_totals' : lambda: season.update_season_totals(season_totals_df, gameweek_df, config_dict),
+        'update_leaderboards' : lambda: leaderboards.update_leaderboards(
+            leaderboards.empty_leaderboards(), gameweek_df, 1, season_totals_df, config_dict
+        ),
+        'price_tracking' : lambda: (
+            prices.diff_price_snapshots(price_snapshot_df, next_price_snapshot_df),
+            prices.predict_price_changes(next_price_snapshot_df, 10000000, 20)
+        ),
+        'calculate_effective_ownership' : lambda: leagues.calculate_effective_ownership(league_picks_dict),
+        'find_similar_players' : lambda: similarity.find_similar_players(feature_matrix_dict, query_ids, 10)
+    }
+
+    return performance_cases
+
+
+def calibration_workload():
+
+    '''A fixed mix of interpreted and vectorised work, used to express timings independently of the machine speed'''
+
+    total = 0
+
+    for x in range(200000):
+        total += x * x
+
+    np.sort(np.random.default_rng(0).random(500000))
+    pd.DataFrame({'a' : np.arange(200000) % 100, 'b' : np.arange(200000)}).groupby('a')['b'].sum()
+
+
+def measure_best_time(
+        function,
+        repeats: int
+    ) -> float:
+
+    '''Returns the fastest of several timed calls, after an untimed warm-up call, with garbage collection paused as in timeit'''
+
+    function()
+    timings_list = []
+    gc.disable()
+
+    try:
+
+        for _ in range(repeats):
+
+            start_time = time.perf_counter()
+            function()
+            timings_list.append(time.perf_counter() - start_time)
+
+    finally:
+        gc.enable()
+
+    return min(timings_list)
+
+
+def measure_peak_memory(function) -> int:
+
+    '''Returns the peak memory allocated during a single call, in bytes'''
+
+    tracemalloc.start()
+
+    try:
+        function()
+        peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+
+    finally:
+        tracemalloc.stop()
+
+    return peak_memory_bytes
+
+
+@unittest.skipUnless(
+    RUN_PERFORMANCE_TESTS or UPDATE_PERFORMANCE_BASELINE,
+    'Set FPL_RUN_PERFORMANCE_TESTS=1 to run the performance tier'
+)
+class TestPerformance(unittest.TestCase):
+
+
+    @classmethod
+    def setUpClass(cls):
+
+        with open(CONFIG_JSON_FILEPATH) as temporary_file:
+            cls.config_dict = json.load(temporary_file)
+
+        if os.path.exists(PERFORMANCE_BASELINE_FILEPATH):
+
+            with open(PERFORMANCE_BASELINE_FILEPATH) as temporary_file:
+                cls.performance_baseline_dict = json.load(temporary_file)
+
+        else:
+            cls.performance_baseline_dict = {'cases' : {}}
+
+        cls.calibration_seconds = measure_best_time(calibration_workload, repeats= 5)
+        cls.performance_cases_by_scale = {scale : prepare_performance_cases(scale, cls.config_dict) for scale in SCALES_LIST}
+
+
+    @classmethod
+    def tearDownClass(cls):
+
+        if UPDATE_PERFORMANCE_BASELINE:
+
+            with open(PERFORMANCE_BASELINE_FILEPATH, 'w') as temporary_file:
+                json.dump(cls.performance_baseline_dict, temporary_file, indent= 4, sort_keys= True)
+
+        else:
+            pass
+
+
+    def check_performance(self, case_name: str):
+
+        '''Measures a function at each scale, and compares it against its stored baseline'''
+
+        measurements_dict = {}
+
+        for scale in SCALES_LIST:
+
+            function = self.performance_cases_by_scale[scale][case_name]
+
+            measurements_dict[str(scale)] = {
+                'time_units' : round(measure_best_time(function, repeats= 5 if scale == 1 else 3) / self.calibration_seconds, 4),
+                'peak_memory_bytes' : measure_peak_memory(function)
+            }
+
+        if UPDATE_PERFORMANCE_BASELINE:
+
+            self.performance_baseline_dict['cases'][case_name] = measurements_dict
+            return
+
+        else:
+            pass
+
+        baseline_dict = self.performance_baseline_dict['cases'].get(case_name)
+
+        if baseline_dict is None:
+            self.fail(f'{case_name} has no stored baseline, run with FPL_UPDATE_PERFORMANCE_BASELINE=1 to record one')
+
+        else:
+            pass
+
+        for scale in SCALES_LIST:
+
+            measured = measurements_dict[str(scale)]
+            baseline = baseline_dict[str(scale)]
+
+            time_budget = baseline['time_units'] * TIME_TOLERANCE + TIME_ALLOWANCE_UNITS
+            memory_budget = baseline['peak_memory_bytes'] * MEMORY_TOLERANCE + MEMORY_ALLOWANCE_BYTES
+
+            self.assertLessEqual(
+                measured['time_units'],
+                time_budget,
+                f'{case_name} at {scale}x scale took {measured["time_units"]:.4f} calibration units, over its budget of '
+                f'{time_budget:.4f} (baseline {baseline["time_units"]:.4f} x {TIME_TOLERANCE} tolerance)'
+            )
+
+            self.assertLessEqual(
+                measured['peak_memory_bytes'],
+                memory_budget,
+                f'{case_name} at {scale}x scale peaked at {measured["peak_memory_bytes"]:,} bytes, over its budget of '
+                f'{memory_budget:,.0f} (baseline {baseline["peak_memory_bytes"]:,} x {MEMORY_TOLERANCE} tolerance)'
+            )
+
+        scaling_factor = measurements_dict['10']['time_units'] / max(measurements_dict['1']['time_units'], 1e-9)
+
+        self.assertLessEqual(
+            scaling_factor,
+            MAXIMUM_SCALING_FACTOR,
+            f'{case_name} took {scaling_factor:.1f}x longer at 10x scale, suggesting worse than linear growth'
+        )
+
+
+    def test_build_gameweek_df(self):
+        self.check_performance('build_gameweek_df')
+
+    def test_prepare_player_details_df(self):
+        self.check_performance('prepare_player_details_df')
+
+    def test_apply_transform_plan(self):
+        self.check_performance('apply_transform_plan')
+
+    def test_attacking_score_calculation(self):
+        self.check_performance('attacking_score_calculation')
+
+    def test_build_fixture_matrices(self):
+        self.check_performance('build_fixture_matrices')
+
+    def test_project_player_points(self):
+        self.check_performance('project_player_points')
+
+    def test_simulate_gameweek_points(self):
+        self.check_performance('simulate_gameweek_points')
+
+    def test_update_season_totals(self):
+        self.check_performance('update_season_totals')
+
+    def test_update_leaderboards(self):
+        self.check_performance('update_leaderboards')
+
+    def test_price_tracking(self):
+        self.check_performance('price_tracking')
+
+    def test_calculate_effective_ownership(self):
+        self.check_performance('calculate_effective_ownership')
+
+    def test_find_similar_players(self):
+        self.check_performance('find_similar_players')
+
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import functions.price_functions as prices
+
+
+class TestPriceFunctions(unittest.TestCase):
+
+
+    def setUp(self):
+
+        self.config_dict = {
+            'price_snapshot_columns_list' : ['id', 'now_cost', 'transfers_in_event', 'transfers_out_event', 'selected_by_percent']
+        }
+
+        self.general_fpl_info_dict = {
+
+            'events' : [{'id' : 9, 'is_current' : False}, {'id' : 10, 'is_current' : True}],
+
+            'elements' : [
+                {'id' : 351, 'now_cost' : 151, 'transfers_in_event' : 50000, 'transfers_out_event' : 1000, 'selected_by_percent' : '60.0', 'web_name' : 'Haaland'},
+                {'id' : 328, 'now_cost' : 131, 'transfers_in_event' : 2000, 'transfers_out_event' : 90000, 'selected_by_percent' : '45.0', 'web_name' : 'M.Salah'},
+                {'id' : 15, 'now_cost' : 55, 'transfers_in_event' : 30000, 'transfers_out_event' : 100, 'selected_by_percent' : '5.0', 'web_name' : 'Raya'},
+                {'id' : 36, 'now_cost' : 45, 'transfers_in_event' : 0, 'transfers_out_event' : 0, 'selected_by_percent' : '0.0', 'web_name' : 'Digne'}
+            ]
+        }
+
+
+    def test_prepare_price_snapshot(self):
+
+        price_snapshot_df = prices.prepare_price_snapshot(self.general_fpl_info_dict, self.config_dict, '2024-10-28 08:00:00')
+
+        self.assertEqual(list(price_snapshot_df['id']), [15, 36, 328, 351])
+        self.assertEqual(list(price_snapshot_df['now_cost']), [5.5, 4.5, 13.1, 15.1])
+        self.assertEqual(price_snapshot_df['selected_by_percent'].dtype, 'float64')
+        self.assertNotIn('web_name', price_snapshot_df.columns)
+
+
+    def test_diff_price_snapshots(self):
+
+        previous_snapshot_df = prices.prepare_price_snapshot(self.general_fpl_info_dict, self.config_dict, '2024-10-28 08:00:00')
+
+        # Raya rises, Salah falls, Digne leaves the game and a new player is added
+        self.general_fpl_info_dict['elements'][2].update(now_cost= 56, transfers_in_event= 45000)
+        self.general_fpl_info_dict['elements'][1].update(now_cost= 130)
+        self.general_fpl_info_dict['elements'][3].update(id= 700, now_cost= 50)
+
+        current_snapshot_df = prices.prepare_price_snapshot(self.general_fpl_info_dict, self.config_dict, '2024-10-28 12:00:00')
+        price_changes_df = prices.diff_price_snapshots(previous_snapshot_df, current_snapshot_df)
+
+        self.assertEqual(list(price_changes_df['id']), [15, 328])
+        self.assertEqual(list(price_changes_df['cost_change']), [0.1, -0.1])
+        self.assertEqual(list(price_changes_df['net_transfers_between_snapshots']), [15000, 0])
+        self.assertEqual(list(price_changes_df['previous_snapshot_time']), ['2024-10-28 08:00:00'] * 2)
+
+
+    def test_predict_price_changes(self):
+
+        price_snapshot_df = prices.prepare_price_snapshot(self.general_fpl_info_dict, self.config_dict, '2024-10-28 08:00:00')
+        price_predictions_df = prices.predict_price_changes(price_snapshot_df, total_players= 1000000, prediction_size= 1)
+
+        # Raya's transfers are small in number but large relative to his ownership
+        self.assertEqual(list(price_predictions_df['id']), [15, 328])
+        self.assertEqual(list(price_predictions_df['direction']), ['rise', 'fall'])
+
+
+    def test_diff_price_snapshots_edge_cases(self):
+
+        current_snapshot_df = prices.prepare_price_snapshot(self.general_fpl_info_dict, self.config_dict, '2024-10-28 12:00:00')
+
+        # An empty previous snapshot has no price changes
+        empty_changes_df = prices.diff_price_snapshots(current_snapshot_df.iloc[0:0], current_snapshot_df)
+
+        # Transfer counts reset at the deadline, so net transfers are not compared across gameweeks
+        previous_snapshot_df = current_snapshot_df.assign(now_cost= current_snapshot_df['now_cost'] - 0.1, event= 9)
+        deadline_changes_df = prices.diff_price_snapshots(previous_snapshot_df, current_snapshot_df)
+
+        # The config can add columns to the snapshot, but cannot remove the ones price tracking needs
+        narrow_snapshot_df = prices.prepare_price_snapshot(
+            self.general_fpl_info_dict, {'price_snapshot_columns_list' : ['id', 'now_cost']}, '2024-10-28 12:00:00'
+        )
+        wide_snapshot_df = prices.prepare_price_snapshot(
+            self.general_fpl_info_dict, {'price_snapshot_columns_list' : ['web_name']}, '2024-10-28 12:00:00'
+        )
+
+        self.assertTrue(empty_changes_df.empty)
+        self.assertIn('net_transfers_between_snapshots', empty_changes_df.columns)
+        self.assertEqual(list(deadline_changes_df['id']), [15, 36, 328, 351])
+        self.assertTrue(deadline_changes_df['net_transfers_between_snapshots'].isna().all())
+        self.assertEqual(list(narrow_snapshot_df.columns), list(current_snapshot_df.columns))
+        self.assertEqual(
+            list(wide_snapshot_df.columns),
+            ['id', 'now_cost', 'transfers_in_event', 'transfers_out_event', 'selected_by_percent', 'web_name', 'snapshot_time', 'event']
+        )
+
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+import numpy as np
+import pandas as pd
+import functions.projection_functions as projection
+
+
+class TestProjectionFunctions(unittest.TestCase):
+
+
+    def setUp(self):
+
+        self.config_dict = {
+            'goal_values' : {'GKP' : 15, 'DEF' : 6, 'MID' : 5, 'FWD' : 4},
+            'clean_sheet_values' : {'GKP' : 4, 'DEF' : 4, 'MID' : 1, 'FWD' : 0}
+        }
+
+        # Liverpool blank in gameweek 2 and have a double in gameweek 3
+        self.fixture_matrices = {
+            'team_ids' : np.array([12, 13]),
+            'team_names' : np.array(['Liverpool', 'Man City'], dtype= object),
+            'fixture_count' : np.array([[1, 0, 2], [1, 1, 1]]),
+            'difficulty' : np.array([[3.0, 0.0, 7.0], [3.0, 2.0, 4.0]]),
+            'attack' : np.array([[1.0, 0.0, 2.0], [1.0, 1.5, 1.0]]),
+            'defence' : np.array([[1.0, 0.0, 2.0], [1.0, 1.0, 1.0]])
+        }
+
+
+    def test_calculate_per_90_rates(self):
+
+        recent_gameweeks_df = pd.DataFrame(
+            {
+                'id' : [328, 351, 328, 351],
+                'gameweek' : [1, 1, 2, 2],
+                'full_name' : ['Mohamed Salah', 'Erling Haaland', 'Mohamed Salah', 'Erling Haaland'],
+                'team_name' : ['Liverpool', 'Man City', 'Liverpool', 'Man City'],
+                'position' : ['MID', 'FWD', 'MID', 'FWD'],
+                'minutes' : [90, 0, 90, 0],
+                'expected_goals' : [1.0, 0.0, 0.5, 0.0],
+                'expected_assists' : [0.2, 0.0, 0.4, 0.0],
+                'expected_goals_conceded' : [1.0, 0.0, 0.0, 0.0]
+            }
+        )
+
+        player_rates_df = projection.calculate_per_90_rates(recent_gameweeks_df)
+
+        self.assertEqual(list(player_rates_df['id']), [328, 351])
+        self.assertEqual(list(player_rates_df['expected_minutes']), [90.0, 0.0])
+        self.assertEqual(list(player_rates_df['expected_goals_per_90']), [0.75, 0.0])
+        self.assertAlmostEqual(player_rates_df['expected_assists_per_90'].iloc[0], 0.3)
+        self.assertEqual(list(player_rates_df['expected_goals_conceded_per_90']), [0.5, 0.0])
+
+
+    def test_project_player_points(self):
+
+        player_rates_df = pd.DataFrame(
+            {
+                'id' : [328, 351, 999],
+                'full_name' : ['Mohamed Salah', 'Erling Haaland', 'Departed Player'],
+                'team_name' : ['Liverpool', 'Man City', 'Elsewhere FC'],
+                'position' : ['MID', 'FWD', 'MID'],
+                'expected_minutes' : [90.0, 45.0, 90.0],
+                'expected_goals_per_90' : [0.8, 1.0, 0.5],
+                'expected_assists_per_90' : [0.2, 0.0, 0.5],
+                'expected_goals_conceded_per_90' : [0.0, 1.0, 1.0]
+            }
+        )
+
+        player_projection_df = projection.project_player_points(
+            player_rates_df= player_rates_df,
+            fixture_matrices= self.fixture_matrices,
+            config_dict= self.config_dict,
+            start_gameweek= 1,
+            horizon= 3
+        )
+
+        self.assertEqual(list(player_projection_df['id']), [328, 351])
+
+        # Salah: appearance (2) + goals (0.8 * 5) + assists (0.2 * 3) + clean sheet (1 * 1) per unit of fixture strength
+        salah_row = player_projection_df[player_projection_df['id'] == 328].iloc[0]
+        self.assertAlmostEqual(salah_row['gameweek_1'], 7.6)
+        self.assertAlmostEqual(salah_row['gameweek_2'], 0.0)
+        self.assertAlmostEqual(salah_row['gameweek_3'], 15.2)
+        self.assertAlmostEqual(salah_row['projected_points'], 22.8)
+
+        # Haaland only plays half of each match
+        haaland_row = player_projection_df[player_projection_df['id'] == 351].iloc[0]
+        self.assertAlmostEqual(haaland_row['gameweek_2'], 0.5 * (2 + 1.0 * 1.5 * 4))
+
+
+    def test_project_player_points_full_pool(self):
+
+        # The whole player pool is projected over six gameweeks, its speed is covered by the performance tier
+        number_of_players = 800
+        rng = np.random.default_rng(0)
+
+        player_rates_df = pd.DataFrame(
+            {
+                'id' : np.arange(number_of_players),
+                'full_name' : [f'Player {x}' for x in range(number_of_players)],
+                'team_name' : rng.choice(['Liverpool', 'Man City'], number_of_players),
+                'position' : rng.choice(['GKP', 'DEF', 'MID', 'FWD'], number_of_players),
+                'expected_minutes' : rng.uniform(0, 90, number_of_players),
+                'expected_goals_per_90' : rng.uniform(0, 1, number_of_players),
+                'expected_assists_per_90' : rng.uniform(0, 1, number_of_players),
+                'expected_goals_conceded_per_90' : rng.uniform(0, 2, number_of_players)
+            }
+        )
+
+        fixture_matrices = {
+            key : np.tile(value, (1, 2)) if key not in ('team_ids', 'team_names') else value
+            for key, value in self.fixture_matrices.items()
+        }
+
+        projections_df = projection.project_player_points(
+            player_rates_df= player_rates_df,
+            fixture_matrices= fixture_matrices,
+            config_dict= self.config_dict,
+            start_gameweek= 1,
+            horizon= 6
+        )
+
+        self.assertEqual(len(projections_df), number_of_players)
+        self.assertEqual([column for column in projections_df.columns if column.startswith('gameweek_')], [f'gameweek_{x}' for x in range(1, 7)])
+        self.assertFalse(projections_df['projected_points'].isna().any())
+
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,197 @@
+import os
+import json
+import unittest
+import tempfile
+import threading
+import pandas as pd
+import urllib.request
+import urllib.error
+from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
+import functions.read_api_functions as read_api
+
+
+class TestReadAPIFunctions(unittest.TestCase):
+
+
+    def setUp(self):
+
+        self.config_dict = {
+            'column_dtypes_mapper' : {'id' : 'int64', 'total_points' : 'int64', 'expected_goals' : 'float64', 'full_name' : 'object'},
+            'read_api_refresh_seconds' : 0,
+            'read_api_query_cache_size' : 2,
+            'similarity_feature_columns' : ['total_points', 'expected_goals'],
+            'similarity_minimum_minutes' : 90
+        }
+
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.gameweek_files_directory = self.temporary_directory.name
+
+        for gameweek, points_list, minutes_list in [(1, [12, 2, 6], [90, 90, 0]), (2, [3, 13, 6], [90, 90, 45])]:
+
+            pd.DataFrame(
+                {
+                    'full_name' : ['Mohamed Salah', 'Erling Haaland', 'Bukayo Saka'],
+                    'team_name' : ['Liverpool', 'Man City', 'Arsenal'],
+                    'position' : ['MID', 'FWD', 'MID'],
+                    'total_points' : points_list,
+                    'minutes' : minutes_list,
+                    'expected_goals' : [0.9, 0.4, 0.3],
+                    'id' : [328, 351, 17]
+                }
+            ).to_csv(os.path.join(self.gameweek_files_directory, f'Gameweek_{gameweek}.csv'), index= False)
+
+        pd.DataFrame({'id' : [328, 351, 17], 'now_cost' : [12.5, 15.0, 10.0]}).to_csv(
+            os.path.join(self.gameweek_files_directory, 'player_cost.csv'), index= False
+        )
+
+        read_api.SEASON_DATA_CACHE.clear()
+        read_api.QUERY_RESULT_CACHE.clear()
+
+
+    def tearDown(self):
+
+        self.temporary_directory.cleanup()
+
+
+    def test_refresh_season_data(self):
+
+        season_data = read_api.refresh_season_data(self.gameweek_files_directory, self.config_dict)
+
+        self.assertEqual(list(season_data['gameweek_dfs']), [1, 2])
+        self.assertEqual(season_data['gameweek_dfs'][1]['total_points'].dtype, 'int64')
+        self.assertEqual(len(season_data['gameweeks_df']), 6)
+        self.assertIsNone(season_data['price_changes_df'])
+
+        # Nothing has changed, so nothing is read in again
+        with patch('functions.read_api_functions.pd.read_csv') as mock_read_csv:
+            unchanged_season_data = read_api.refresh_season_data(self.gameweek_files_directory, self.config_dict)
+
+        mock_read_csv.assert_not_called()
+        self.assertIs(unchanged_season_data, season_data)
+
+        # Only the new gameweek is read in, and the unchanged gameweeks keep their dataframes
+        pd.read_csv(os.path.join(self.gameweek_files_directory, 'Gameweek_2.csv')).to_csv(
+            os.path.join(self.gameweek_files_directory, 'Gameweek_3.csv'), index= False
+        )
+
+        with patch('functions.read_api_functions.pd.read_csv', wraps= pd.read_csv) as mock_read_csv:
+            changed_season_data = read_api.refresh_season_data(self.gameweek_files_directory, self.config_dict)
+
+        mock_read_csv.assert_called_once_with(os.path.join(self.gameweek_files_directory, 'Gameweek_3.csv'))
+        self.assertEqual(changed_season_data['version'], season_data['version'] + 1)
+        self.assertIs(changed_season_data['gameweek_dfs'][1], season_data['gameweek_dfs'][1])
+        self.assertEqual(len(changed_season_data['gameweeks_df']), 9)
+
+
+    def test_run_query(self):
+
+        player_history_list = json.loads(
+            read_api.run_query(self.gameweek_files_directory, self.config_dict, 'player_history', (('player_id', 351),))
+        )
+
+        gameweek_table_list = json.loads(
+            read_api.run_query(
+                self.gameweek_files_directory, self.config_dict, 'gameweek_table',
+                (('gameweek', 2), ('position', 'MID'), ('limit', 1))
+            )
+        )
+
+        player_prices_dict = json.loads(
+            read_api.run_query(self.gameweek_files_directory, self.config_dict, 'prices', (('player_id', 328),))
+        )
+
+        self.assertEqual([row['total_points'] for row in player_history_list], [2, 13])
+        self.assertEqual([row['gameweek'] for row in player_history_list], [1, 2])
+        self.assertEqual([row['id'] for row in gameweek_table_list], [17])
+        self.assertEqual(player_prices_dict, {'id' : 328, 'now_cost' : 12.5, 'price_changes' : []})
+
+        # Saka has not played enough minutes to be compared, so is neither a query player nor a similar player
+        similar_players_list = json.loads(
+            read_api.run_query(
+                self.gameweek_files_directory, self.config_dict, 'similar_players', (('player_id', 328), ('max_cost', 15.0))
+            )
+        )
+
+        self.assertEqual([(row['id'], row['now_cost']) for row in similar_players_list], [(351, 15.0)])
+
+        with self.assertRaises(LookupError):
+            read_api.run_query(self.gameweek_files_directory, self.config_dict, 'similar_players', (('player_id', 17),))
+
+        # The cache holds the two most recently used results
+        self.assertEqual(len(read_api.QUERY_RESULT_CACHE), 2)
+
+        with patch.dict(read_api.QUERY_FUNCTIONS_DICT, {'prices' : None}):
+            cached_prices = read_api.run_query(self.gameweek_files_directory, self.config_dict, 'prices', (('player_id', 328),))
+
+        self.assertEqual(json.loads(cached_prices), player_prices_dict)
+
+        with self.assertRaises(LookupError):
+            read_api.run_query(self.gameweek_files_directory, self.config_dict, 'gameweek_table', (('gameweek', 9),))
+
+        with self.assertRaises(ValueError):
+            read_api.run_query(self.gameweek_files_directory, self.config_dict, 'gameweek_table', (('gameweek', 1), ('sort_by', 'x')))
+
+
+    def test_parse_request_path(self):
+
+        self.assertEqual(read_api.parse_request_path('/players/328/history'), ('player_history', (('player_id', 328),)))
+        self.assertEqual(
+            read_api.parse_request_path('/gameweeks/3?team=Arsenal&limit=5'),
+            ('gameweek_table', (('gameweek', 3), ('team', 'Arsenal'), ('limit', 5)))
+        )
+        self.assertEqual(read_api.parse_request_path('/prices'), ('prices', ()))
+        self.assertEqual(
+            read_api.parse_request_path('/players/328/similar?limit=3&max_cost=8.5'),
+            ('similar_players', (('player_id', 328), ('number_of_players', 3), ('max_cost', 8.5)))
+        )
+
+        with self.assertRaises(LookupError):
+            read_api.parse_request_path('/unknown')
+
+        with self.assertRaises(ValueError):
+            read_api.parse_request_path('/players/salah/history')
+
+
+    def test_create_read_api_server(self):
+
+        read_api_server = read_api.create_read_api_server(self.gameweek_files_directory, self.config_dict, '127.0.0.1', 0)
+        server_thread = threading.Thread(target= read_api_server.serve_forever, daemon= True)
+        server_thread.start()
+
+        base_url = f'http://127.0.0.1:{read_api_server.server_address[1]}'
+
+        def request_json(path):
+
+            try:
+
+                with urllib.request.urlopen(f'{base_url}{path}') as response:
+                    return response.status, json.loads(response.read())
+
+            except urllib.error.HTTPError as http_error:
+                return http_error.code, json.loads(http_error.read())
+
+        try:
+
+            # Concurrent requests for the same and different queries all receive complete responses
+            with ThreadPoolExecutor(max_workers= 8) as executor:
+                responses_list = list(executor.map(request_json, ['/players/328/history', '/gameweeks/1', '/prices'] * 10))
+
+            not_found_response = request_json('/gameweeks/30')
+            bad_request_response = request_json('/gameweeks/one')
+
+        finally:
+
+            read_api_server.shutdown()
+            read_api_server.server_close()
+
+        self.assertTrue(all(status == 200 for status, _ in responses_list))
+        self.assertEqual(responses_list[0][1], responses_list[3][1])
+        self.assertEqual(len(responses_list[1][1]), 3)
+        self.assertEqual(not_found_response[0], 404)
+        self.assertEqual(bad_request_response[0], 400)
+
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,107 @@
+import os
+import unittest
+import tempfile
+import pandas as pd
+import functions.season_functions as season
+
+
+class TestSeasonFunctions(unittest.TestCase):
+
+
+    def setUp(self):
+
+        self.config_dict = {
+            'season_total_columns' : ['total_points', 'minutes', 'expected_goals'],
+            'season_per_90_columns' : ['total_points', 'expected_goals'],
+            'column_dtypes_mapper' : {'total_points' : 'int64', 'minutes' : 'int64', 'expected_goals' : 'float64'}
+        }
+
+        self.gameweek_1_df = pd.DataFrame(
+            {
+                'full_name' : ['Mohamed Salah', 'Erling Haaland'],
+                'team_name' : ['Liverpool', 'Man City'],
+                'position' : ['MID', 'FWD'],
+                'total_points' : [12, 2],
+                'minutes' : [90, 0],
+                'expected_goals' : [1.86, 0.0],
+                'id' : [328, 351]
+            }
+        )
+
+        # A new player appears in gameweek 2 and Haaland is listed at a new team
+        self.gameweek_2_df = pd.DataFrame(
+            {
+                'full_name' : ['Mohamed Salah', 'Erling Haaland', 'Cole Palmer'],
+                'team_name' : ['Liverpool', 'Chelsea', 'Chelsea'],
+                'position' : ['MID', 'FWD', 'MID'],
+                'total_points' : [3, 13, 8],
+                'minutes' : [45, 90, 90],
+                'expected_goals' : [0.1, 0.82, 0.7],
+                'id' : [328, 351, 999]
+            }
+        )
+
+
+    def test_update_season_totals(self):
+
+        season_totals_df = season.empty_season_totals(self.config_dict)
+
+        for gameweek_df in [self.gameweek_1_df, self.gameweek_2_df]:
+            season_totals_df = season.update_season_totals(season_totals_df, gameweek_df, self.config_dict)
+
+        self.assertEqual(list(season_totals_df.index), [328, 351, 999])
+        self.assertEqual(list(season_totals_df['total_points']), [15, 15, 8])
+        self.assertEqual(list(season_totals_df['gameweeks']), [2, 2, 1])
+        self.assertEqual(season_totals_df.loc[351, 'team_name'], 'Chelsea')
+        self.assertAlmostEqual(season_totals_df.loc[328, 'expected_goals'], 1.96)
+        self.assertEqual(season_totals_df['minutes'].dtype, 'int64')
+
+
+    def test_rebuild_and_check_season_totals(self):
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+
+            season_totals_filepath = os.path.join(temporary_directory, 'season_totals.csv')
+            season_totals_df = season.load_season_totals(season_totals_filepath, self.config_dict)
+
+            for gameweek_number, gameweek_df in [(1, self.gameweek_1_df), (2, self.gameweek_2_df)]:
+
+                gameweek_df.to_csv(os.path.join(temporary_directory, f'Gameweek_{gameweek_number}.csv'), index= False)
+
+                # The totals are written and read back between gameweeks, as they are by the gameweek script
+                season_totals_df = season.update_season_totals(season_totals_df, gameweek_df, self.config_dict)
+                season.save_season_totals(season_totals_df, season_totals_filepath)
+                season_totals_df = season.load_season_totals(season_totals_filepath, self.config_dict)
+
+            rebuilt_season_totals_df = season.rebuild_season_totals(temporary_directory, [1, 2], self.config_dict)
+
+        pd.testing.assert_frame_equal(season_totals_df, rebuilt_season_totals_df)
+        self.assertEqual(season.check_season_totals(season_totals_df, rebuilt_season_totals_df, self.config_dict), [])
+
+
+        # Test that a double counted gameweek and a missing player are both detected
+        double_counted_df = season.update_season_totals(season_totals_df, self.gameweek_1_df, self.config_dict)
+        self.assertEqual(season.check_season_totals(double_counted_df, rebuilt_season_totals_df, self.config_dict), [328, 351])
+
+        missing_player_df = season_totals_df.drop(index= 999)
+        self.assertEqual(season.check_season_totals(missing_player_df, rebuilt_season_totals_df, self.config_dict), [999])
+
+
+    def test_add_per_90_metrics(self):
+
+        season_totals_df = season.empty_season_totals(self.config_dict)
+        season_totals_df = season.update_season_totals(season_totals_df, self.gameweek_1_df, self.config_dict)
+        season_totals_df = season.add_per_90_metrics(season_totals_df, self.config_dict)
+
+        self.assertEqual(list(season_totals_df['total_points_per_90']), [12.0, 0.0])
+        self.assertEqual(list(season_totals_df['expected_goals_per_90']), [1.86, 0.0])
+
+        # Per-90 columns read back in from a saved file are dropped when the totals are next updated
+        updated_season_totals_df = season.update_season_totals(season_totals_df, self.gameweek_1_df, self.config_dict)
+
+        self.assertNotIn('total_points_per_90', updated_season_totals_df.columns)
+
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,151 @@
+import os
+import unittest
+import tempfile
+import numpy as np
+import pandas as pd
+import functions.similarity_functions as similarity
+
+
+class TestSimilarityFunctions(unittest.TestCase):
+
+
+    def setUp(self):
+
+        self.config_dict = {
+            'similarity_feature_columns' : ['minutes', 'expected_goals', 'expected_assists', 'threat'],
+            'similarity_minimum_minutes' : 90
+        }
+
+        self.gameweeks_df = pd.DataFrame(
+            {
+                'id' : [1, 2, 3, 4, 5, 1, 2, 3, 4, 5],
+                'gameweek' : [1, 1, 1, 1, 1, 2, 2, 2, 2, 2],
+                'full_name' : ['Striker A', 'Striker B', 'Winger C', 'Defender D', 'Bench E'] * 2,
+                'team_name' : ['Arsenal', 'Chelsea', 'Arsenal', 'Chelsea', 'Arsenal'] * 2,
+                'position' : ['FWD', 'FWD', 'MID', 'DEF', 'MID'] * 2,
+                'minutes' : [90, 90, 90, 90, 0, 90, 90, 90, 90, 10],
+                'expected_goals' : [0.8, 0.7, 0.3, 0.05, 0.0, 0.6, 0.8, 0.4, 0.05, 0.0],
+                'expected_assists' : [0.1, 0.1, 0.4, 0.05, 0.0, 0.2, 0.1, 0.3, 0.1, 0.0],
+                'threat' : [60.0, 55.0, 30.0, 5.0, 0.0, 50.0, 60.0, 35.0, 4.0, 0.0]
+            }
+        )
+
+        self.player_cost_df = pd.DataFrame({'id' : [1, 2, 3, 4, 5], 'now_cost' : [12.0, 7.5, 8.0, 4.5, 4.5]})
+
+
+    def test_build_feature_matrix(self):
+
+        feature_matrix_dict = similarity.build_feature_matrix(self.gameweeks_df, self.config_dict)
+
+        # Players below the minimum minutes are excluded, and features are normalised
+        self.assertEqual(list(feature_matrix_dict['ids']), [1, 2, 3, 4])
+        self.assertEqual(feature_matrix_dict['matrix'].shape, (4, 4))
+        self.assertEqual(feature_matrix_dict['matrix'].dtype, 'float32')
+        np.testing.assert_allclose(feature_matrix_dict['matrix'][:, 1:].mean(axis= 0), 0, atol= 1e-6)
+
+        # Every player averaged 90 minutes, so the minutes feature carries no information
+        np.testing.assert_array_equal(feature_matrix_dict['matrix'][:, 0], 0)
+
+
+    def test_find_similar_players(self):
+
+        feature_matrix_dict = similarity.build_feature_matrix(self.gameweeks_df, self.config_dict)
+
+        similar_players_df = similarity.find_similar_players(feature_matrix_dict, [1, 4], number_of_players= 2)
+
+        self.assertEqual(list(similar_players_df['query_id']), [1, 1, 4, 4])
+        self.assertEqual(list(similar_players_df['id'])[:3], [2, 3, 3])
+        self.assertNotIn(4, list(similar_players_df['id']))
+        self.assertTrue(similar_players_df.groupby('query_id')['distance'].is_monotonic_increasing.all())
+
+
+        # Test filtering by position and cost
+        similar_players_df = similarity.find_similar_players(
+            feature_matrix_dict, [1], number_of_players= 5, position= 'MID', max_cost= 8.0, player_cost_df= self.player_cost_df
+        )
+
+        self.assertEqual(list(similar_players_df['id']), [3])
+        self.assertEqual(list(similar_players_df['now_cost']), [8.0])
+
+
+        # Test that a filtered pool of n + 1 players, including the query player, gives all n other players
+        similar_players_df = similarity.find_similar_players(feature_matrix_dict, [1], number_of_players= 1, position= 'FWD')
+
+        self.assertEqual(list(similar_players_df['id']), [2])
+
+        similar_players_df = similarity.find_similar_players(feature_matrix_dict, [1], number_of_players= 3)
+
+        self.assertEqual(list(similar_players_df['id']), [2, 3, 4])
+
+
+        # Test that no query players gives an empty dataframe with the same columns
+        empty_similar_players_df = similarity.find_similar_players(
+            feature_matrix_dict, [], number_of_players= 5, max_cost= 8.0, player_cost_df= self.player_cost_df
+        )
+
+        self.assertTrue(empty_similar_players_df.empty)
+        self.assertEqual(list(empty_similar_players_df.columns), ['query_id', 'id', 'full_name', 'team_name', 'position', 'now_cost', 'distance'])
+
+
+        # Test if correct exceptions are raised
+        with self.assertRaises(ValueError):
+            similarity.find_similar_players(feature_matrix_dict, [5])
+
+        with self.assertRaises(ValueError):
+            similarity.find_similar_players(feature_matrix_dict, [1], max_cost= 8.0)
+
+
+    def test_load_feature_matrix(self):
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+
+            for gameweek_number, gameweek_df in self.gameweeks_df.groupby('gameweek'):
+                gameweek_df.drop(columns= 'gameweek').to_csv(os.path.join(temporary_directory, f'Gameweek_{gameweek_number}.csv'), index= False)
+
+            first_feature_matrix_dict = similarity.load_feature_matrix(temporary_directory, self.config_dict)
+            second_feature_matrix_dict = similarity.load_feature_matrix(temporary_directory, self.config_dict)
+
+            # The matrix is reused until a gameweek file changes
+            self.assertIs(first_feature_matrix_dict, second_feature_matrix_dict)
+
+            self.gameweeks_df[self.gameweeks_df['gameweek'] == 1].drop(columns= 'gameweek').to_csv(
+                os.path.join(temporary_directory, 'Gameweek_3.csv'), index= False
+            )
+
+            third_feature_matrix_dict = similarity.load_feature_matrix(temporary_directory, self.config_dict)
+
+            self.assertIsNot(first_feature_matrix_dict, third_feature_matrix_dict)
+            self.assertEqual(len([key for key in similarity.FEATURE_MATRIX_CACHE if key[0] == temporary_directory]), 1)
+
+
+    def test_find_similar_players_full_pool(self):
+
+        # Queries over the whole player pool, whose speed is covered by the performance tier
+        number_of_players = 800
+        rng = np.random.default_rng(0)
+
+        feature_matrix_dict = {
+            'players_df' : pd.DataFrame(
+                {
+                    'id' : np.arange(number_of_players),
+                    'full_name' : [f'Player {x}' for x in range(number_of_players)],
+                    'team_name' : 'Arsenal',
+                    'position' : rng.choice(['GKP', 'DEF', 'MID', 'FWD'], number_of_players)
+                }
+            ),
+            'ids' : np.arange(number_of_players),
+            'matrix' : rng.standard_normal((number_of_players, 10)).astype('float32')
+        }
+
+        feature_matrix_dict['squared_norms'] = (feature_matrix_dict['matrix'] ** 2).sum(axis= 1)
+
+        similar_players_df = similarity.find_similar_players(feature_matrix_dict, [0, 1, 2, 3, 4], number_of_players= 10, position= 'MID')
+
+        self.assertEqual(list(similar_players_df['query_id']), [x for x in range(5) for _ in range(10)])
+        self.assertTrue((similar_players_df['position'] == 'MID').all())
+        self.assertTrue(similar_players_df.groupby('query_id')['distance'].is_monotonic_increasing.all())
+
+
+if __name__ == '__main__':
+
+    unittest.main()
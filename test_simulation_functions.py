@@ -0,0 +1,99 @@
+import unittest
+import numpy as np
+import pandas as pd
+import functions.projection_functions as projection
+import functions.simulation_functions as simulation
+
+
+class TestSimulationFunctions(unittest.TestCase):
+
+
+    def setUp(self):
+
+        self.config_dict = {
+            'goal_values' : {'GKP' : 15, 'DEF' : 6, 'MID' : 5, 'FWD' : 4},
+            'clean_sheet_values' : {'GKP' : 4, 'DEF' : 4, 'MID' : 1, 'FWD' : 0},
+            'simulation_chunk_trials' : 5000,
+            'simulation_parallel_trials' : 20000,
+            'simulation_percentiles' : [10, 50, 90]
+        }
+
+        # Liverpool blank in gameweek 2 and have a double in gameweek 3
+        self.fixture_matrices = {
+            'team_ids' : np.array([12, 13]),
+            'team_names' : np.array(['Liverpool', 'Man City'], dtype= object),
+            'fixture_count' : np.array([[1, 0, 2], [1, 1, 1]]),
+            'difficulty' : np.array([[3.0, 0.0, 7.0], [3.0, 2.0, 4.0]]),
+            'attack' : np.array([[1.0, 0.0, 2.0], [1.0, 1.5, 1.0]]),
+            'defence' : np.array([[1.0, 0.0, 2.0], [1.0, 1.0, 1.0]])
+        }
+
+        self.player_rates_df = pd.DataFrame(
+            {
+                'id' : [328, 351, 400, 401, 999],
+                'full_name' : ['Mohamed Salah', 'Erling Haaland', 'Virgil van Dijk', 'Benched Player', 'Departed Player'],
+                'team_name' : ['Liverpool', 'Man City', 'Liverpool', 'Man City', 'Elsewhere FC'],
+                'position' : ['MID', 'FWD', 'DEF', 'MID', 'MID'],
+                'expected_minutes' : [90.0, 45.0, 90.0, 0.0, 90.0],
+                'expected_goals_per_90' : [0.6, 1.0, 0.1, 0.5, 0.5],
+                'expected_assists_per_90' : [0.3, 0.2, 0.05, 0.5, 0.5],
+                'expected_goals_conceded_per_90' : [1.0, 1.2, 1.0, 1.0, 1.0]
+            }
+        )
+
+
+    def test_simulate_gameweek_points(self):
+
+        player_simulation_df = simulation.simulate_gameweek_points(
+            self.player_rates_df, self.fixture_matrices, self.config_dict, 3, 10000, random_seed= 1, team_correlation= True
+        ).set_index('id')
+
+        # Mean points agree with the expected points of the projection, including Liverpool's double gameweek
+        player_projection_df = projection.project_player_points(
+            self.player_rates_df, self.fixture_matrices, self.config_dict, 3, 1
+        ).set_index('id')
+
+        self.assertEqual(sorted(player_simulation_df.index), [328, 351, 400, 401])
+
+        for player_id in [328, 351, 400]:
+            self.assertAlmostEqual(
+                player_simulation_df.loc[player_id, 'mean_points'],
+                player_projection_df.loc[player_id, 'projected_points'],
+                delta= 0.15
+            )
+
+        # A player who never appears always scores nothing
+        self.assertEqual(list(player_simulation_df.loc[401, ['mean_points', 'percentile_10', 'percentile_90']]), [0, 0, 0])
+
+        # Haaland plays half of the time, so at least 10% of his trials are blanks
+        self.assertEqual(player_simulation_df.loc[351, 'percentile_10'], 0)
+        self.assertTrue((player_simulation_df['percentile_10'] <= player_simulation_df['percentile_50']).all())
+        self.assertTrue((player_simulation_df['percentile_50'] <= player_simulation_df['percentile_90']).all())
+
+        # Attackers move with their team's goals and defenders with their team's clean sheets
+        self.assertGreater(player_simulation_df.loc[351, 'team_goals_correlation'], 0.5)
+        self.assertGreater(player_simulation_df.loc[400, 'team_clean_sheets_correlation'], 0.5)
+        self.assertTrue(np.isnan(player_simulation_df.loc[401, 'team_goals_correlation']))
+
+
+    def test_simulate_gameweek_points_parallel(self):
+
+        # Each chunk has its own seed, so a process pool reproduces a serial run
+        serial_simulation_df = simulation.simulate_gameweek_points(
+            self.player_rates_df, self.fixture_matrices, self.config_dict, 1, 20000, random_seed= 7, max_workers= 1
+        )
+
+        parallel_simulation_df = simulation.simulate_gameweek_points(
+            self.player_rates_df, self.fixture_matrices, self.config_dict, 1, 20000, random_seed= 7, max_workers= 2
+        )
+
+        pd.testing.assert_frame_equal(serial_simulation_df, parallel_simulation_df)
+        self.assertNotIn('team_goals_correlation', serial_simulation_df.columns)
+
+        with self.assertRaises(ValueError):
+            simulation.simulate_gameweek_points(self.player_rates_df, self.fixture_matrices, self.config_dict, 1, 0)
+
+
+if __name__ == '__main__':
+
+    unittest.main()
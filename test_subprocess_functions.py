@@ -0,0 +1,153 @@
+import os
+import sys
+import time
+import unittest
+import tempfile
+import functions.subprocess_functions as subprocess
+
+
+class TestSubprocessFunctions(unittest.TestCase):
+
+
+    def test_subprocess_runner(self):
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+
+            log_filepath = os.path.join(temporary_directory, 'test_script.log')
+
+            stage_result = subprocess.subprocess_runner(
+                operations_list= [sys.executable, '-c', 'import sys; print("first line"); print("second line", file= sys.stderr); exit(3)'],
+                time_limit_seconds= 30,
+                script_name= 'test_script',
+                log_filepath= log_filepath
+            )
+
+            with open(log_filepath) as temporary_file:
+                log_text = temporary_file.read()
+
+        self.assertEqual(stage_result['return_code'], 3)
+        self.assertFalse(stage_result['timed_out'])
+        self.assertIn('| first line', log_text)
+        self.assertIn('| second line', log_text)
+        self.assertIn('ended with return code 3', log_text)
+
+
+    def test_subprocess_runner_timeout(self):
+
+        # The child spawns a grandchild, both of which must be killed when the time limit is reached
+        script = (
+            'import subprocess, sys, time; '
+            'subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"]); '
+            'print("started"); time.sleep(60)'
+        )
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+
+            start_time = time.perf_counter()
+
+            stage_result = subprocess.subprocess_runner(
+                operations_list= [sys.executable, '-c', script],
+                time_limit_seconds= 1,
+                script_name= 'slow_script',
+                log_filepath= os.path.join(temporary_directory, 'slow_script.log')
+            )
+
+            elapsed_seconds = time.perf_counter() - start_time
+
+        self.assertTrue(stage_result['timed_out'])
+        self.assertNotEqual(stage_result['return_code'], 0)
+        self.assertLess(elapsed_seconds, 10)
+
+
+    def test_subprocess_runner_timeout_after_exit(self):
+
+        # The child exits straight away, but leaves a grandchild holding its output open past the time limit
+        script = (
+            'import subprocess, sys; '
+            'subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"]); '
+            'print("started")'
+        )
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+
+            start_time = time.perf_counter()
+
+            stage_result = subprocess.subprocess_runner(
+                operations_list= [sys.executable, '-c', script],
+                time_limit_seconds= 1,
+                script_name= 'detached_script',
+                log_filepath= os.path.join(temporary_directory, 'detached_script.log')
+            )
+
+            elapsed_seconds = time.perf_counter() - start_time
+
+        self.assertTrue(stage_result['timed_out'])
+        self.assertLess(elapsed_seconds, 10)
+
+
+    def test_run_stages(self):
+
+        with tempfile.TemporaryDirectory() as temporary_directory, tempfile.TemporaryDirectory() as marker_directory:
+
+            # The first two scripts each wait for the other to start, so only succeed if they run side by side
+            def rendezvous_script(own_marker, other_marker):
+
+                own_filepath = os.path.join(marker_directory, own_marker)
+                other_filepath = os.path.join(marker_directory, other_marker)
+
+                return [
+                    sys.executable, '-c',
+                    f'import os, time; open({own_filepath!r}, "w").close(); '
+                    f'[time.sleep(0.05) for _ in range(600) if not os.path.exists({other_filepath!r})]; '
+                    f'exit(0 if os.path.exists({other_filepath!r}) else 1)'
+                ]
+
+            stages_list = [
+                {'script_name' : 'first', 'operations_list' : rendezvous_script('first', 'second'), 'time_limit_seconds' : 60},
+                {'script_name' : 'second', 'operations_list' : rendezvous_script('second', 'first'), 'time_limit_seconds' : 60},
+                {'script_name' : 'failing', 'operations_list' : [sys.executable, '-c', 'exit(1)'], 'time_limit_seconds' : 30},
+                {'script_name' : 'dependent', 'operations_list' : [sys.executable, '-c', 'pass'], 'time_limit_seconds' : 30, 'depends_on' : ['failing']},
+                {'script_name' : 'after_first', 'operations_list' : [sys.executable, '-c', 'pass'], 'time_limit_seconds' : 30, 'depends_on' : ['first']}
+            ]
+
+            stage_results_list = subprocess.run_stages(
+                stages_list= stages_list,
+                max_workers= 3,
+                log_directory= temporary_directory
+            )
+
+            log_files_list = sorted(os.listdir(temporary_directory))
+
+        self.assertEqual([stage_result['script_name'] for stage_result in stage_results_list], ['first', 'second', 'failing', 'dependent', 'after_first'])
+        self.assertEqual([stage_result['return_code'] for stage_result in stage_results_list], [0, 0, 1, None, 0])
+        self.assertTrue(stage_results_list[3]['skipped'])
+        self.assertEqual(log_files_list, ['after_first.log', 'failing.log', 'first.log', 'second.log'])
+
+
+    def test_run_stages_timeout_with_zero_return_code(self):
+
+        # The script exits cleanly when terminated, but reaching the time limit still counts as a failure
+        script = 'import signal, sys, time; signal.signal(signal.SIGTERM, lambda *_: sys.exit(0)); print("started"); time.sleep(60)'
+
+        stages_list = [
+            {'script_name' : 'slow', 'operations_list' : [sys.executable, '-c', script], 'time_limit_seconds' : 1},
+            {'script_name' : 'after_slow', 'operations_list' : [sys.executable, '-c', 'pass'], 'time_limit_seconds' : 30, 'depends_on' : ['slow']}
+        ]
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+
+            stage_results_list = subprocess.run_stages(
+                stages_list= stages_list,
+                max_workers= 2,
+                log_directory= temporary_directory
+            )
+
+        self.assertTrue(stage_results_list[0]['timed_out'])
+        self.assertEqual(stage_results_list[0]['return_code'], 0)
+        self.assertFalse(subprocess.stage_succeeded(stage_results_list[0]))
+        self.assertTrue(stage_results_list[1]['skipped'])
+
+
+if __name__ == '__main__':
+
+    unittest.main()